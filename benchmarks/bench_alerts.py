@@ -0,0 +1,78 @@
+# =========================================================
+# Benchmark: avaliação de alertas (regras x locais)
+#   python benchmarks/bench_alerts.py [locais ...]
+# Tempo de `update` (versão nova, ~5% dos locais mudam) e de `tick`
+# (só prazos) para 10, 100 e 1000 regras. Precisa caber com folga no
+# intervalo de atualização (DASHBOARD_LIVE_SECONDS / REFRESH_SECONDS).
+# =========================================================
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np  # noqa: E402
+
+from benchmarks.synthetic import make_workbook  # noqa: E402
+from dashboard.alerts import AlertEngine, CallbackSink, parse_rules  # noqa: E402
+from dashboard.sheet import compact, parse_sheet  # noqa: E402
+
+RULE_COUNTS = [10, 100, 1000]
+VERSIONS = 5
+
+
+def rules_text(n: int) -> str:
+    templates = [
+        "Cam_OfflineBool por {m}m escala {e}m",
+        "Alm_OfflineBool por {m}m limpa 5m",
+        "Cam_Falta > {k} por {m}m",
+        "Alm_Falta aumentou limpa 1h",
+        "Manutencao locais > {k}00",
+    ]
+    return "\n".join(f"r{i} = " + templates[i % len(templates)].format(m=i % 20, e=i % 20 + 30, k=i % 9 + 1)
+                     for i in range(n))
+
+
+def versions(df, count: int, seed: int = 1):
+    """`count` versões: a cada uma ~5% dos locais trocam Cam/Alm_Online."""
+    rng = np.random.default_rng(seed)
+    out = [df]
+    for _ in range(count - 1):
+        d = out[-1].copy()
+        flip = rng.random(len(d)) < 0.05
+        for p in ("Cam", "Alm"):
+            on = d[f"{p}_Online"].to_numpy().astype(np.int64)
+            tot = d[f"{p}_Total"].to_numpy().astype(np.int64)
+            on = np.where(flip, rng.integers(0, tot + 1), on)
+            d[f"{p}_Online"] = on
+            d[f"{p}_Falta"] = np.clip(tot - on, 0, None)
+            d[f"{p}_OfflineBool"] = (tot > 0) & (on == 0)
+        out.append(compact(d))
+    return out
+
+
+def main(sizes):
+    print(f"{'locais':>8} {'regras':>7} {'update ms':>10} {'tick ms':>9} {'alertas':>8}")
+    for n in sizes:
+        frames = versions(parse_sheet(make_workbook(n, seed=9)), VERSIONS)
+        for r in RULE_COUNTS:
+            clock = [0.0]
+            sent = []
+            eng = AlertEngine(parse_rules(rules_text(r)), [CallbackSink(sent.extend)],
+                              clock=lambda: clock[0], interval=0)
+            up, tk = [], []
+            for i, df in enumerate(frames):
+                clock[0] += 300
+                t0 = time.perf_counter()
+                eng.update(f"v{i}", df)
+                up.append(time.perf_counter() - t0)
+                clock[0] += 300
+                t0 = time.perf_counter()
+                eng.tick()
+                tk.append(time.perf_counter() - t0)
+            eng.flush()
+            print(f"{n:>8} {r:>7} {np.median(up) * 1e3:>10.1f} {np.median(tk) * 1e3:>9.1f} {len(sent):>8}")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [1000, 20000])
@@ -0,0 +1,83 @@
+# =========================================================
+# Benchmark: API JSON – requisições/s em um núcleo
+#   python benchmarks/bench_api.py [locais]
+# 1) cliente em processo (custo da aplicação, sem rede)
+# 2) uvicorn de verdade (1 processo) + clientes HTTP keep-alive em threads
+# =========================================================
+import http.client
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.synthetic import make_workbook  # noqa: E402
+from dashboard.api import Api, LocalClient, start_in_thread  # noqa: E402
+
+PORT = 18502
+SECONDS = 3.0
+CLIENTS = 8
+
+
+def rate(fn, seconds=1.0):
+    n, t0 = 0, time.perf_counter()
+    while time.perf_counter() - t0 < seconds:
+        fn()
+        n += 1
+    return n / (time.perf_counter() - t0)
+
+
+def in_process(app):
+    c = LocalClient(app)
+    gz = {"Accept-Encoding": "gzip"}
+    etag = c.get("/api/geral", gz).headers["etag"]
+    print("em processo (req/s)")
+    print(f"  200 pronto (gzip) /api/geral   {rate(lambda: c.get('/api/geral', gz)):>9.0f}")
+    print(f"  200 pronto /api/cameras        {rate(lambda: c.get('/api/cameras')):>9.0f}")
+    print(f"  304 If-None-Match              {rate(lambda: c.get('/api/geral', {'If-None-Match': etag})):>9.0f}")
+    n = [0]
+    def miss():
+        n[0] += 1
+        c.get(f"/api/locais?q={n[0] % 1000}&limite=50")  # busca nova: filtra + serializa
+    print(f"  busca nova (sem cache)         {rate(miss):>9.0f}")
+
+
+def over_http(app):
+    server = start_in_thread(app.source, port=PORT, host="127.0.0.1")
+    while not server.started:
+        time.sleep(0.05)
+    counts = [0] * CLIENTS
+    stop = time.perf_counter() + SECONDS
+
+    def worker(i):
+        conn = http.client.HTTPConnection("127.0.0.1", PORT)
+        while time.perf_counter() < stop:
+            conn.request("GET", "/api/geral", headers={"Accept-Encoding": "gzip"})
+            conn.getresponse().read()
+            counts[i] += 1
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(CLIENTS)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    server.should_exit = True
+    print(f"uvicorn, {CLIENTS} clientes keep-alive: {sum(counts) / SECONDS:.0f} req/s (/api/geral, gzip)")
+
+
+def main(n):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.xlsx"
+        make_workbook(n, path=path)
+        app = Api(str(path))
+        t0 = time.perf_counter()
+        LocalClient(app).get("/api/status")
+        print(f"{n} locais – primeira carga + aquecimento: {time.perf_counter() - t0:.2f}s")
+        in_process(app)
+        over_http(app)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
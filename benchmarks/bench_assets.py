@@ -0,0 +1,96 @@
+# =========================================================
+# Benchmark: logo/ícones por rerun – leitura a cada rerun x cache do processo
+#   python benchmarks/bench_assets.py [reruns]
+# Rede desligada (socket bloqueado): o cache nunca pode depender dela.
+# =========================================================
+import os
+import socket
+import sys
+import tempfile
+import time
+from io import BytesIO
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from dashboard.config import LOGO_FILE_CANDIDATES, LOGO_URL_RAW, ROOT_PATH  # noqa: E402
+
+
+class NetworkDisabled(OSError):
+    pass
+
+
+def _no_network(*_a, **_k):
+    raise NetworkDisabled("rede desligada no benchmark")
+
+
+def legacy_rerun():
+    """O que cada rerun fazia: varre os candidatos, lê, tenta a rede; o PDF varre e decodifica de novo."""
+    from PIL import Image
+
+    data = None
+    for p in LOGO_FILE_CANDIDATES[:6]:
+        if os.path.exists(p):
+            with open(p, "rb") as f:
+                data = f.read()
+            break
+    if data is None:
+        try:
+            import requests
+            r = requests.get(LOGO_URL_RAW, timeout=6)
+            data = r.content if r.ok else None
+        except Exception:
+            pass
+    path = next((p for p in LOGO_FILE_CANDIDATES[:6] if os.path.exists(p)), None)
+    if path:
+        Image.open(path).load()  # ReportLab decodifica a cada relatório
+    elif data:
+        Image.open(BytesIO(data)).load()
+    return data
+
+
+def cached_rerun():
+    from dashboard.assets import assets
+
+    logo = assets().logo
+    return (logo.header, logo.pdf) if logo else None
+
+
+def per_call(fn, n):
+    t0 = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - t0) / n
+
+
+def main(n):
+    socket.socket.connect = _no_network
+    socket.create_connection = _no_network
+    os.environ["DASHBOARD_LOGO_URL"] = LOGO_URL_RAW  # mesmo com URL configurada
+
+    print(f"{'cenário':<38} {'antes':>12} {'cache':>12}")
+    os.chdir(ROOT_PATH)
+    t_old = per_call(legacy_rerun, n)
+    t0 = time.perf_counter()
+    cached_rerun()
+    first = time.perf_counter() - t0
+    t_new = per_call(cached_rerun, n)
+    print(f"{'logo no repositório':<38} {t_old * 1e3:>10.3f}ms {t_new * 1e3:>10.4f}ms  (1ª carga {first * 1e3:.1f}ms)")
+
+    # sem logo no disco: antes, cada rerun tentava a rede (até 6 s de timeout)
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        from dashboard.assets import AssetCache
+        t_old = per_call(legacy_rerun, n)
+        t0 = time.perf_counter()
+        cache = AssetCache(candidates=["logo.png"], cache_dir=tmp)
+        thread = cache.fetch_missing()
+        t_new = time.perf_counter() - t0
+        thread.join()
+        print(f"{'sem logo no disco (rede desligada)':<38} {t_old * 1e3:>10.3f}ms {t_new * 1e3:>10.4f}ms  "
+              f"(1ª carga; download em thread, logo={'sim' if cache.logo else 'não'})")
+        os.chdir(ROOT_PATH)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
@@ -0,0 +1,55 @@
+# =========================================================
+# Benchmark: gráfico de resumo por rerun
+#   python benchmarks/bench_charts.py [reruns]
+# px.bar a cada rerun (antes) x figura em cache x valores novos sobre a
+# figura-modelo x barras em HTML. "envio" = o que st.plotly_chart faz com
+# a figura (to_dict + JSON), igual para qualquer figura plotly.
+# =========================================================
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import plotly.io  # noqa: E402
+import plotly.tools  # noqa: E402
+
+from dashboard.charts import ChartCache, _build, bar_html  # noqa: E402
+
+ITEMS = (("Online", 1129), ("Offline", 725), ("Locais p/ manutenção", 117))
+
+
+def per_call(fn, n):
+    fn()
+    t0 = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - t0) / n
+
+
+def send(fig):
+    """Serialização feita pelo st.plotly_chart."""
+    return plotly.io.to_json(plotly.tools.return_figure_from_figure_or_data(fig, validate_figure=True),
+                             validate=False)
+
+
+def main(n):
+    cache = ChartCache()
+    novo = iter(range(10**9))
+
+    rows = [
+        ("px.bar a cada rerun (antes)", lambda: send(_build("Resumo Geral", ITEMS))),
+        ("cache: mesmos valores", lambda: send(cache.figure("Resumo Geral", ITEMS))),
+        ("cache: valores novos (modelo)",
+         lambda: send(cache.figure("Resumo Geral", (("Online", next(novo)), *ITEMS[1:])))),
+        ("html (DASHBOARD_CHART_BACKEND=html)", lambda: bar_html("Resumo Geral", ITEMS)),
+    ]
+    print(f"{'cenário':<38} {'por rerun':>12}")
+    for name, fn in rows:
+        print(f"{name:<38} {per_call(fn, n) * 1e3:>10.2f}ms")
+    t = per_call(lambda: cache.figure("Resumo Geral", ITEMS), n * 100)
+    print(f"{'  (só a consulta ao LRU)':<38} {t * 1e6:>10.2f}µs")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50)
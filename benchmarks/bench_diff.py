@@ -0,0 +1,41 @@
+# =========================================================
+# Benchmark: diff entre versões consecutivas da planilha
+#   python benchmarks/bench_diff.py [locais ...]
+# =========================================================
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.synthetic import make_rows  # noqa: E402
+from dashboard.diff import diff_frames  # noqa: E402
+from dashboard.render import change_items  # noqa: E402
+from dashboard.sheet import normalize  # noqa: E402
+
+
+def timed(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter(); out = fn(); best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def main(sizes):
+    print(f"{'locais':>8} {'mesma ordem':>12} {'c/ entradas/saídas':>19} {'painel':>8} {'mudanças':>9}")
+    for n in sizes:
+        raw = make_rows(n, seed=1)
+        prev = normalize(raw)
+        raw = raw.copy()
+        step = max(n // 200, 1)
+        raw.loc[2::step, 2] = 0                       # ~0,5% dos locais caem
+        curr = normalize(raw)
+        moved = normalize(raw.drop(index=raw.index[5:5 + step]).sample(frac=1, random_state=2))
+        t_same, cs = timed(lambda: diff_frames(prev, curr))
+        t_moved, _ = timed(lambda: diff_frames(prev, moved))
+        t_html, _ = timed(lambda: change_items(cs.changes))
+        print(f"{n:>8} {t_same * 1e3:>10.1f}ms {t_moved * 1e3:>17.1f}ms {t_html * 1e3:>6.1f}ms {len(cs.changes):>9}")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [1_000, 10_000, 100_000])
@@ -0,0 +1,77 @@
+# =========================================================
+# Benchmark: histórico de disponibilidade após 1 ano de snapshots de 5 min
+#   python benchmarks/bench_history.py [locais] [dias]
+# O ano é semeado direto no SQLite (mesmo formato que `record` grava);
+# depois medimos gravação de um snapshot novo e as consultas.
+# =========================================================
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.synthetic import make_rows  # noqa: E402
+from dashboard.history import HistoryStore  # noqa: E402
+from dashboard.sheet import normalize  # noqa: E402
+
+STEP = 300            # 5 minutos
+CHANGE_RATE = 0.002   # fração de locais que muda de estado a cada snapshot
+
+
+def seed(store: HistoryStore, df, days: int, rng) -> float:
+    states = df[["Cam_Total", "Cam_Online", "Alm_Total", "Alm_Online"]].to_numpy(dtype=np.int64).copy()
+    ids = store._ensure_sites(df["Local"].astype(str).tolist())
+    n = len(ids)
+    t0 = time.time() - days * 86400
+    steps = days * 86400 // STEP
+    conn = store._conn
+    with conn:
+        conn.executemany("INSERT INTO changes VALUES (?,?,1,?,?,?,?)",
+                         ((sid, t0, *map(int, s)) for sid, s in zip(ids, states)))
+        batch = []
+        for k in range(1, steps):
+            ts = t0 + k * STEP
+            for i in np.flatnonzero(rng.random(n) < CHANGE_RATE):
+                tot = states[i, 0]
+                states[i, 1] = 0 if states[i, 1] else tot   # cai / volta
+                batch.append((ids[i], ts, *map(int, states[i])))
+            if len(batch) > 50_000:
+                conn.executemany("INSERT INTO changes VALUES (?,?,1,?,?,?,?)", batch); batch.clear()
+        conn.executemany("INSERT INTO changes VALUES (?,?,1,?,?,?,?)", batch)
+        conn.executemany("INSERT INTO snapshots (origin, ts, digest, sites) VALUES (?,?,?,?)",
+                         ((store.origin, t0 + k * STEP, f"seed{k}", n) for k in range(steps)))
+    return steps
+
+
+def timed(label, fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter(); out = fn(); best = min(best, time.perf_counter() - t0)
+    print(f"  {label:<32} {best * 1e3:>9.1f}ms")
+    return out
+
+
+def main(n_sites=1_000, days=365):
+    rng = np.random.default_rng(0)
+    df = normalize(make_rows(n_sites))
+    with tempfile.TemporaryDirectory() as tmp:
+        store = HistoryStore(Path(tmp) / "history.sqlite")
+        t0 = time.perf_counter(); steps = seed(store, df, days, rng)
+        changes = store._conn.execute("SELECT COUNT(*) FROM changes").fetchone()[0]
+        print(f"{n_sites} locais, {steps} snapshots, {changes} mudanças "
+              f"(semeadura {time.perf_counter() - t0:.1f}s, {Path(store.path).stat().st_size / 2**20:.1f} MiB)")
+        site = df["Local"].iloc[0]
+        timed("record (snapshot novo)", lambda: store.record(df.sample(frac=1, random_state=1), digest=str(time.time())), 1)
+        timed("state_at (ontem à noite)", lambda: store.state_at(time.time() - 12 * 3600))
+        timed("offline_since (câmeras)", lambda: store.offline_since("cam"))
+        timed("site_history (1 local, 1 ano)", lambda: store.site_history(site))
+        timed("availability 30 dias", lambda: store.availability(30))
+        timed("availability 90 dias", lambda: store.availability(90))
+        store.close()
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:3]])
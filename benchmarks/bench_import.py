@@ -0,0 +1,50 @@
+# =========================================================
+# Benchmark: tempo de import da camada de dados (interpretador novo)
+#   python benchmarks/bench_import.py [repetições]
+# Falha (código 1) se passar do limite ou se algum import pesado
+# (pandas, streamlit, plotly, reportlab...) acontecer no import.
+# =========================================================
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+BUDGET_MS = 100
+MODULES = ["dashboard", "dashboard.config", "dashboard.data", "dashboard.assets", "dashboard.fetch"]
+HEAVY = ["pandas", "numpy", "streamlit", "plotly", "reportlab", "requests", "openpyxl", "PIL"]
+
+_PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+import {module}
+dt = time.perf_counter() - t0
+print(json.dumps({{"ms": dt * 1000, "heavy": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def probe(module: str) -> dict:
+    out = subprocess.run([sys.executable, "-c", _PROBE.format(module=module, heavy=HEAVY)],
+                         cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout)
+
+
+def main(repeat: int) -> int:
+    failed = False
+    print(f"{'módulo':<20} {'mediana':>9} {'máx':>9}  imports pesados")
+    for module in MODULES:
+        runs = [probe(module) for _ in range(repeat)]
+        ms = [r["ms"] for r in runs]
+        heavy = runs[0]["heavy"]
+        med = statistics.median(ms)
+        bad = med > BUDGET_MS or heavy
+        failed |= bool(bad)
+        print(f"{module:<20} {med:>7.1f}ms {max(ms):>7.1f}ms  {', '.join(heavy) or '-'}{'  <-- FALHOU' if bad else ''}")
+    print(f"limite: {BUDGET_MS} ms")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 5))
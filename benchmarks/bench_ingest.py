@@ -0,0 +1,78 @@
+# =========================================================
+# Benchmark: leitura da planilha – read_excel x leitura em fluxo
+#   python benchmarks/bench_ingest.py [locais ...]
+# Pico de memória (tracemalloc) e tempo, numa planilha normal e na mesma
+# planilha com colunas extras e milhares de linhas formatadas no fim
+# (exportações consolidadas). Confere também que o resultado é idêntico.
+# =========================================================
+import sys
+import time
+import tracemalloc
+from io import BytesIO
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pandas as pd  # noqa: E402
+
+from benchmarks.synthetic import make_rows  # noqa: E402
+from dashboard.ingest import stream_sheet  # noqa: E402
+from dashboard.sheet import normalize, read_sheet  # noqa: E402
+
+EXTRA_COLS = 12        # colunas I..T preenchidas (observações, fórmulas copiadas...)
+TRAILING_ROWS = 3      # linhas formatadas vazias no fim, por local
+
+
+def workbook(n: int, heavy: bool) -> bytes:
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import PatternFill
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    for row in make_rows(n, seed=3).itertuples(index=False):
+        values = [None if (v is None or (isinstance(v, float) and v != v)) else v for v in row]
+        if heavy:
+            values += [f"obs {i}" for i in range(EXTRA_COLS)]
+        ws.append(values)
+    if heavy:
+        fill = PatternFill("solid", fgColor="FFF2CC")
+        for _ in range(n * TRAILING_ROWS):
+            cells = []
+            for _ in range(8):
+                c = WriteOnlyCell(ws)
+                c.fill = fill
+                cells.append(c)
+            ws.append(cells)
+    buf = BytesIO()
+    wb.save(buf)
+    return buf.getvalue()
+
+
+def measure(fn):
+    """Tempo (sem tracemalloc, que distorce) e pico de memória (com)."""
+    t0 = time.perf_counter()
+    out = fn()
+    elapsed = time.perf_counter() - t0
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak, out
+
+
+def main(sizes):
+    print(f"{'locais':>8} {'planilha':<10} {'MiB xlsx':>9} {'read_excel':>22} {'em fluxo':>22} {'resultado MiB':>14}")
+    for n in sizes:
+        for heavy in (False, True):
+            content = workbook(n, heavy)
+            t1, m1, a = measure(lambda: normalize(read_sheet(content)))
+            t2, m2, b = measure(lambda: normalize(stream_sheet(content)))
+            pd.testing.assert_frame_equal(a, b)
+            size = b.memory_usage(deep=True).sum()
+            print(f"{n:>8} {'pesada' if heavy else 'normal':<10} {len(content) / 2**20:>9.1f} "
+                  f"{t1:>8.2f}s {m1 / 2**20:>9.1f}MiB {t2:>8.2f}s {m2 / 2**20:>9.1f}MiB {size / 2**20:>13.1f}")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [5000, 20000])
@@ -0,0 +1,93 @@
+# =========================================================
+# Benchmark: modo ao vivo – custo de telas ociosas e detecção de versão nova
+#   python benchmarks/bench_live.py [locais] [telas]
+# Compara, por redesenho de tela, o caminho ao vivo (poller + caches) com
+# o que um rerun completo refaz (cópia do cache_data + agregados + HTML).
+# Só o custo de dados: o envio dos elementos ao navegador é igual nos dois.
+# =========================================================
+import os
+import pickle
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+os.environ.setdefault("DASHBOARD_HISTORY_DB", "off")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.synthetic import make_workbook  # noqa: E402
+from dashboard.aggregates import aggregate_cache, compute_aggregates, query_key  # noqa: E402
+from dashboard.fetch import fetcher_for  # noqa: E402
+from dashboard.live import LivePoller  # noqa: E402
+from dashboard.render import chunks, site_cards  # noqa: E402
+
+
+def per_call(fn, repeat=50):
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - t0) / repeat
+
+
+def main(n, screens):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "fonte.xlsx"
+        make_workbook(n, seed=1, path=path)
+        fetcher_for(str(path), ttl=0)
+        poller = LivePoller(str(path), interval=0.2)
+        version, df = poller.current()
+        html = {}
+
+        def live_tick():
+            v, d = poller.current()
+            agg = aggregate_cache.get(v, query_key(""), lambda: d)
+            key = (v, "cam")
+            if key not in html:
+                html[key] = chunks(site_cards(agg.cam.manutencao.iloc[:500], "cam"))
+            return html[key]
+
+        blob = pickle.dumps(df)
+
+        def full_rerun():
+            d = pickle.loads(blob)  # st.cache_data devolve uma cópia a cada rerun
+            agg = compute_aggregates(d)
+            return chunks(site_cards(agg.cam.manutencao.iloc[:500], "cam"))
+
+        live_tick()
+        t_live, t_full = per_call(live_tick), per_call(full_rerun, 10)
+        print(f"{n} locais, por redesenho: ao vivo {t_live * 1e3:.3f} ms  |  rerun completo {t_full * 1e3:.1f} ms")
+
+        # telas ociosas: cada uma redesenha a cada 30 s; CPU por segundo de relógio
+        busy = screens / 30 * t_live
+        print(f"{screens} telas a cada 30 s: ~{busy * 1e3:.2f} ms de CPU por segundo "
+              f"(rerun completo: ~{screens / 30 * t_full * 1e3:.0f} ms/s)")
+
+        # origem consultada pelo poller, não pelas telas
+        checks = [0]
+        f = fetcher_for(str(path))
+        orig = f._refresh
+        def counted():
+            checks[0] += 1
+            return orig()
+        f._refresh = counted
+        poller.start()
+        t0 = time.perf_counter()
+        while time.perf_counter() - t0 < 1.0:
+            for _ in range(screens):
+                poller.current()
+            time.sleep(0.01)
+        print(f"1 s com {screens} telas lendo: {checks[0]} consultas à origem (intervalo do poller 0,2 s)")
+
+        # latência até uma versão nova aparecer
+        gen = poller.generation
+        make_workbook(n, seed=2, path=path)
+        t0 = time.perf_counter()
+        poller.wait(gen, timeout=10)
+        print(f"versão nova detectada e carregada em {time.perf_counter() - t0:.2f}s "
+              f"({poller.version[:12]} != {version[:12]})")
+        poller.stop()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 200)
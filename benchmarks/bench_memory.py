@@ -0,0 +1,65 @@
+# =========================================================
+# Benchmark: memória por sessão do DataFrame de locais
+#   python benchmarks/bench_memory.py [locais ...]
+# Antes: contagens int64, Local/Apelido como texto e uma cópia
+# serializada por sessão (o que o st.cache_data faz a cada acesso).
+# Depois: representação compacta (sheet.compact) compartilhada, e cada
+# sessão recebe só uma cópia rasa (st.cache_resource + copy(deep=False)).
+# =========================================================
+import pickle
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pandas as pd  # noqa: E402
+
+from benchmarks.synthetic import make_workbook  # noqa: E402
+from dashboard.sheet import COUNT_COLUMNS, FALTA_COLUMNS, TEXT_COLUMNS, parse_sheet  # noqa: E402
+
+SESSIONS = 20
+
+
+def legacy(df: pd.DataFrame) -> pd.DataFrame:
+    """Mesmo DataFrame nos tipos de antes (NORMALIZE_VERSION 2)."""
+    out = df.copy()
+    for c in COUNT_COLUMNS + FALTA_COLUMNS:
+        out[c] = out[c].astype("int64")
+    for c in TEXT_COLUMNS:
+        if isinstance(out[c].dtype, pd.CategoricalDtype):
+            out[c] = out[c].astype(out[c].cat.categories.dtype)
+    return out
+
+
+def per_session(df: pd.DataFrame, handout) -> tuple[float, float]:
+    """Bytes e tempo médios que cada sessão acrescenta ao receber o DataFrame."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    t0 = time.perf_counter()
+    kept = [handout(df) for _ in range(SESSIONS)]
+    elapsed = time.perf_counter() - t0
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del kept
+    return used / SESSIONS, elapsed / SESSIONS
+
+
+def main(sizes):
+    print(f"{SESSIONS} sessões por medição")
+    print(f"{'locais':>8} {'':<7} {'DataFrame MiB':>14} {'por sessão KiB':>15} {'entrega ms':>11}")
+    for n in sizes:
+        df = parse_sheet(make_workbook(n, seed=5))
+        old = legacy(df)
+        for name, frame, handout in (
+            ("antes", old, lambda d: pickle.loads(pickle.dumps(d, pickle.HIGHEST_PROTOCOL))),
+            ("depois", df, lambda d: d.copy(deep=False)),
+        ):
+            size = frame.memory_usage(deep=True).sum()
+            used, elapsed = per_session(frame, handout)
+            print(f"{n:>8} {name:<7} {size / 2**20:>14.2f} {used / 2**10:>15.1f} {elapsed * 1e3:>11.2f}")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [1000, 20000])
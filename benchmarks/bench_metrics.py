@@ -0,0 +1,46 @@
+# =========================================================
+# Benchmark: custo da instrumentação (dashboard/metrics.py)
+#   python benchmarks/bench_metrics.py [chamadas]
+# Span como decorador e como contexto, contador e exportação /metrics.
+# =========================================================
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from dashboard import metrics  # noqa: E402
+
+
+def per_call(fn, n):
+    t0 = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - t0) / n
+
+
+def main(n):
+    def nada():
+        return None
+
+    medido = metrics.span("bench.decorador")(nada)
+
+    def contexto():
+        with metrics.span("bench.contexto"):
+            pass
+
+    base = per_call(nada, n)
+    print(f"chamada vazia           {base * 1e9:>8.0f} ns")
+    print(f"@span                   {(per_call(medido, n) - base) * 1e9:>8.0f} ns a mais")
+    print(f"with span               {per_call(contexto, n) * 1e9:>8.0f} ns")
+    print(f"count                   {per_call(lambda: metrics.count('bench'), n) * 1e9:>8.0f} ns")
+    with metrics.rerun():
+        t = per_call(contexto, n)
+    print(f"with span (em rerun)    {t * 1e9:>8.0f} ns")
+    for i in range(40):
+        metrics.observe(f"trecho.{i}", 0.001 * i)
+    print(f"prometheus() 40+ spans  {per_call(metrics.prometheus, 200) * 1e6:>8.0f} µs")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
@@ -0,0 +1,61 @@
+# =========================================================
+# Micro-benchmark da normalização vetorizada
+#   python benchmarks/bench_normalize.py [linhas ...]
+# Compara o tempo de `dashboard.sheet.normalize` com a versão linha a linha
+# original. A paridade entre as duas é testada em tests/test_sheet.py.
+# =========================================================
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.synthetic import make_rows  # noqa: E402
+from dashboard.sheet import COLUMNS, COUNT_COLUMNS, SUMMARY_ROWS, _to_int, normalize  # noqa: E402
+
+
+def normalize_rowwise(raw: pd.DataFrame) -> pd.DataFrame:
+    """Implementação original (apply por linha) – referência de paridade."""
+    raw = raw.dropna(how="all").iloc[:, 0:8]
+    if raw.shape[1] < 8:
+        raw[7] = ""
+    raw.columns = COLUMNS
+    raw = raw.dropna(subset=["Local"])
+    raw = raw[~raw["Local"].astype(str).str.contains(SUMMARY_ROWS, case=False, na=False)]
+    for c in COUNT_COLUMNS:
+        raw[c] = raw[c].apply(_to_int)
+    raw["Cam_Falta"] = (raw["Cam_Total"] - raw["Cam_Online"]).clip(lower=0)
+    raw["Alm_Falta"] = (raw["Alm_Total"] - raw["Alm_Online"]).clip(lower=0)
+    raw["Cam_OfflineBool"] = (raw["Cam_Total"]>0) & (raw["Cam_Online"]==0)
+    raw["Alm_OfflineBool"] = (raw["Alm_Total"]>0) & (raw["Alm_Online"]==0)
+    def cam_status(r):
+        if r["Cam_Total"]==0: return "SEM CÂMERAS"
+        if r["Cam_Online"]==0: return "OFFLINE"
+        if r["Cam_Online"]<r["Cam_Total"]: return f"FALTANDO {int(r['Cam_Falta'])}"
+        return "OK"
+    raw["Cam_Status"] = raw.apply(cam_status, axis=1)
+    def alm_status(r):
+        if r["Alm_Total"]==0: return "SEM ALARME"
+        if r["Alm_Online"]==0: return "OFFLINE"
+        if r["Alm_Online"]<r["Alm_Total"]: return f"PARCIAL ({int(r['Alm_Online'])}/{int(r['Alm_Total'])})"
+        return "100%"
+    raw["Alm_Status"] = raw.apply(alm_status, axis=1)
+    return raw.reset_index(drop=True)
+
+
+def main(sizes):
+    print(f"{'linhas':>9} {'linha a linha':>14} {'vetorizado':>12} {'ganho':>7}")
+    for n in sizes:
+        raw = make_rows(n)
+        if n <= 100_000:
+            t0 = time.perf_counter(); normalize_rowwise(raw.copy()); old = time.perf_counter() - t0
+        else:
+            old = float("nan")
+        t0 = time.perf_counter(); normalize(raw.copy()); new = time.perf_counter() - t0
+        print(f"{n:>9} {old * 1e3:>12.1f}ms {new * 1e3:>10.1f}ms {old / new:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [1_000, 10_000, 100_000, 1_000_000])
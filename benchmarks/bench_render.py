@@ -0,0 +1,65 @@
+# =========================================================
+# Benchmark: HTML da lista de manutenção – laço iterrows x montagem vetorizada
+#   python benchmarks/bench_render.py [locais ...]
+# "elementos" = quantos st.markdown (deltas no websocket) cada versão envia.
+# =========================================================
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.synthetic import make_rows  # noqa: E402
+from dashboard.render import PAGE_SIZE, chunks, site_cards  # noqa: E402
+from dashboard.sheet import normalize  # noqa: E402
+
+
+def chip(texto, tipo):
+    cls = "ok" if tipo=="ok" else ("warn" if tipo=="warn" else "off")
+    return f"<span class='chip {cls}'>{texto}</span>"
+
+
+def cards_loop(rows, kind):
+    """Laço original de render_cameras/render_alarms (um st.markdown por local)."""
+    out = []
+    for _, r in rows.iterrows():
+        if kind == "cam":
+            status = "OFFLINE" if r["Cam_OfflineBool"] else f"FALTANDO {int(r['Cam_Falta'])}"
+            tot, on = r["Cam_Total"], r["Cam_Online"]
+        else:
+            status = "OFFLINE" if r["Alm_OfflineBool"] else f"PARCIAL ({int(r['Alm_Online'])}/{int(r['Alm_Total'])})"
+            tot, on = r["Alm_Total"], r["Alm_Online"]
+        cls = "offline" if "OFFLINE" in status else ""
+        out.append(
+            f"<div class='local-card {cls}'>"
+            f"<div class='local-title'>📍 {r['Local']} — {chip(status, 'off' if 'OFFLINE' in status else 'warn')}</div>"
+            f"<div class='local-info'>Total: {tot} • Online: {on}</div>"
+            f"</div>"
+        )
+    return out
+
+
+def maintenance_rows(df, kind):
+    p = "Cam" if kind == "cam" else "Alm"
+    base = df[df[f"{p}_Total"] > 0].copy()
+    base["__prio"] = np.where(base[f"{p}_OfflineBool"], 2, np.where(base[f"{p}_Falta"] > 0, 1, 0))
+    return base[base["__prio"] > 0].sort_values(["__prio", f"{p}_Falta"], ascending=[False, False])
+
+
+def main(sizes):
+    print(f"{'locais':>8} {'lista':>7} {'laço':>10} {'vetorizado':>11} {'elementos antes/depois':>24}")
+    for n in sizes:
+        df = normalize(make_rows(n))
+        for kind in ("cam", "alm"):
+            rows = maintenance_rows(df, kind)
+            t0 = time.perf_counter(); old = cards_loop(rows, kind); t_old = time.perf_counter() - t0
+            t0 = time.perf_counter(); new = chunks(site_cards(rows.iloc[:PAGE_SIZE], kind)); t_new = time.perf_counter() - t0
+            assert site_cards(rows, kind).tolist() == old
+            print(f"{n:>8} {kind + ' ' + str(len(rows)):>7} {t_old * 1e3:>8.1f}ms {t_new * 1e3:>9.1f}ms "
+                  f"{len(old):>14} / {len(new)}")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [1_000, 10_000, 100_000])
@@ -0,0 +1,42 @@
+# =========================================================
+# Benchmark: relatório PDF – tabela única x tabela em blocos
+#   python benchmarks/bench_report.py [linhas ...]
+# =========================================================
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.synthetic import make_rows  # noqa: E402
+from dashboard.aggregates import compute_aggregates  # noqa: E402
+from dashboard.report import build_pdf, report_table  # noqa: E402
+from dashboard.sheet import normalize  # noqa: E402
+
+
+def measure(fn):
+    """Tempo (sem tracemalloc, que distorce) e pico de memória (com)."""
+    t0 = time.perf_counter()
+    out = fn()
+    elapsed = time.perf_counter() - t0
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak, out
+
+
+def main(sizes):
+    print(f"{'linhas':>8} {'tabela única':>20} {'em blocos':>20} {'páginas':>8}")
+    build_pdf(report_table(compute_aggregates(normalize(make_rows(100))).faltando), "aquecimento")
+    for n in sizes:
+        table = report_table(compute_aggregates(normalize(make_rows(n * 4))).faltando).iloc[:n]
+        t1, m1, _ = measure(lambda: build_pdf(table, "Benchmark", chunk_rows=len(table) + 1))
+        t2, m2, pdf = measure(lambda: build_pdf(table, "Benchmark"))
+        pages = pdf.count(b"/Type /Page") - pdf.count(b"/Type /Pages")
+        print(f"{len(table):>8} {t1:>8.2f}s {m1 / 2**20:>7.1f}MiB  {t2:>8.2f}s {m2 / 2**20:>7.1f}MiB {pages:>8}")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [500, 2_000, 5_000])
@@ -0,0 +1,59 @@
+# =========================================================
+# Benchmark: busca Local/Apelido – varredura str.contains x índice
+#   python benchmarks/bench_search.py [locais ...]
+# =========================================================
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.synthetic import make_rows  # noqa: E402
+from dashboard.search import SearchIndex  # noqa: E402
+from dashboard.sheet import normalize  # noqa: E402
+
+QUERIES = ["1", "an", "são", "posto são joão 4", "condomínio 99", "joão 12345", "inexistente"]
+
+
+def scan(df, query):
+    """
+    Busca original: minúsculas + str.contains em todas as linhas a cada tecla.
+    Os nulos ficam de fora explicitamente, como no índice (o `astype(str)`
+    original os tornava "nan" no pandas < 3).
+    """
+    termo = query.strip().lower()
+    local, apelido = (df[c].astype(str).where(df[c].notna()) for c in ("Local", "Apelido"))
+    m = (local.str.lower().str.contains(termo, na=False, regex=False) |
+         apelido.str.lower().str.contains(termo, na=False, regex=False))
+    return np.flatnonzero(m.to_numpy())
+
+
+def per_query(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for q in QUERIES:
+            fn(q)
+        best = min(best, time.perf_counter() - t0)
+    return best / len(QUERIES)
+
+
+def main(sizes):
+    print(f"{'locais':>8} {'montagem':>10} {'varredura':>11} {'índice':>9} {'s/ acento':>10} {'aprox.':>9}")
+    for n in sizes:
+        df = normalize(make_rows(n))
+        t0 = time.perf_counter(); idx = SearchIndex(df); build = time.perf_counter() - t0
+        for q in QUERIES:
+            assert np.array_equal(idx.search(q), scan(df, q)), q
+        old = per_query(lambda q: scan(df, q))
+        new = per_query(idx.search)
+        acc = per_query(lambda q: idx.search(q, accents=True))
+        fz = per_query(lambda q: idx.search(q, fuzzy=True))
+        print(f"{n:>8} {build * 1e3:>8.0f}ms {old * 1e3:>9.2f}ms {new * 1e3:>7.2f}ms "
+              f"{acc * 1e3:>8.2f}ms {fz * 1e3:>7.2f}ms")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [10_000, 100_000])
@@ -0,0 +1,48 @@
+# =========================================================
+# Benchmark: Excel frio x snapshot em disco x cache em memória
+#   python benchmarks/bench_snapshot.py [linhas ...]
+# =========================================================
+import hashlib
+import pickle
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.synthetic import make_workbook  # noqa: E402
+from dashboard.sheet import NORMALIZE_VERSION, parse_sheet  # noqa: E402
+from dashboard.snapshot import SnapshotStore, snapshot_key  # noqa: E402
+
+
+def best_of(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main(sizes):
+    print(f"{'linhas':>8} {'excel frio':>12} {'snapshot':>12} {'memória':>12}")
+    for n in sizes:
+        content = make_workbook(n)
+        digest = hashlib.sha256(content).hexdigest()
+        with tempfile.TemporaryDirectory() as tmp:
+            store = SnapshotStore(tmp)
+            key = snapshot_key(digest, NORMALIZE_VERSION)
+            cold = best_of(lambda: parse_sheet(content), repeat=3)
+            df = parse_sheet(content)
+            store.save(key, df)
+            warm = best_of(lambda: store.load(key))
+            assert store.load(key).equals(df)
+            # st.cache_data devolve uma cópia (pickle) a cada acerto
+            blob = pickle.dumps(df)
+            hit = best_of(lambda: pickle.loads(blob))
+        print(f"{n:>8} {cold * 1e3:>10.1f}ms {warm * 1e3:>10.1f}ms {hit * 1e3:>10.1f}ms")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [2_000, 20_000])
@@ -0,0 +1,87 @@
+# =========================================================
+# Benchmark: várias planilhas regionais – carga em série x em paralelo
+#   python benchmarks/bench_sources.py [regiões] [locais] [latência_s]
+# As planilhas são servidas por HTTP local com latência artificial (como o
+# Drive); uma região extra aponta para uma porta fechada (origem fora do ar).
+# =========================================================
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+os.environ.setdefault("DASHBOARD_HISTORY_DB", "off")
+os.environ.setdefault("DASHBOARD_CACHE_DIR", tempfile.mkdtemp(prefix="bench-sources-"))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.synthetic import make_workbook  # noqa: E402
+from dashboard.fetch import fetcher_for  # noqa: E402
+from dashboard.sources import Source, load_one, load_sources  # noqa: E402
+
+
+def serve(folder: Path, latency: float) -> ThreadingHTTPServer:
+    class Slow(SimpleHTTPRequestHandler):
+        def __init__(self, *a, **k):
+            super().__init__(*a, directory=str(folder), **k)
+
+        def do_GET(self):
+            time.sleep(latency)
+            super().do_GET()
+
+        def log_message(self, *_a):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Slow)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    out = fn()
+    return time.perf_counter() - t0, out
+
+
+def main(regions, n, latency):
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = Path(tmp)
+        for i in range(regions):
+            make_workbook(n, seed=i, path=folder / f"r{i}.xlsx")
+        httpd = serve(folder, latency)
+        base = f"http://127.0.0.1:{httpd.server_address[1]}"
+        sources = [Source(f"Região {i}", f"{base}/r{i}.xlsx") for i in range(regions)]
+        sources.append(Source("Fora do ar", "http://127.0.0.1:9/fora.xlsx"))
+
+        def reset():
+            for s in sources:
+                fetcher_for(s.location).invalidate()
+
+        print(f"{regions} regiões x {n} locais, latência {latency * 1e3:.0f} ms + 1 região fora do ar")
+        # 1ª carga: busca + leitura do Excel de todas
+        t_serial, _ = timed(lambda: [load_one(s, force=True) for s in sources])
+        reset()
+        # mesmas versões: nada a reler, só a busca pesa
+        t_serial_warm, _ = timed(lambda: [load_one(s, force=True) for s in sources])
+        reset()
+        t_par, multi = timed(lambda: load_sources(sources, force=True))
+        print(f"  em série (busca + leitura)       {t_serial * 1e3:>8.0f} ms")
+        print(f"  em série (versões conhecidas)    {t_serial_warm * 1e3:>8.0f} ms")
+        print(f"  em paralelo (versões conhecidas) {t_par * 1e3:>8.0f} ms  -> {len(multi.df)} linhas unidas")
+
+        # uma região muda: só ela é relida
+        make_workbook(n, seed=99, path=folder / "r0.xlsx")
+        reset()
+        t_one, multi = timed(lambda: load_sources(sources, force=True))
+        print(f"  em paralelo, 1 região nova       {t_one * 1e3:>8.0f} ms")
+        for r in multi.results:
+            print(f"    {r.source.name:<12} busca {r.fetch_s * 1e3:>7.1f} ms  leitura {r.parse_s * 1e3:>7.1f} ms  "
+                  f"{r.rows:>6} linhas  {r.status}")
+        httpd.shutdown()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 6,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 5000,
+         float(sys.argv[3]) if len(sys.argv) > 3 else 0.3)
@@ -0,0 +1,189 @@
+# =========================================================
+# Suíte de benchmarks reprodutível (offline, sem Streamlit)
+#   python benchmarks/run.py                        # 100 .. 100k locais
+#   python benchmarks/run.py -n 100 1000 1000000    # até 1M
+#   python benchmarks/run.py --comparar base.json novo.json
+#
+# Cada tamanho usa uma planilha sintética (benchmarks/synthetic.py, semente
+# fixa, guardada em .cache/bench para as próximas rodadas) e mede cada
+# etapa em separado: leitura do Excel, normalização, leitura em fluxo,
+# snapshot, índice e busca, agregados, cartões da lista de manutenção e PDF.
+# O resultado vai para benchmarks/results/<commit>.json (fora do git).
+# =========================================================
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+os.environ.setdefault("DASHBOARD_HISTORY_DB", "off")
+os.environ.setdefault("DASHBOARD_METRICS", "off")
+sys.path.insert(0, str(ROOT))
+
+DEFAULT_SIZES = [100, 1000, 10000, 100000]
+STAGES = ["excel", "normalizacao", "fluxo", "snapshot", "indice", "busca", "busca_aproximada",
+          "agregados", "lista", "pdf"]
+WORKBOOKS = ROOT / ".cache" / "bench"
+RESULTS = ROOT / "benchmarks" / "results"
+SEED = 7
+QUERY = "são joão 12"
+
+
+# ------------------ ambiente ------------------
+def _git(*args) -> str:
+    try:
+        return subprocess.run(["git", *args], cwd=ROOT, capture_output=True, text=True,
+                              timeout=10).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return ""
+
+
+def environment() -> dict:
+    import numpy as np
+    import pandas as pd
+
+    return {
+        "commit": _git("rev-parse", "--short", "HEAD") or "sem-git",
+        "alterado": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "data": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "plataforma": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def workbook(n: int) -> bytes:
+    """Planilha sintética de `n` locais (gerada uma vez por tamanho/semente)."""
+    from benchmarks.synthetic import make_workbook
+
+    path = WORKBOOKS / f"locais-{n}-s{SEED}.xlsx"
+    if path.exists():
+        return path.read_bytes()
+    WORKBOOKS.mkdir(parents=True, exist_ok=True)
+    content = make_workbook(n, seed=SEED)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_bytes(content)
+    os.replace(tmp, path)
+    return content
+
+
+# ------------------ medição ------------------
+def timed(fn, repeat: int) -> tuple[dict, object]:
+    times, out = [], None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        times.append(time.perf_counter() - t0)
+    return {"mediana_s": statistics.median(times), "min_s": min(times), "n": repeat}, out
+
+
+def run_size(n: int, stages: list[str], repeat: int, excel_repeat: int, pdf_rows: int) -> dict:
+    from dashboard.aggregates import compute_aggregates
+    from dashboard.ingest import stream_sheet
+    from dashboard.render import chunks, site_cards
+    from dashboard.report import build_pdf, report_table
+    from dashboard.search import SearchIndex
+    from dashboard.sheet import normalize, read_sheet
+    from dashboard.snapshot import SnapshotStore
+
+    content = workbook(n)
+    out: dict = {"locais": n, "bytes": len(content)}
+
+    def stage(name, fn, reps=repeat):
+        if name not in stages:
+            return fn() if name in ("excel", "normalizacao", "indice", "agregados") else None
+        out[name], value = timed(fn, reps)
+        print(f"  {name:<18} {out[name]['mediana_s'] * 1e3:>10.1f} ms", flush=True)
+        return value
+
+    raw = stage("excel", lambda: read_sheet(content), excel_repeat)
+    df = stage("normalizacao", lambda: normalize(raw.copy()))
+    stage("fluxo", lambda: normalize(stream_sheet(content)), excel_repeat)  # leitura em fluxo + normalize
+    if "snapshot" in stages:
+        with tempfile.TemporaryDirectory() as tmp:
+            store = SnapshotStore(tmp)
+            store.save("bench", df)
+            stage("snapshot", lambda: store.load("bench"))
+    index = stage("indice", lambda: SearchIndex(df))
+    stage("busca", lambda: index.filter(df, QUERY, accents=True))
+    stage("busca_aproximada", lambda: index.filter(df, "sao jaoo 12", accents=True, fuzzy=True))
+    agg = stage("agregados", lambda: compute_aggregates(df))
+    stage("lista", lambda: (chunks(site_cards(agg.cam.manutencao, "cam")),
+                            chunks(site_cards(agg.alm.manutencao, "alm"))))
+    if "pdf" in stages:
+        table = report_table(agg.faltando).iloc[:pdf_rows]
+        out["pdf_linhas"] = len(table)
+        stage("pdf", lambda: build_pdf(table, "Benchmark"), max(1, min(repeat, 3)))
+    return out
+
+
+def run(args) -> dict:
+    result = {"ambiente": environment(), "parametros": {
+        "semente": SEED, "repeticoes": args.repeticoes, "pdf_max": args.pdf_max}, "tamanhos": {}}
+    for n in args.tamanhos:
+        print(f"{n} locais", flush=True)
+        excel_repeat = args.repeticoes if n <= 10000 else 1  # read_excel de 100k+ leva minutos
+        result["tamanhos"][str(n)] = run_size(n, args.etapas, args.repeticoes, excel_repeat, args.pdf_max)
+    return result
+
+
+# ------------------ comparação ------------------
+def compare(base_path: str, new_path: str, limit: float) -> int:
+    base = json.loads(Path(base_path).read_text(encoding="utf-8"))
+    new = json.loads(Path(new_path).read_text(encoding="utf-8"))
+    print(f"base: {base['ambiente']['commit']}  novo: {new['ambiente']['commit']}  "
+          f"(regressão: > {limit:.2f}x)")
+    print(f"{'locais':>8} {'etapa':<18} {'base':>10} {'novo':>10} {'razão':>7}")
+    regressions = 0
+    for n, stages in new["tamanhos"].items():
+        before = base["tamanhos"].get(n, {})
+        for name in STAGES:
+            if name not in stages or name not in before:
+                continue
+            a, b = before[name]["mediana_s"], stages[name]["mediana_s"]
+            ratio = b / a if a > 0 else float("inf")
+            flag = ""
+            if ratio > limit:
+                flag, regressions = "  <- regressão", regressions + 1
+            elif ratio < 1 / limit:
+                flag = "  melhor"
+            print(f"{n:>8} {name:<18} {a * 1e3:>8.1f}ms {b * 1e3:>8.1f}ms {ratio:>6.2f}x{flag}")
+    return 1 if regressions else 0
+
+
+def main(argv=None) -> int:
+    p = argparse.ArgumentParser(prog="python benchmarks/run.py",
+                                description="Benchmarks por etapa com planilhas sintéticas.")
+    p.add_argument("-n", "--tamanhos", type=int, nargs="+", default=DEFAULT_SIZES,
+                   help="quantidades de locais (padrão: 100 1000 10000 100000)")
+    p.add_argument("-e", "--etapas", nargs="+", choices=STAGES, default=STAGES)
+    p.add_argument("-r", "--repeticoes", type=int, default=5)
+    p.add_argument("--pdf-max", type=int, default=5000, help="linhas no PDF (o relatório de 1M locais não cabe)")
+    p.add_argument("-o", "--saida", help="arquivo JSON (padrão: benchmarks/results/<commit>.json)")
+    p.add_argument("--comparar", nargs=2, metavar=("BASE", "NOVO"),
+                   help="compara dois resultados; código de saída 1 se houver regressão")
+    p.add_argument("--limite", type=float, default=1.10, help="razão novo/base considerada regressão")
+    args = p.parse_args(argv)
+
+    if args.comparar:
+        return compare(*args.comparar, args.limite)
+
+    result = run(args)
+    path = Path(args.saida) if args.saida else RESULTS / f"{result['ambiente']['commit']}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(result, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"resultado: {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+# =========================================================
+# Planilhas sintéticas no layout esperado por load_data
+# (A–H: Local, câmeras total/online/status, alarmes total/online/status, Apelido)
+# =========================================================
+from __future__ import annotations
+
+from io import BytesIO
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+_CAM_SENTINELS = np.array(["OFFLINE", "SEM CÂMERAS", "SEM CAMERAS"], dtype=object)
+_ALM_SENTINELS = np.array(["OFFLINE", "SEM ALARME"], dtype=object)
+
+
+def make_rows(n: int, seed: int = 0) -> pd.DataFrame:
+    """
+    `n` locais como read_excel(header=None) devolveria: títulos no topo,
+    linhas em branco, contagens como número/texto ("3", "2,0") e as
+    sentinelas de texto, Apelido às vezes vazio e rodapé TOTAL/RELATÓRIO.
+    """
+    rng = np.random.default_rng(seed)
+    cam_tot = rng.choice([0, 1, 2, 4, 8, 16, 32], size=n).astype(object)
+    cam_on = np.minimum(cam_tot.astype(int), rng.integers(0, 33, size=n))
+    cam_on = np.where(rng.random(n) < 0.8, cam_tot, cam_on).astype(object)
+    alm_tot = rng.choice([0, 1, 1, 2, 3], size=n).astype(object)
+    alm_on = np.where(rng.random(n) < 0.85, alm_tot, rng.integers(0, 2, size=n)).astype(object)
+
+    # texto onde deveria haver número
+    r = rng.random(n)
+    cam_on[r < 0.05] = _CAM_SENTINELS[rng.integers(0, 3, size=int((r < 0.05).sum()))]
+    cam_tot[(r >= 0.05) & (r < 0.08)] = "SEM CÂMERAS"
+    cam_on[(r >= 0.08) & (r < 0.10)] = [f"{v},0" for v in cam_tot[(r >= 0.08) & (r < 0.10)]]
+    r = rng.random(n)
+    alm_on[r < 0.05] = _ALM_SENTINELS[rng.integers(0, 2, size=int((r < 0.05).sum()))]
+    alm_tot[(r >= 0.05) & (r < 0.08)] = "SEM ALARME"
+    alm_tot[(r >= 0.08) & (r < 0.09)] = [str(v) for v in alm_tot[(r >= 0.08) & (r < 0.09)]]
+
+    ids = np.arange(n)
+    local = np.char.add("Posto São João ", ids.astype(str)).astype(object)
+    apelido = np.char.add("Condomínio ", (ids % 997).astype(str)).astype(object)
+    apelido[rng.random(n) < 0.3] = None
+
+    body = pd.DataFrame({0: local, 1: cam_tot, 2: cam_on, 3: None,
+                         4: alm_tot, 5: alm_on, 6: None, 7: apelido})
+    head = pd.DataFrame([["RELATÓRIO OPERACIONAL", None, None, None, None, None, None, None],
+                         [None] * 8])
+    foot = pd.DataFrame([[None] * 8,
+                         ["TOTAL", int(np.sum(cam_on == cam_tot)), None, None, None, None, None, None],
+                         ["Relatório gerado automaticamente", None, None, None, None, None, None, None]])
+    return pd.concat([head, body, foot], ignore_index=True)
+
+
+def make_workbook(n: int, seed: int = 0, path: str | Path | None = None) -> bytes:
+    """Planilha .xlsx sintética; devolve os bytes e grava em `path` se informado."""
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    for row in make_rows(n, seed).itertuples(index=False):
+        ws.append([None if (v is None or (isinstance(v, float) and np.isnan(v))) else v for v in row])
+    buf = BytesIO()
+    wb.save(buf)
+    content = buf.getvalue()
+    if path is not None:
+        Path(path).write_bytes(content)
+    return content
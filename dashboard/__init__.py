@@ -0,0 +1,7 @@
+"""
+Camada de dados do Dashboard Operacional – CFTV & Alarmes.
+
+Módulos sem dependência do Streamlit, reutilizados pelo app, pela linha
+de comando (`python -m dashboard`) e por scripts. `dashboard.data` é a
+porta de entrada e importa pandas/numpy só quando usado.
+"""
@@ -0,0 +1,111 @@
+# =========================================================
+# Agregados por versão da planilha + busca
+# Totais, online/offline, locais p/ manutenção e listas já ordenadas,
+# calculados uma vez e reaproveitados pelas três abas.
+# =========================================================
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from dashboard import metrics
+
+DEFAULT_MAXSIZE = 128
+
+
+@dataclass(frozen=True)
+class DeviceSummary:
+    total: int
+    online: int
+    offline: int              # max(total - online, 0), como nas abas
+    locais_manut: int
+    manutencao: pd.DataFrame  # locais offline/faltando, ordenados por prioridade
+
+
+@dataclass(frozen=True)
+class Aggregates:
+    cam: DeviceSummary
+    alm: DeviceSummary
+    locais_manut: int         # câmeras OU alarmes (aba Geral)
+    faltando: pd.DataFrame    # lista combinada (relatório PDF), na ordem da planilha
+
+    @property
+    def cam_off(self) -> int:
+        return self.cam.total - self.cam.online
+
+    @property
+    def alm_off(self) -> int:
+        return self.alm.total - self.alm.online
+
+
+def _summary(dfx: pd.DataFrame, prefix: str) -> DeviceSummary:
+    # direto nos arrays (contagens compactas -> int64): sem copiar o recorte
+    # inteiro; só as linhas da lista de manutenção são extraídas, já na ordem
+    tot = dfx[f"{prefix}_Total"].to_numpy(dtype=np.int64)
+    on = dfx[f"{prefix}_Online"].to_numpy(dtype=np.int64)
+    falta = dfx[f"{prefix}_Falta"].to_numpy(dtype=np.int64)
+    has = tot > 0
+    offline_b = dfx[f"{prefix}_OfflineBool"].to_numpy(dtype=bool) & has
+    total = int(tot[has].sum())
+    online = int(on[has].sum())
+
+    prio = np.where(offline_b, 2, np.where(falta > 0, 1, 0)) * has
+    pos = np.flatnonzero(prio > 0)
+    # prioridade e depois Falta decrescentes; empates na ordem da planilha
+    pos = pos[np.lexsort((-falta[pos], -prio[pos]))]
+    return DeviceSummary(total=total, online=online, offline=max(total - online, 0),
+                         locais_manut=len(pos), manutencao=dfx.iloc[pos])
+
+
+@metrics.span("agregados")
+def compute_aggregates(dfx: pd.DataFrame) -> Aggregates:
+    locais_manut = int(((dfx["Cam_OfflineBool"]) | (dfx["Cam_Falta"]>0) |
+                        (dfx["Alm_OfflineBool"]) | (dfx["Alm_Falta"]>0)).sum())
+    faltando = dfx[(dfx["Cam_Falta"] > 0) | (dfx["Alm_Falta"] > 0)]
+    return Aggregates(cam=_summary(dfx, "Cam"), alm=_summary(dfx, "Alm"),
+                      locais_manut=locais_manut, faltando=faltando)
+
+
+def query_key(query: str, accents: bool = False, fuzzy: bool = False) -> tuple:
+    """Chave normalizada da busca: 'Posto ' e 'posto' dão o mesmo resultado."""
+    return (query.strip().lower(), bool(accents), bool(fuzzy))
+
+
+class AggregateCache:
+    """
+    LRU de `Aggregates` por (versão da planilha, chave da busca), compartilhado
+    pelo processo. Os DataFrames guardados são somente leitura para quem usa.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE):
+        self.maxsize = maxsize
+        self._data: OrderedDict[tuple, Aggregates] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, version: str, key: tuple, dfx_factory) -> Aggregates:
+        k = (version, key)
+        with self._lock:
+            agg = self._data.get(k)
+            if agg is not None:
+                self._data.move_to_end(k)
+                self.hits += 1
+                metrics.count("agregados.acerto")
+                return agg
+        agg = compute_aggregates(dfx_factory())
+        metrics.count("agregados.falta")
+        with self._lock:
+            self.misses += 1
+            self._data[k] = agg
+            self._data.move_to_end(k)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return agg
+
+
+aggregate_cache = AggregateCache()
@@ -0,0 +1,586 @@
+# =========================================================
+# Alertas de locais fora do ar (debounce + escalonamento)
+# - regras avaliadas a cada versão nova da planilha (a origem é consultada
+#   a cada DASHBOARD_ALERT_POLL_SECONDS, mesmo sem ninguém com o painel
+#   aberto) e, entre versões, a cada DASHBOARD_ALERT_SECONDS (prazos
+#   "por 10m" vencem sem planilha nova)
+# - estado em matrizes regras x locais: uma comparação NumPy por regra
+#   sobre todos os locais, sem laço por local
+# - destinos plugáveis: webhook, arquivo JSONL, SMTP ou função Python
+#
+# Regras (DASHBOARD_ALERT_RULES ou DASHBOARD_ALERT_RULES_FILE), uma por linha:
+#   cameras_offline = Cam_OfflineBool por 10m escala 30m 2h
+#   alarmes_piorou  = Alm_Falta aumentou limpa 1h
+#   muitos_locais   = Manutencao locais > 50
+#   <nome> = <coluna> [<op> <valor> | aumentou | diminuiu]
+#            [por <tempo>] [limpa <tempo>] [escala <tempo> ...] [locais > N]
+# Destinos (DASHBOARD_ALERT_SINKS), `tipo[:nível mínimo] = destino`:
+#   webhook=https://...; arquivo=/var/log/alertas.jsonl; smtp:2=host:25/a@x.com,b@x.com
+# =========================================================
+from __future__ import annotations
+
+import json
+import operator
+import os
+import re
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable
+
+import numpy as np
+
+from dashboard import metrics
+from dashboard.fetch import DEFAULT_TTL
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+TICK_SECONDS = float(os.environ.get("DASHBOARD_ALERT_SECONDS", "60"))
+# Consulta à origem para os alertas; padrão: o TTL da busca (DASHBOARD_REFRESH_SECONDS)
+POLL_SECONDS = float(os.environ.get("DASHBOARD_ALERT_POLL_SECONDS", "") or DEFAULT_TTL or 30)
+MAIL_FROM = os.environ.get("DASHBOARD_ALERT_FROM", "dashboard@localhost")
+
+DEFAULT_RULES = """
+cameras_offline = Cam_OfflineBool por 10m escala 30m 2h
+alarmes_offline = Alm_OfflineBool por 10m escala 30m 2h
+alarmes_faltando = Alm_Falta aumentou limpa 1h
+"""
+
+# colunas do DataFrame normalizado + as derivadas abaixo (mesma regra das abas)
+RULE_COLUMNS = ("Cam_Total", "Cam_Online", "Cam_Falta", "Cam_OfflineBool",
+                "Alm_Total", "Alm_Online", "Alm_Falta", "Alm_OfflineBool",
+                "Cam_Manutencao", "Alm_Manutencao", "Manutencao")
+
+DISPAROU, ESCALOU, RESOLVIDO = "disparou", "escalou", "resolvido"
+
+_OPS = {">": operator.gt, ">=": operator.ge, "<": operator.lt, "<=": operator.le,
+        "==": operator.eq, "!=": operator.ne, "aumentou": operator.gt, "diminuiu": operator.lt}
+_EDGE = ("aumentou", "diminuiu")   # comparam com a versão anterior do mesmo local
+_NEVER = -1                        # instante vazio nas matrizes (s desde o início do motor)
+
+
+@dataclass(frozen=True)
+class Rule:
+    name: str
+    column: str
+    op: str = "!="                   # padrão: coluna diferente de zero (True nos *Bool)
+    value: float = 0.0
+    for_s: float = 0.0               # condição contínua por pelo menos isso para disparar
+    clear_s: float = 0.0             # ausente por isso para resolver (aumentou/diminuiu: intervalo entre avisos)
+    escalate: tuple[float, ...] = ()  # tempo desde o início da condição para os níveis 2, 3...
+    min_sites: int | None = None     # regra geral: dispara com mais de N locais na condição
+
+    @property
+    def edge(self) -> bool:
+        return self.op in _EDGE
+
+
+@dataclass(frozen=True)
+class Alert:
+    rule: str
+    site: str          # Local (ou Regiao / Local); vazio nas regras gerais
+    event: str         # disparou | escalou | resolvido
+    level: int         # nível atual (no resolvido, o último nível)
+    value: float       # valor da coluna no local (regra geral: nº de locais)
+    since: float       # epoch do início da condição
+    at: float          # epoch da avaliação
+    version: str       # versão da planilha avaliada
+
+    def to_dict(self) -> dict:
+        d = asdict(self)
+        if self.value != self.value:
+            d["value"] = None             # local que saiu da planilha
+        elif float(self.value).is_integer():
+            d["value"] = int(self.value)
+        return d
+
+
+# ------------------ configuração ------------------
+_DURATION = re.compile(r"^(\d+(?:[.,]\d+)?)(s|m|min|h|d)?$", re.IGNORECASE)
+_UNITS = {None: 1, "s": 1, "m": 60, "min": 60, "h": 3600, "d": 86400}
+_KEYWORDS = ("por", "limpa", "escala", "locais")
+
+
+def parse_duration(text: str) -> float:
+    """'90s', '10m', '2h', '1d' ou segundos."""
+    m = _DURATION.match(text.strip())
+    if not m:
+        raise ValueError(f"tempo inválido: {text!r}")
+    unit = m.group(2).lower() if m.group(2) else None
+    return float(m.group(1).replace(",", ".")) * _UNITS[unit]
+
+
+def parse_rule(line: str) -> Rule:
+    name, sep, expr = line.partition("=")
+    tokens = expr.split()
+    if not sep or not name.strip() or not tokens:
+        raise ValueError(f"regra inválida: {line!r}")
+    name = name.strip()
+    column, rest = tokens[0], tokens[1:]
+    if column not in RULE_COLUMNS:
+        raise ValueError(f"regra {name}: coluna desconhecida {column!r}")
+    kw = {}
+    if rest and rest[0] in _OPS:
+        op = rest.pop(0)
+        kw["op"] = op
+        if op not in _EDGE:
+            if not rest:
+                raise ValueError(f"regra {name}: falta o valor depois de {op}")
+            kw["value"] = float(rest.pop(0).replace(",", "."))
+    while rest:
+        key = rest.pop(0).lower()
+        args = []
+        while rest and rest[0].lower() not in _KEYWORDS:
+            args.append(rest.pop(0))
+        if key == "por" and len(args) == 1:
+            kw["for_s"] = parse_duration(args[0])
+        elif key == "limpa" and len(args) == 1:
+            kw["clear_s"] = parse_duration(args[0])
+        elif key == "escala" and args:
+            kw["escalate"] = tuple(sorted(parse_duration(a) for a in ",".join(args).split(",") if a))
+        elif key == "locais" and len(args) == 2 and args[0] == ">":
+            kw["min_sites"] = int(args[1])
+        else:
+            raise ValueError(f"regra {name}: trecho inválido {' '.join([key, *args])!r}")
+    rule = Rule(name, column, **kw)
+    if rule.edge and rule.min_sites is not None:
+        raise ValueError(f"regra {name}: aumentou/diminuiu não vale para regra geral")
+    return rule
+
+
+def parse_rules(text: str) -> list[Rule]:
+    """Uma regra por linha (ou separadas por ';'); linhas com # são ignoradas."""
+    out = []
+    for line in text.replace(";", "\n").splitlines():
+        line = line.strip()
+        if line and not line.startswith("#"):
+            out.append(parse_rule(line))
+    return out
+
+
+def configured_rules() -> list[Rule]:
+    text = os.environ.get("DASHBOARD_ALERT_RULES", "")
+    path = os.environ.get("DASHBOARD_ALERT_RULES_FILE", "")
+    if path:
+        try:
+            text = Path(path).read_text(encoding="utf-8")
+        except OSError:
+            pass
+    return parse_rules(text if text.strip() else DEFAULT_RULES)
+
+
+# ------------------ destinos ------------------
+class WebhookSink:
+    """POST JSON `{"alertas": [...]}` (um por avaliação com alertas)."""
+
+    def __init__(self, url: str, min_level: int = 1, timeout: float = 10, session=None):
+        self.url, self.min_level, self.timeout = url, min_level, timeout
+        self._session = session
+
+    def send(self, alerts: list[Alert]):
+        if self._session is None:
+            import requests
+            self._session = requests.Session()
+        r = self._session.post(self.url, json={"alertas": [a.to_dict() for a in alerts]}, timeout=self.timeout)
+        r.raise_for_status()
+
+
+class FileSink:
+    """Uma linha JSON por alerta, acrescentada ao arquivo."""
+
+    def __init__(self, path: str | Path, min_level: int = 1):
+        self.path, self.min_level = Path(path), min_level
+        self._lock = threading.Lock()
+
+    def send(self, alerts: list[Alert]):
+        lines = "".join(json.dumps(a.to_dict(), ensure_ascii=False) + "\n" for a in alerts)
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as f:
+                f.write(lines)
+
+
+class SmtpSink:
+    """Um e-mail por avaliação com alertas (servidor sem autenticação/relay interno)."""
+
+    def __init__(self, host: str, port: int, to: list[str], min_level: int = 1,
+                 sender: str = MAIL_FROM, timeout: float = 10):
+        self.host, self.port, self.to = host, port, to
+        self.min_level, self.sender, self.timeout = min_level, sender, timeout
+
+    def send(self, alerts: list[Alert]):
+        import smtplib
+        from email.message import EmailMessage
+
+        msg = EmailMessage()
+        msg["From"], msg["To"] = self.sender, ", ".join(self.to)
+        top = max(a.level for a in alerts)
+        msg["Subject"] = f"[Dashboard] {len(alerts)} alerta(s), nível {top}"
+        msg.set_content("\n".join(
+            f"{a.event.upper():<10} nível {a.level}  {a.rule}  {a.site or '(geral)'}  valor {a.to_dict()['value']}"
+            for a in alerts))
+        with smtplib.SMTP(self.host, self.port, timeout=self.timeout) as smtp:
+            smtp.send_message(msg)
+
+
+class CallbackSink:
+    """Chama `fn(alertas)` no processo (integrações e testes)."""
+
+    def __init__(self, fn: Callable[[list[Alert]], None], min_level: int = 1):
+        self.fn, self.min_level = fn, min_level
+
+    def send(self, alerts: list[Alert]):
+        self.fn(alerts)
+
+
+def parse_sinks(text: str) -> list:
+    """`tipo[:nível] = destino` por linha ou separados por ';' (webhook, arquivo, smtp)."""
+    out = []
+    for item in text.replace(";", "\n").splitlines():
+        item = item.strip()
+        if not item or item.startswith("#"):
+            continue
+        kind, sep, target = item.partition("=")
+        kind, _, level = kind.strip().lower().partition(":")
+        level = int(level) if level else 1
+        target = target.strip()
+        if not sep or not target:
+            raise ValueError(f"destino inválido: {item!r}")
+        if kind == "webhook":
+            out.append(WebhookSink(target, level))
+        elif kind == "arquivo":
+            out.append(FileSink(target, level))
+        elif kind == "smtp":
+            server, _, to = target.partition("/")
+            host, _, port = server.partition(":")
+            out.append(SmtpSink(host, int(port or 25), [t.strip() for t in to.split(",") if t.strip()], level))
+        else:
+            raise ValueError(f"destino desconhecido: {kind!r}")
+    return out
+
+
+# ------------------ avaliação vetorizada ------------------
+def _columns(df: pd.DataFrame, names) -> dict[str, np.ndarray]:
+    """Colunas usadas pelas regras como float64 (bool -> 0/1), incluindo as derivadas."""
+    def manut(prefix):
+        return df[f"{prefix}_OfflineBool"].to_numpy(dtype=bool) | (df[f"{prefix}_Falta"].to_numpy() > 0)
+
+    out = {}
+    for name in names:
+        if name == "Manutencao":
+            v = manut("Cam") | manut("Alm")
+        elif name.endswith("_Manutencao"):
+            v = manut(name.split("_")[0])
+        else:
+            v = df[name].to_numpy()
+        out[name] = v.astype(np.float64)
+    return out
+
+
+def _site_keys(df: pd.DataFrame) -> np.ndarray:
+    """Chave única por linha: locais repetidos ganham ' #2', ' #3'..."""
+    import pandas as pd
+
+    from dashboard.sheet import site_key
+
+    key = site_key(df)
+    keys = key.to_numpy(dtype=object)
+    if key.duplicated().any():
+        n = key.groupby(keys).cumcount().to_numpy()
+        keys = np.where(n > 0, keys + " #" + pd.Series(n + 1).astype(str).to_numpy(dtype=object), keys)
+    return keys
+
+
+def _realign(m: np.ndarray, idx: np.ndarray, fill) -> np.ndarray:
+    """Colunas de `m` na ordem nova (`idx` = posição antiga, -1 = local novo)."""
+    out = np.full((m.shape[0], len(idx)), fill, dtype=m.dtype)
+    ok = idx >= 0
+    out[:, ok] = m[:, idx[ok]]
+    return out
+
+
+class _Timers:
+    """
+    Estado das regras com duração: linhas = regras, colunas = locais.
+    Instantes em s (int32) desde o início do motor; _NEVER = vazio.
+    """
+
+    def __init__(self, rules: list[Rule], width: int = 0):
+        k = max((len(r.escalate) for r in rules), default=0) + 1
+        self.limits = np.full((len(rules), k), np.inf)   # nível n a partir de limits[:, n-1]
+        for i, r in enumerate(rules):
+            self.limits[i, 0] = r.for_s
+            self.limits[i, 1:1 + len(r.escalate)] = [max(e, r.for_s) for e in r.escalate]
+        self.clear = np.array([r.clear_s for r in rules], dtype=np.float64)[:, None]
+        self.since = np.full((len(rules), width), _NEVER, dtype=np.int32)
+        self.clear_at = np.full((len(rules), width), _NEVER, dtype=np.int32)
+        self.level = np.zeros((len(rules), width), dtype=np.int8)
+
+    def realign(self, idx: np.ndarray):
+        self.since = _realign(self.since, idx, _NEVER)
+        self.clear_at = _realign(self.clear_at, idx, _NEVER)
+        self.level = _realign(self.level, idx, 0)
+
+    def step(self, cond: np.ndarray, now: int):
+        """Avança para `now` com a condição atual; devolve (disparou, escalou, resolvido, nível anterior)."""
+        level, fired = self.level, self.level > 0
+        since = np.where(cond & (self.since == _NEVER), now, self.since)
+        since[~cond & ~fired] = _NEVER   # pendente que perdeu a condição recomeça (debounce)
+        clear_at = np.where(cond, _NEVER, self.clear_at)
+        clear_at[~cond & fired & (clear_at == _NEVER)] = now
+        resolve = fired & ~cond & (now - clear_at >= self.clear)
+
+        elapsed = np.where(since == _NEVER, -1, now - since)
+        reached = np.zeros(level.shape, dtype=np.int8)
+        for k in range(self.limits.shape[1]):
+            reached += elapsed >= self.limits[:, k:k + 1]
+        new = np.where(cond, np.maximum(level, reached), level).astype(np.int8)
+        new[resolve] = 0
+        since[resolve] = _NEVER
+        clear_at[resolve] = _NEVER
+
+        self.since, self.clear_at, self.level = since.astype(np.int32), clear_at.astype(np.int32), new
+        return (level == 0) & (new > 0), (level > 0) & (new > level), resolve, level
+
+
+class AlertEngine:
+    """
+    Avalia as regras sobre o DataFrame normalizado de cada versão (`update`)
+    e, entre versões, só os prazos (`tick`). Os alertas de cada avaliação
+    vão juntos para os destinos, numa thread à parte.
+    """
+
+    def __init__(self, rules: list[Rule], sinks: list, clock=time.time, interval: float = TICK_SECONDS):
+        self.rules = list(rules)
+        self.sinks = list(sinks)
+        self.interval = interval
+        self._clock = clock
+        self._t0 = clock()
+        self._site = [r for r in self.rules if not r.edge and r.min_sites is None]
+        self._overall = [r for r in self.rules if r.min_sites is not None]
+        self._edge = [r for r in self.rules if r.edge]
+        self._site_t = _Timers(self._site)
+        self._overall_t = _Timers(self._overall, width=1)
+        self._edge_last = np.full((len(self._edge), 0), _NEVER, dtype=np.int32)   # último aviso
+        self._edge_cool = np.array([r.clear_s for r in self._edge], dtype=np.float64)[:, None]
+        self._min_sites = np.array([r.min_sites or 0 for r in self._overall])[:, None]
+        self._keys = np.empty(0, dtype=object)
+        self._values: dict[str, np.ndarray] = {}        # colunas da última versão avaliada
+        self._site_cond = np.zeros((len(self._site), 0), dtype=bool)
+        self._overall_cond = np.zeros((len(self._overall), 1), dtype=bool)
+        self._overall_value = np.zeros(len(self._overall))
+        self._version: str | None = None
+        self._queued: str | None = None                 # última versão enviada para `observe`
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="alertas")  # mantém a ordem
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    # ------------------ avaliação ------------------
+    def _now(self) -> tuple[float, int]:
+        t = self._clock()
+        return t, int(t - self._t0)
+
+    def _cond(self, rule: Rule, values: dict) -> np.ndarray:
+        return _OPS[rule.op](values[rule.column], rule.value)
+
+    def update(self, version: str, df: pd.DataFrame) -> list[Alert]:
+        """Versão nova da planilha: reavalia tudo (mesma versão de novo é ignorada)."""
+        with self._lock:
+            if version == self._version:
+                return []
+            with metrics.span("alertas.avaliacao"):
+                alerts = self._update(version, df)
+        self._dispatch(alerts)
+        return alerts
+
+    def _update(self, version: str, df: pd.DataFrame) -> list[Alert]:
+        import pandas as pd
+
+        at, now = self._now()
+        keys = _site_keys(df)
+        idx = pd.Index(self._keys).get_indexer(keys) if len(self._keys) else np.full(len(keys), -1)
+        alerts = self._gone(idx, at, version)
+        prev = {r.column: _realign(self._values[r.column][None, :], idx, np.nan)[0]
+                for r in self._edge} if self._values else {}
+        self._site_t.realign(idx)
+        self._edge_last = _realign(self._edge_last, idx, _NEVER)
+        self._keys, self._version = keys, version
+
+        values = _columns(df, {r.column for r in self.rules})
+        self._site_cond = np.array([self._cond(r, values) for r in self._site], dtype=bool).reshape(
+            len(self._site), len(keys))
+        self._overall_value = np.array([self._cond(r, values).sum() for r in self._overall], dtype=np.float64)
+        self._overall_cond = (self._overall_value[:, None] > self._min_sites)
+        self._values = values
+        alerts += self._edges(prev, at, now)
+        return alerts + self._step(at, now)
+
+    def observe(self, version: str, df: pd.DataFrame):
+        """
+        Versão vista por quem carrega (load_data, poller): avalia em segundo
+        plano, na mesma fila dos envios, sem segurar o rerun.
+        """
+        if version and version != self._queued:
+            self._queued = version
+            self._pool.submit(self._observe, version, df)
+
+    def _observe(self, version: str, df: pd.DataFrame):
+        try:
+            self.update(version, df)
+        except Exception:
+            metrics.count("alertas.falha")
+
+    def tick(self) -> list[Alert]:
+        """Só o tempo passou: dispara/escala/resolve pelos prazos, sem planilha nova."""
+        with self._lock:
+            if self._version is None:
+                return []
+            alerts = self._step(*self._now())
+        self._dispatch(alerts)
+        return alerts
+
+    def _step(self, at: float, now: int) -> list[Alert]:
+        out = []
+        for timers, rules, cond, value_of, key_of in (
+            (self._site_t, self._site, self._site_cond,
+             lambda i, j: self._values[self._site[i].column][j], lambda j: self._keys[j]),
+            (self._overall_t, self._overall, self._overall_cond,
+             lambda i, j: self._overall_value[i], lambda j: ""),
+        ):
+            if not rules:
+                continue
+            old_since = timers.since   # resolvidos: início antes de zerar
+            fire, esc, resolve, before = timers.step(cond, now)
+            for mask, event in ((fire, DISPAROU), (esc, ESCALOU), (resolve, RESOLVIDO)):
+                for i, j in zip(*np.nonzero(mask)):
+                    done = event == RESOLVIDO
+                    level = int(before[i, j] if done else timers.level[i, j])
+                    start = old_since[i, j] if done else timers.since[i, j]
+                    out.append(Alert(rules[i].name, key_of(j), event, level, float(value_of(i, j)),
+                                     self._t0 + float(start), at, self._version or ""))
+        return out
+
+    def _edges(self, prev: dict, at: float, now: int) -> list[Alert]:
+        """aumentou/diminuiu: compara com a versão anterior; `limpa` é o intervalo mínimo entre avisos."""
+        values = self._values
+        if not self._edge or not prev:
+            return []
+        cond = np.array([_OPS[r.op](values[r.column], prev[r.column]) for r in self._edge], dtype=bool)
+        quiet = (self._edge_last == _NEVER) | (now - self._edge_last >= self._edge_cool)
+        fire = cond & quiet
+        self._edge_last = np.where(fire, now, self._edge_last).astype(np.int32)
+        return [Alert(self._edge[i].name, self._keys[j], DISPAROU, 1, float(values[self._edge[i].column][j]),
+                      at, at, self._version or "")
+                for i, j in zip(*np.nonzero(fire))]
+
+    def _gone(self, idx: np.ndarray, at: float, version: str) -> list[Alert]:
+        """Locais que saíram da planilha com alerta ativo: resolvidos."""
+        kept = np.zeros(len(self._keys), dtype=bool)
+        kept[idx[idx >= 0]] = True
+        level = self._site_t.level
+        out = []
+        for i, j in zip(*np.nonzero((level > 0) & ~kept)):
+            out.append(Alert(self._site[i].name, self._keys[j], RESOLVIDO, int(level[i, j]), float("nan"),
+                             self._t0 + float(self._site_t.since[i, j]), at, version))
+        return out
+
+    # ------------------ consulta ------------------
+    def active(self) -> list[Alert]:
+        """Alertas disparados e ainda não resolvidos (painel/admin)."""
+        with self._lock:
+            at, _ = self._now()
+            out = []
+            for timers, rules, key_of, value_of in (
+                (self._site_t, self._site, lambda j: self._keys[j],
+                 lambda i, j: self._values[self._site[i].column][j]),
+                (self._overall_t, self._overall, lambda j: "", lambda i, j: self._overall_value[i]),
+            ):
+                for i, j in zip(*np.nonzero(timers.level > 0)):
+                    out.append(Alert(rules[i].name, key_of(j), DISPAROU, int(timers.level[i, j]),
+                                     float(value_of(i, j)), self._t0 + float(timers.since[i, j]), at,
+                                     self._version or ""))
+            return out
+
+    # ------------------ envio ------------------
+    def _dispatch(self, alerts: list[Alert]):
+        for event, n in Counter(a.event for a in alerts).items():
+            metrics.count(f"alertas.{event}", n)
+        for sink in self.sinks:
+            batch = [a for a in alerts if a.level >= sink.min_level]
+            if batch:
+                self._pool.submit(self._send, sink, batch)
+
+    @staticmethod
+    def _send(sink, batch: list[Alert]):
+        try:
+            sink.send(batch)
+        except Exception:
+            metrics.count("alertas.falha_envio")  # destino fora não derruba a avaliação
+
+    def flush(self, timeout: float | None = None):
+        """Espera os envios pendentes (testes/encerramento)."""
+        self._pool.submit(lambda: None).result(timeout)
+
+    # ------------------ thread ------------------
+    def start(self) -> "AlertEngine":
+        if self._thread is None and self.interval > 0:
+            self._thread = threading.Thread(target=self._run, name="dashboard-alertas", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.tick()
+            except Exception:
+                metrics.count("alertas.falha")
+
+
+# ------------------ instância padrão do processo ------------------
+_DEFAULT: AlertEngine | None = None
+_DEFAULT_LOCK = threading.Lock()
+
+
+def default_engine() -> AlertEngine | None:
+    """Motor com as regras/destinos do ambiente (já rodando); None sem DASHBOARD_ALERT_SINKS."""
+    global _DEFAULT
+    sinks_text = os.environ.get("DASHBOARD_ALERT_SINKS", "")
+    if not sinks_text.strip():
+        return None
+    with _DEFAULT_LOCK:
+        if _DEFAULT is None:
+            _DEFAULT = AlertEngine(configured_rules(), parse_sinks(sinks_text)).start()
+        return _DEFAULT
+
+
+_WATCHED: set = set()
+
+
+def watch(source, interval: float | None = None) -> AlertEngine | None:
+    """
+    Motor padrão inscrito no poller da origem, consultada a cada `interval`
+    (padrão POLL_SECONDS) independentemente do modo ao vivo do painel:
+    versões novas são avaliadas mesmo sem ninguém com o painel aberto.
+    Uma vez por origem.
+    """
+    from dashboard.live import poller_for
+
+    engine = default_engine()
+    if engine is not None and source:
+        with _DEFAULT_LOCK:
+            if source in _WATCHED:
+                return engine
+            _WATCHED.add(source)
+        poller = poller_for(source, POLL_SECONDS if interval is None else interval)
+        poller.subscribe(engine.observe)
+        if poller.version is not None:  # versão carregada antes da inscrição
+            engine.observe(*poller.current())
+    return engine
@@ -0,0 +1,461 @@
+# =========================================================
+# API HTTP somente leitura (JSON) com os mesmos dados do painel
+# - app ASGI puro: roda no uvicorn (dependência própria da API, listada
+#   no requirements.txt) ou num cliente em processo (testes/scripts),
+#   sem framework extra
+# - mesma busca, snapshot e agregados do painel (cache compartilhado
+#   quando roda no mesmo processo)
+# - corpo de cada resposta montado uma vez por (versão, rota, busca);
+#   ETag pela versão da planilha -> 304 sem tocar nos dados; gzip
+#   comprimido uma vez e guardado junto
+#
+#   python -m dashboard.api [FONTE] --porta 8502
+#   GET /api/status
+#   GET /api/locais?q=posto&sem_acento=1&aproximada=0&limite=100&inicio=0
+#   GET /api/cameras?q=...   GET /api/alarmes?q=...   GET /api/geral?q=...
+#   GET /api/eventos  (SSE: um evento `versao` a cada planilha nova)
+#   GET /metrics      (tempos e contadores no formato do Prometheus)
+# =========================================================
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from urllib.parse import parse_qsl, urlsplit
+
+from dashboard import metrics
+from dashboard.config import DRIVE_URL
+from dashboard.data import resolve_source
+from dashboard.fetch import fetcher_for
+from dashboard.live import current_version
+from dashboard.sources import configured_origin, ready_version
+
+API_HOST = os.environ.get("DASHBOARD_API_HOST", "127.0.0.1")  # 0.0.0.0 expõe na rede
+API_PORT = int(os.environ.get("DASHBOARD_API_PORT", "0") or 0)  # 0 = API desligada no app
+CACHE_SIZE = 256       # respostas prontas guardadas (todas da versão atual)
+GZIP_MIN = 1024        # corpos menores vão sem compressão
+GZIP_LEVEL = 6
+SSE_PING = 25          # s entre comentários de keep-alive no /api/eventos
+
+_TRUE = {"1", "true", "sim", "s", "yes", "on"}
+_JSON = b"application/json; charset=utf-8"
+_PROMETHEUS = b"text/plain; version=0.0.4; charset=utf-8"
+
+# colunas expostas por lista (nomes iguais aos do DataFrame normalizado)
+_CAM_COLS = ["Local", "Apelido", "Cam_Total", "Cam_Online", "Cam_Falta", "Cam_Status", "Cam_OfflineBool"]
+_ALM_COLS = ["Local", "Apelido", "Alm_Total", "Alm_Online", "Alm_Falta", "Alm_Status", "Alm_OfflineBool"]
+_GERAL_COLS = ["Local", "Apelido", "Cam_Falta", "Alm_Falta"]
+
+
+class ApiError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass(frozen=True)
+class _Body:
+    etag: str
+    raw: bytes
+    gz: bytes | None
+
+
+def _encode(obj: dict) -> bytes:
+    """JSON do envelope; DataFrames viram listas de registros (to_json, vetorizado)."""
+    import pandas as pd
+
+    parts = []
+    for k, v in obj.items():
+        if isinstance(v, pd.DataFrame):
+            val = v.to_json(orient="records", force_ascii=False)
+        else:
+            val = json.dumps(v, ensure_ascii=False, separators=(",", ":"))
+        parts.append(f"{json.dumps(k)}:{val}")
+    return ("{" + ",".join(parts) + "}").encode("utf-8")
+
+
+def _cols(df, cols):
+    return df.loc[:, [c for c in cols if c in df.columns]]
+
+
+class Api:
+    """Aplicação ASGI. Uma instância por origem da planilha."""
+
+    def __init__(self, source=DRIVE_URL, cache_size: int = CACHE_SIZE):
+        # arquivo/URL, ou a tupla de `Source` de várias planilhas (dashboard.sources)
+        self.source = source if isinstance(source, tuple) else resolve_source(source)
+        self.cache_size = cache_size
+        self._data: tuple | None = None          # (versão, df, índice de busca | None)
+        self._bodies: OrderedDict[tuple, _Body] = OrderedDict()
+        self._lock = threading.RLock()  # troca de versão aquece respostas com o lock tomado
+        self.routes = {
+            "/api/status": self._status,
+            "/api/locais": self._locais,
+            "/api/cameras": self._cameras,
+            "/api/alarmes": self._alarmes,
+            "/api/geral": self._geral,
+        }
+
+    # ------------------ dados ------------------
+    def _fetchers(self) -> list:
+        locations = [s.location for s in self.source] if isinstance(self.source, tuple) else [self.source]
+        return [fetcher_for(loc) for loc in locations]
+
+    def _ready(self) -> tuple | None:
+        """(versão, df, índice) só se já carregados na versão atual da origem, sem I/O."""
+        data = self._data
+        if data is None:
+            return None
+        if isinstance(self.source, tuple):
+            version = ready_version(self.source)
+        else:
+            f = self._fetchers()[0]
+            version = f.result.digest if f.fresh else None
+        return data if data[0] == version else None
+
+    def _current(self) -> tuple:
+        """(versão, df, índice) em uso; troca de versão limpa as respostas prontas."""
+        digest, load = current_version(self.source)
+        data = self._data
+        if data is not None and data[0] == digest:
+            return data
+        with self._lock:
+            if self._data is None or self._data[0] != digest:
+                self._data = (digest, load(), None)
+                self._bodies.clear()
+                self._warm()
+            return self._data
+
+    def _warm(self):
+        # rotas sem busca (paineis de parede) já ficam prontas na troca de versão
+        version, df, _ = self._data
+        for path in ("/api/cameras", "/api/alarmes", "/api/geral"):
+            key = (path, ("", False, False), None, 0)
+            self._store(version, key, self.routes[path](version, df, {}))
+
+    @staticmethod
+    def _query(params: dict) -> tuple:
+        """(busca, ignorar acentos, aproximada) a partir da query string."""
+        return (params.get("q", ""), params.get("sem_acento", "").lower() in _TRUE,
+                params.get("aproximada", "").lower() in _TRUE)
+
+    def _filtered(self, version: str, df, params: dict):
+        from dashboard.aggregates import query_key
+
+        q, accents, fuzzy = self._query(params)
+        if not q.strip():
+            return df, query_key("", accents, fuzzy)
+        data = self._data
+        index = data[2] if data is not None and data[0] == version else None
+        if index is None:
+            from dashboard.search import SearchIndex
+            index = SearchIndex(df)
+            with self._lock:
+                if self._data is not None and self._data[0] == version:
+                    self._data = (version, df, index)
+        return index.filter(df, q, accents=accents, fuzzy=fuzzy), query_key(q, accents, fuzzy)
+
+    def _aggregates(self, version: str, df, params: dict):
+        from dashboard.aggregates import aggregate_cache, query_key
+
+        key = query_key(*self._query(params))
+        return aggregate_cache.get(version, key, lambda: self._filtered(version, df, params)[0]), key
+
+    # ------------------ rotas ------------------
+    def _status(self, version, df, params) -> dict:
+        results = [f.result for f in self._fetchers()]
+        ok = [r for r in results if r is not None]
+        fetched_at = min((r.fetched_at for r in ok), default=None)  # a origem mais antiga
+        return {
+            "versao": version,
+            "locais": int(len(df)),
+            "atualizado_em": datetime.fromtimestamp(fetched_at, timezone.utc).isoformat() if fetched_at else None,
+            "desatualizado": len(ok) < len(results) or any(r.stale for r in ok),
+        }
+
+    def _locais(self, version, df, params) -> dict:
+        dfx, key = self._filtered(version, df, params)
+        try:
+            inicio = max(int(params.get("inicio", 0)), 0)
+            limite = int(params["limite"]) if params.get("limite") else None
+        except ValueError:
+            raise ApiError(400, "inicio/limite devem ser inteiros")
+        page = dfx.iloc[inicio:None if limite is None else inicio + max(limite, 0)]
+        return {"versao": version, "busca": key[0], "total": int(len(dfx)), "inicio": inicio,
+                "locais": page}
+
+    @staticmethod
+    def _summary(s, cols) -> dict:
+        return {"total": s.total, "online": s.online, "offline": s.offline,
+                "locais_manutencao": s.locais_manut, "manutencao": _cols(s.manutencao, cols)}
+
+    def _cameras(self, version, df, params) -> dict:
+        agg, key = self._aggregates(version, df, params)
+        return {"versao": version, "busca": key[0], **self._summary(agg.cam, _CAM_COLS)}
+
+    def _alarmes(self, version, df, params) -> dict:
+        agg, key = self._aggregates(version, df, params)
+        return {"versao": version, "busca": key[0], **self._summary(agg.alm, _ALM_COLS)}
+
+    def _geral(self, version, df, params) -> dict:
+        agg, key = self._aggregates(version, df, params)
+        return {
+            "versao": version, "busca": key[0],
+            "cameras": {"total": agg.cam.total, "online": agg.cam.online, "offline": agg.cam_off},
+            "alarmes": {"total": agg.alm.total, "online": agg.alm.online, "offline": agg.alm_off},
+            "locais_manutencao": agg.locais_manut,
+            "faltando": _cols(agg.faltando, _GERAL_COLS),
+        }
+
+    # ------------------ respostas ------------------
+    @staticmethod
+    def _key(path: str, params: dict) -> tuple:
+        from dashboard.aggregates import query_key
+
+        q = query_key(*Api._query(params))
+        if path == "/api/locais":
+            return path, q, params.get("limite") or None, params.get("inicio") or 0
+        return path, q, None, 0
+
+    @staticmethod
+    def _etag(version: str, key: tuple) -> str:
+        return '"' + hashlib.sha1(f"{version}|{key!r}".encode()).hexdigest()[:20] + '"'
+
+    def _store(self, version: str, key: tuple, obj: dict) -> _Body:
+        raw = _encode(obj)
+        body = _Body(self._etag(version, key), raw,
+                     gzip.compress(raw, GZIP_LEVEL, mtime=0) if len(raw) >= GZIP_MIN else None)
+        with self._lock:
+            if self._data is not None and self._data[0] == version:
+                self._bodies[(version, key)] = body
+                self._bodies.move_to_end((version, key))
+                while len(self._bodies) > self.cache_size:
+                    self._bodies.popitem(last=False)
+        return body
+
+    def handle(self, path: str, query: str, headers: dict, block: bool = True):
+        """
+        (status, cabeçalhos, corpo). Com `block=False` devolve None se a
+        resposta exigir I/O ou cálculo (quem chama repete numa thread).
+        """
+        if path.rstrip("/") == "/metrics":
+            return 200, [(b"content-type", _PROMETHEUS), (b"cache-control", b"no-store")], metrics.prometheus().encode()
+        route = self.routes.get(path.rstrip("/") or "/")
+        if route is None:
+            return self._error(404, "rota inexistente")
+        params = dict(parse_qsl(query))
+        if not block:
+            # no loop de eventos: nada de busca, leitura nem aquecimento
+            data = self._ready()
+            if data is None:
+                return None
+            version, df, _ = data
+        else:
+            try:
+                version, df, _ = self._current()
+            except Exception as e:
+                return self._error(503, f"planilha indisponível: {e}")
+
+        if route == self._status:
+            return self._reply(200, _encode(self._status(version, df, params)), headers,
+                               extra=[(b"cache-control", b"no-store")])
+
+        key = self._key(path.rstrip("/"), params)
+        etag = self._etag(version, key)
+        cache = [(b"etag", etag.encode()), (b"cache-control", b"no-cache"), (b"vary", b"accept-encoding")]
+        if etag in (t.strip() for t in headers.get("if-none-match", "").split(",")):
+            metrics.count("api.304")
+            return 304, cache, b""
+
+        body = self._bodies.get((version, key))
+        if body is None:
+            if not block:
+                return None
+            try:
+                with metrics.span(f"api.{path.strip('/').rsplit('/', 1)[-1]}"):
+                    body = self._store(version, key, route(version, df, params))
+            except ApiError as e:
+                return self._error(e.status, str(e))
+            metrics.count("api.montada")
+        else:
+            metrics.count("api.pronta")
+        if body.gz is not None and "gzip" in headers.get("accept-encoding", ""):
+            return 200, cache + [(b"content-type", _JSON), (b"content-encoding", b"gzip")], body.gz
+        return 200, cache + [(b"content-type", _JSON)], body.raw
+
+    @staticmethod
+    def _reply(status: int, raw: bytes, headers: dict, extra=()):
+        if len(raw) >= GZIP_MIN and "gzip" in headers.get("accept-encoding", ""):
+            return status, [*extra, (b"content-type", _JSON), (b"content-encoding", b"gzip")], gzip.compress(raw, GZIP_LEVEL)
+        return status, [*extra, (b"content-type", _JSON)], raw
+
+    @staticmethod
+    def _error(status: int, message: str):
+        return status, [(b"content-type", _JSON), (b"cache-control", b"no-store")], _encode({"erro": message})
+
+    # ------------------ ASGI ------------------
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            while True:
+                msg = await receive()
+                if msg["type"] == "lifespan.startup":
+                    await send({"type": "lifespan.startup.complete"})
+                elif msg["type"] == "lifespan.shutdown":
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+        if scope["type"] != "http":
+            return
+
+        method = scope["method"]
+        if method == "GET" and scope["path"].rstrip("/") == "/api/eventos":
+            return await self._events(receive, send)
+        if method not in ("GET", "HEAD"):
+            status, hdrs, body = self._error(405, "somente GET")
+            hdrs.append((b"allow", b"GET, HEAD"))
+        else:
+            headers = {k.decode("latin-1").lower(): v.decode("latin-1") for k, v in scope["headers"]}
+            args = (scope["path"], scope["query_string"].decode("latin-1"), headers)
+            # caminho quente (resposta pronta) direto no loop; o resto numa thread
+            out = self.handle(*args, block=False)
+            if out is None:
+                out = await asyncio.to_thread(self.handle, *args)
+            status, hdrs, body = out
+        await send({"type": "http.response.start", "status": status,
+                    "headers": [*hdrs, (b"content-length", str(len(body)).encode())]})
+        await send({"type": "http.response.body", "body": b"" if method == "HEAD" else body})
+
+
+    async def _events(self, receive, send):
+        """
+        Server-sent events: avisa cada versão nova da planilha (o cliente
+        então refaz o GET com If-None-Match). Conexões ociosas só custam o
+        keep-alive; a origem é consultada pelo poller, uma vez por processo
+        (a cada DASHBOARD_POLL_SECONDS, com ou sem o modo ao vivo do painel).
+        """
+        from dashboard.live import poller_for
+
+        poller = poller_for(self.source)
+        loop = asyncio.get_running_loop()
+        changed = asyncio.Event()
+        cancel = poller.subscribe(lambda _v, _df: loop.call_soon_threadsafe(changed.set))
+
+        async def disconnected():
+            while (await receive())["type"] != "http.disconnect":
+                pass
+
+        gone = asyncio.ensure_future(disconnected())
+
+        sent = [None]
+
+        async def event(version):
+            if version == sent[0]:
+                return
+            sent[0] = version
+            data = json.dumps({"versao": version, "geracao": poller.generation})
+            await send({"type": "http.response.body", "body": f"event: versao\ndata: {data}\n\n".encode(),
+                        "more_body": True})
+
+        try:
+            await send({"type": "http.response.start", "status": 200, "headers": [
+                (b"content-type", b"text/event-stream; charset=utf-8"), (b"cache-control", b"no-store")]})
+            await event((await asyncio.to_thread(poller.current))[0])
+            while not gone.done():
+                waiter = asyncio.ensure_future(changed.wait())
+                done, _ = await asyncio.wait({waiter, gone}, timeout=SSE_PING,
+                                             return_when=asyncio.FIRST_COMPLETED)
+                if waiter in done:
+                    changed.clear()
+                    await event(poller.version)
+                else:
+                    waiter.cancel()
+                    if not gone.done():
+                        await send({"type": "http.response.body", "body": b": ping\n\n", "more_body": True})
+        except OSError:
+            pass  # cliente caiu no meio do envio
+        finally:
+            cancel()
+            gone.cancel()
+
+
+# ------------------ cliente em processo (testes, scripts) ------------------
+@dataclass
+class ApiResponse:
+    status: int
+    headers: dict
+    body: bytes
+
+    def json(self):
+        raw = gzip.decompress(self.body) if self.headers.get("content-encoding") == "gzip" else self.body
+        return json.loads(raw)
+
+
+class LocalClient:
+    """Chama a aplicação ASGI direto, sem socket: `LocalClient(Api(fonte)).get('/api/geral')`."""
+
+    def __init__(self, app: Api):
+        self.app = app
+        self._loop = asyncio.new_event_loop()
+
+    def close(self):
+        self._loop.close()
+
+    def request(self, method: str, url: str, headers: dict | None = None) -> ApiResponse:
+        parts = urlsplit(url)
+        scope = {
+            "type": "http", "method": method, "path": parts.path, "query_string": parts.query.encode(),
+            "headers": [(k.lower().encode("latin-1"), v.encode("latin-1")) for k, v in (headers or {}).items()],
+        }
+        sent = []
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(msg):
+            sent.append(msg)
+
+        self._loop.run_until_complete(self.app(scope, receive, send))
+        start = sent[0]
+        return ApiResponse(start["status"],
+                           {k.decode("latin-1"): v.decode("latin-1") for k, v in start["headers"]},
+                           b"".join(m.get("body", b"") for m in sent[1:]))
+
+    def get(self, url: str, headers: dict | None = None) -> ApiResponse:
+        return self.request("GET", url, headers)
+
+
+# ------------------ servidor ------------------
+def start_in_thread(source=DRIVE_URL, port: int = API_PORT, host: str = API_HOST):
+    """Sobe o uvicorn numa thread daemon (junto do painel); devolve o `uvicorn.Server`."""
+    import uvicorn
+
+    server = uvicorn.Server(uvicorn.Config(Api(source), host=host, port=port, log_level="warning",
+                                           access_log=False, lifespan="off"))
+    threading.Thread(target=server.run, name="dashboard-api", daemon=True).start()
+    return server
+
+
+def main(argv=None):
+    import uvicorn
+
+    from dashboard.alerts import watch
+
+    p = argparse.ArgumentParser(prog="python -m dashboard.api",
+                                description="API JSON somente leitura com os dados do painel.")
+    p.add_argument("fonte", nargs="?", help="planilha .xlsx (arquivo ou URL); padrão: DASHBOARD_SOURCES ou o Drive")
+    p.add_argument("--host", default=API_HOST)
+    p.add_argument("--porta", type=int, default=API_PORT or 8502)
+    args = p.parse_args(argv)
+    app = Api(args.fonte or configured_origin(DRIVE_URL))
+    watch(app.source)  # alertas (DASHBOARD_ALERT_SINKS) também sem o painel
+    uvicorn.run(app, host=args.host, port=args.porta, log_level="warning", access_log=False)
+
+
+if __name__ == "__main__":
+    main()
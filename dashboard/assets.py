@@ -0,0 +1,163 @@
+# =========================================================
+# Logo e ícones: cache por processo
+# - lidos do disco e decodificados uma única vez (PIL), com variantes já
+#   reduzidas para o cabeçalho e para o relatório PDF
+# - nenhuma chamada de rede no caminho da requisição: se a logo não estiver
+#   no disco, o download do GitHub roda numa thread e fica salvo em
+#   .cache/assets para os próximos reinícios
+# =========================================================
+from __future__ import annotations
+
+import os
+import threading
+from dataclasses import dataclass
+from io import BytesIO
+from pathlib import Path
+
+from dashboard.config import (ICON_ALARME, ICON_CAMERA, ICON_ENGRENAGEM, ICON_RELATORIO,
+                              LOGO_FILE_CANDIDATES, LOGO_URL_RAW, ROOT_PATH)
+
+LOGO_URL = os.environ.get("DASHBOARD_LOGO_URL", LOGO_URL_RAW)  # "" = nunca baixar
+LOGO_TIMEOUT = 6
+CACHE_DIR = Path(os.environ.get("DASHBOARD_CACHE_DIR", ROOT_PATH / ".cache")) / "assets"
+
+HEADER_MAX = 256        # px: coluna da logo no cabeçalho (~2x para telas retina)
+PDF_SIZE = (240, 168)   # px: 2x a caixa de 120x84 pt do relatório
+
+ICONS = {
+    "camera": ICON_CAMERA,
+    "alarme": ICON_ALARME,
+    "engrenagem": ICON_ENGRENAGEM,
+    "relatorio": ICON_RELATORIO,
+}
+
+
+@dataclass(frozen=True)
+class Asset:
+    name: str
+    path: str | None
+    raw: bytes               # arquivo original
+    size: tuple[int, int]
+    header: bytes            # PNG reduzido (cabeçalho / st.image)
+    pdf: bytes               # PNG no tamanho em que o relatório desenha
+
+
+def _png(im) -> bytes:
+    buf = BytesIO()
+    im.save(buf, format="PNG", optimize=True)
+    return buf.getvalue()
+
+
+def decode(name: str, raw: bytes, path: str | None = None) -> Asset | None:
+    """Decodifica uma vez e gera as variantes; None se não for imagem válida."""
+    from PIL import Image
+
+    try:
+        im = Image.open(BytesIO(raw))
+        im.load()
+    except Exception:
+        return None
+    fmt, size = im.format, im.size
+    im = im.convert("RGBA")
+    if fmt in ("PNG", "JPEG") and max(size) <= HEADER_MAX:
+        header = raw  # já cabe: o original é menor que qualquer recodificação
+    else:
+        thumb = im.copy()
+        thumb.thumbnail((HEADER_MAX, HEADER_MAX), Image.LANCZOS)
+        header = _png(thumb)
+    pdf = im.resize(PDF_SIZE, Image.LANCZOS)  # mesma caixa fixa do relatório original
+    return Asset(name, path, raw, size, header, _png(pdf))
+
+
+def _read(path: str) -> bytes | None:
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+class AssetCache:
+    """Logo + ícones do processo. Criado uma vez (ver `assets()`), só leitura depois."""
+
+    def __init__(self, candidates=LOGO_FILE_CANDIDATES, icons=ICONS, url: str = LOGO_URL,
+                 cache_dir: str | Path = CACHE_DIR):
+        self.candidates = list(candidates)
+        self.url = url
+        self.cache_dir = Path(cache_dir)
+        self.logo: Asset | None = None
+        self.icons: dict[str, Asset | None] = {}
+        self._download: threading.Thread | None = None
+        self._load_logo()
+        for name, file in icons.items():
+            self.icons[name] = self._load_file(name, [file, str(ROOT_PATH / file)])
+
+    def _load_file(self, name: str, paths) -> Asset | None:
+        for p in paths:
+            if os.path.exists(p):
+                raw = _read(p)
+                asset = decode(name, raw, p) if raw else None
+                if asset is not None:
+                    return asset
+        return None
+
+    def _load_logo(self):
+        self.logo = self._load_file("logo", [*self.candidates, str(self.cache_dir / "logo.png")])
+
+    # ------------------ download em segundo plano ------------------
+    def fetch_missing(self) -> threading.Thread | None:
+        """Sem logo no disco: baixa numa thread (uma vez). Quem pede nunca espera."""
+        if self.logo is not None or not self.url or self._download is not None:
+            return self._download
+        self._download = threading.Thread(target=self._fetch_logo, name="dashboard-assets", daemon=True)
+        self._download.start()
+        return self._download
+
+    def _fetch_logo(self):
+        try:
+            import requests
+            r = requests.get(self.url, timeout=LOGO_TIMEOUT)
+            if not r.ok:
+                return
+            asset = decode("logo", r.content)
+            if asset is None:
+                return
+            try:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                tmp = self.cache_dir / f".logo.{os.getpid()}.tmp"
+                tmp.write_bytes(r.content)
+                os.replace(tmp, self.cache_dir / "logo.png")
+            except OSError:
+                pass
+            self.logo = asset
+        except Exception:
+            pass  # sem rede: o painel segue sem logo
+
+
+# ------------------ instância do processo ------------------
+_CACHE: AssetCache | None = None
+_CACHE_LOCK = threading.Lock()
+
+
+def assets() -> AssetCache:
+    """Cache do processo; a primeira chamada lê o disco, as demais só devolvem."""
+    global _CACHE
+    if _CACHE is None:
+        with _CACHE_LOCK:
+            if _CACHE is None:
+                cache = AssetCache()
+                cache.fetch_missing()
+                _CACHE = cache
+    return _CACHE
+
+
+def logo_path() -> str | None:
+    """Arquivo da logo em uso (None se não houver no disco)."""
+    logo = assets().logo
+    return logo.path if logo else None
+
+
+def load_logo_bytes() -> bytes | None:
+    """Bytes originais da logo, sem rede; None enquanto não houver."""
+    logo = assets().logo
+    return logo.raw if logo else None
@@ -0,0 +1,135 @@
+# =========================================================
+# Gráficos de resumo (3 barras: Online / Offline / Locais p/ manutenção)
+# - figura-modelo do plotly.express montada uma vez por conjunto de
+#   categorias; valores novos só trocam y/text numa cópia do dicionário
+#   (sem px.bar e sem validação do plotly a cada troca)
+# - LRU limitado por (título, valores): redesenho repetido devolve a
+#   mesma figura pronta
+# - DASHBOARD_CHART_BACKEND=html: barras em HTML/CSS, sem plotly
+# =========================================================
+from __future__ import annotations
+
+import copy
+import html
+import os
+import threading
+from collections import OrderedDict
+
+from dashboard import metrics
+from dashboard.config import CLR_GREEN, CLR_ORANGE, CLR_PANEL, CLR_RED, CLR_SUB
+
+BACKEND = os.environ.get("DASHBOARD_CHART_BACKEND", "plotly").lower()  # "plotly" | "html"
+CACHE_SIZE = 32
+HEIGHT = 360
+
+COLORS = {
+    "Online": CLR_GREEN,
+    "Offline": CLR_RED,
+    "Locais p/ manutenção": CLR_ORANGE,
+}
+
+
+def _build(title: str, items: tuple):
+    """Figura completa pelo plotly.express (mesmo visual do gráfico original)."""
+    import pandas as pd
+    import plotly.express as px
+
+    values = dict(items)
+    dfc = pd.DataFrame({
+        "Categoria": list(values.keys()),
+        "Quantidade": list(values.values())
+    })
+    fig = px.bar(
+        dfc,
+        x="Categoria",
+        y="Quantidade",
+        text="Quantidade",
+        color="Categoria",
+        color_discrete_map=COLORS,
+    )
+    fig.update_traces(textposition="outside", cliponaxis=False)
+    fig.update_layout(
+        title=title,
+        height=HEIGHT,
+        margin=dict(l=10, r=10, t=50, b=20),
+        paper_bgcolor=CLR_PANEL,
+        plot_bgcolor=CLR_PANEL,
+        font=dict(size=13),
+        showlegend=False,
+        xaxis_title=None,
+        yaxis_title="Quantidade"
+    )
+    return fig
+
+
+class ChartCache:
+    """
+    Figuras por (título, valores) num LRU de `maxsize`. Uma figura-modelo
+    (dicionário) por tupla de categorias; as demais saem de uma cópia dela
+    com y/text trocados e `go.Figure(..., _validate=False)`.
+    """
+
+    def __init__(self, maxsize: int = CACHE_SIZE):
+        self.maxsize = maxsize
+        self._figures: OrderedDict[tuple, object] = OrderedDict()
+        self._templates: dict[tuple, dict] = {}
+        self._lock = threading.Lock()
+
+    def _template(self, categories: tuple) -> dict:
+        spec = self._templates.get(categories)
+        if spec is None:
+            spec = _build("", tuple((c, 0) for c in categories)).to_dict()
+            with self._lock:
+                self._templates[categories] = spec
+        return spec
+
+    def _from_template(self, title: str, items: tuple):
+        import plotly.graph_objects as go
+
+        spec = copy.deepcopy(self._template(tuple(k for k, _ in items)))
+        by_name = dict(items)
+        for trace in spec["data"]:  # px: um trace por categoria (color="Categoria")
+            v = by_name[trace["name"]]
+            trace["y"] = [v]
+            trace["text"] = [v]
+        spec["layout"]["title"] = {"text": title}
+        return go.Figure(spec, _validate=False)
+
+    def figure(self, title: str, items: tuple):
+        key = (title, items)
+        with self._lock:
+            fig = self._figures.get(key)
+            if fig is not None:
+                self._figures.move_to_end(key)
+                metrics.count("grafico.acerto")
+                return fig
+        metrics.count("grafico.falta")
+        with metrics.span("grafico.figura"):
+            fig = self._from_template(title, items)
+        with self._lock:
+            self._figures[key] = fig
+            while len(self._figures) > self.maxsize:
+                self._figures.popitem(last=False)
+        return fig
+
+
+chart_cache = ChartCache()
+
+
+# ------------------ alternativa leve (HTML) ------------------
+def bar_html(title: str, items: tuple) -> str:
+    """Mesmas 3 barras em HTML/CSS puro (sem plotly, sem JavaScript)."""
+    top = max((v for _, v in items), default=0) or 1
+    bars = "".join(
+        "<div style='flex:1;display:flex;flex-direction:column;'>"
+        "<div style='flex:1;display:flex;flex-direction:column;justify-content:flex-end;align-items:center;'>"
+        f"<div style='font-weight:600;margin-bottom:4px;'>{v}</div>"
+        f"<div style='width:70%;height:{max(v / top * 85, 0.5):.1f}%;background:{COLORS.get(k, CLR_SUB)};"
+        "border-radius:4px 4px 0 0;'></div></div>"
+        f"<div style='color:{CLR_SUB};font-size:13px;margin-top:6px;text-align:center;'>{html.escape(k)}</div>"
+        "</div>"
+        for k, v in items
+    )
+    return (f"<div class='card' style='height:{HEIGHT}px;display:flex;flex-direction:column;'>"
+            f"<div style='font-size:17px;margin-bottom:8px;'>{html.escape(title)}</div>"
+            f"<div style='flex:1;display:flex;gap:16px;'>{bars}</div></div>")
@@ -0,0 +1,160 @@
+# =========================================================
+# Relatórios de plantão pela linha de comando (sem Streamlit)
+#   python -m dashboard --operador "Fulano" --saida relatorios/
+#   python -m dashboard dados.xlsx outra.xlsx --filtro "posto" --filtro "loja" \
+#       --formato pdf csv xlsx --workers 4
+# Cada combinação origem x filtro vira um job; os PDFs são montados em
+# paralelo (processos), a planilha de cada origem é lida uma única vez.
+# =========================================================
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+import pytz
+
+from dashboard.assets import assets
+from dashboard.config import DRIVE_URL, TIMEZONE
+from dashboard.data import load_source, maintenance
+from dashboard.fetch import is_url
+from dashboard.report import build_pdf, report_table
+from dashboard.search import SearchIndex
+
+FORMATS = ("pdf", "csv", "xlsx")
+TZ = pytz.timezone(TIMEZONE)
+
+
+@dataclass(frozen=True)
+class Job:
+    source: str
+    query: str
+    table: pd.DataFrame
+    stem: str
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^\w.-]+", "_", text.strip(), flags=re.UNICODE).strip("_") or "todos"
+
+
+def _source_name(source: str) -> str:
+    return "drive" if is_url(source) else Path(source).stem
+
+
+def write_outputs(table: pd.DataFrame, operador: str, saida: str, stem: str, formats,
+                  logo: bytes | str | None, generated_at: datetime) -> list[str]:
+    """Grava o relatório nos formatos pedidos; devolve os caminhos criados."""
+    out = []
+    base = Path(saida) / stem
+    if "pdf" in formats:
+        Path(f"{base}.pdf").write_bytes(build_pdf(table, operador, logo, generated_at=generated_at))
+        out.append(f"{base}.pdf")
+    if "csv" in formats:
+        table.to_csv(f"{base}.csv", index=False, encoding="utf-8-sig")  # abre certo no Excel
+        out.append(f"{base}.csv")
+    if "xlsx" in formats:
+        table.to_excel(f"{base}.xlsx", index=False, sheet_name="Manutenção")
+        out.append(f"{base}.xlsx")
+    return out
+
+
+def plan_jobs(sources, queries, operador: str, accents: bool, fuzzy: bool) -> list[Job]:
+    """Carrega cada origem (em paralelo) e monta a tabela de cada origem x filtro."""
+    with ThreadPoolExecutor(max_workers=max(len(sources), 1)) as pool:
+        # planilhas avulsas do lote não entram no histórico de disponibilidade
+        loaded = list(pool.map(lambda s: load_source(s, force=True, history=False), sources))
+
+    jobs = []
+    for source, res in zip(sources, loaded):
+        index = SearchIndex(res.df) if any(queries) else None
+        for q in queries:
+            agg = maintenance(res.df, q, accents=accents, fuzzy=fuzzy, index=index)
+            parts = [f"Relatorio_Plantao_{_slug(operador)}"]
+            if len(sources) > 1:
+                parts.append(_slug(_source_name(source)))
+            if q:
+                parts.append(_slug(q))
+            jobs.append(Job(source, q, report_table(agg.faltando), "_".join(parts)))
+    return jobs
+
+
+def _call(fn, *args):
+    # erro num relatório não derruba os outros: volta como resultado
+    try:
+        return fn(*args)
+    except Exception as e:
+        return e
+
+
+def run(args) -> int:
+    formats = list(dict.fromkeys(args.formato))
+    queries = args.filtro or [""]
+    Path(args.saida).mkdir(parents=True, exist_ok=True)
+    agora = datetime.now(TZ)
+    t0 = time.perf_counter()
+
+    sources = list(dict.fromkeys(args.fontes or [DRIVE_URL]))
+    missing = [s for s in sources if not is_url(s) and not Path(s).exists()]
+    if missing:
+        print(f"Planilha não encontrada: {', '.join(missing)}", file=sys.stderr)
+        return 2
+    try:
+        jobs = plan_jobs(sources, list(dict.fromkeys(queries)), args.operador, args.sem_acento, args.aproximada)
+    except Exception as e:
+        print(f"Erro ao carregar planilha: {e}", file=sys.stderr)
+        return 2
+
+    workers = args.workers or min(len(jobs), os.cpu_count() or 1)
+    if args.logo is None:
+        logo = assets().logo.pdf if assets().logo else None
+    else:
+        logo = args.logo
+    calls = [(write_outputs, job.table, args.operador, args.saida, job.stem, formats, logo, agora) for job in jobs]
+    if workers <= 1 or len(jobs) == 1:
+        results = [_call(*c) for c in calls]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_call, *zip(*calls)))
+
+    failed = 0
+    for job, res in zip(jobs, results):
+        if isinstance(res, Exception):
+            failed += 1
+            print(f"ERRO  {job.stem}: {res}", file=sys.stderr)
+        else:
+            if not args.quiet:
+                print(f"{len(job.table):>6} locais  " + "  ".join(res))
+    if not args.quiet:
+        print(f"{len(jobs) - failed}/{len(jobs)} relatórios em {time.perf_counter() - t0:.2f}s")
+    return 1 if failed else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(
+        prog="python -m dashboard",
+        description="Gera o relatório de locais para manutenção sem abrir o painel.")
+    p.add_argument("fontes", nargs="*", metavar="FONTE",
+                   help="planilha .xlsx (arquivo ou URL); padrão: planilha do Drive")
+    p.add_argument("-o", "--operador", required=True, help="operador responsável pelo plantão")
+    p.add_argument("-s", "--saida", default=".", help="pasta de saída (padrão: atual)")
+    p.add_argument("-f", "--formato", nargs="+", choices=FORMATS, default=list(FORMATS),
+                   help="formatos gerados (padrão: todos)")
+    p.add_argument("--filtro", action="append", metavar="BUSCA",
+                   help="mesma busca do painel; repetir para gerar um relatório por filtro")
+    p.add_argument("--sem-acento", action="store_true", help="busca ignorando acentos")
+    p.add_argument("--aproximada", action="store_true", help="busca aproximada (erros de digitação)")
+    p.add_argument("--logo", help="imagem do cabeçalho do PDF (padrão: logo.png do repositório; '' desativa)")
+    p.add_argument("-j", "--workers", type=int, default=0, help="processos para os relatórios (padrão: nº de CPUs)")
+    p.add_argument("-q", "--quiet", action="store_true", help="sem saída, só o código de retorno")
+    return p
+
+
+def main(argv=None) -> int:
+    return run(build_parser().parse_args(argv))
@@ -0,0 +1,40 @@
+# =========================================================
+# Configuração compartilhada: origem da planilha, arquivos do
+# repositório e paleta. Só constantes – importar é instantâneo.
+# =========================================================
+from pathlib import Path
+
+# Leitura direta do Excel no Google Drive
+DRIVE_FILE_ID = "1LofqwV9_fXfKAGbqjk2LEfgSQmJvUiuA"
+DRIVE_URL = f"https://drive.google.com/uc?export=download&id={DRIVE_FILE_ID}"
+
+ROOT_PATH = Path(__file__).resolve().parent.parent
+PLANILHA = "dados.xlsx"
+PLANILHA_PATH = ROOT_PATH / PLANILHA
+
+TIMEZONE = "America/Sao_Paulo"  # horário de Brasília
+
+# Logo somente do repositório / arquivo
+LOGO_FILE_CANDIDATES = [
+    "logo.png", "./logo.png", "/app/logo.png", "/mount/src/dashboard-cameras/logo.png",
+    "logo_perimetro.png", "./logo_perimetro.png",
+    str(ROOT_PATH / "logo.png"), str(ROOT_PATH / "logo_perimetro.png"),
+]
+LOGO_URL_RAW = "https://raw.githubusercontent.com/perimetro97/dashboard-cameras/main/logo.png"
+
+# Ícones na raiz do repositório
+ICON_CAMERA     = "camera.png"
+ICON_ALARME     = "alarme.png"
+ICON_ENGRENAGEM = "engrenagem.png"
+ICON_RELATORIO  = "relatorio.png"
+
+# Paleta (AZUL AJUSTADO PARA O TOM DA LOGO)
+CLR_BG     = "#F5F6FA"
+CLR_PANEL  = "#FFFFFF"
+CLR_TEXT   = "#111827"  # preto suave
+CLR_SUB    = "#6B7280"
+CLR_BORDER = "#E5E7EB"
+CLR_BLUE   = "#1B1F3B"   # Azul exato da logo (antes #0B66C3)
+CLR_ORANGE = "#F37021"   # Laranja institucional
+CLR_GREEN  = "#16A34A"   # OK
+CLR_RED    = "#E11D48"   # Offline
@@ -0,0 +1,146 @@
+# =========================================================
+# Camada de dados sem Streamlit: origem -> snapshot -> DataFrame -> agregados
+# Mesmo pipeline do `load_data` do app, usado também pela linha de
+# comando e por testes/scripts. pandas, numpy e requests só são
+# importados na primeira chamada: `import dashboard.data` é instantâneo.
+# =========================================================
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from dashboard import metrics
+from dashboard.config import DRIVE_URL, PLANILHA_PATH  # noqa: F401 (DRIVE_URL reexportado)
+from dashboard.fetch import FetchResult, fetcher_for, is_url
+
+if TYPE_CHECKING:
+    import pandas as pd
+    from dashboard.aggregates import Aggregates
+    from dashboard.snapshot import SnapshotStore
+
+FRAME_CACHE = 4  # versões normalizadas mantidas em memória pelo processo
+
+_snapshots: SnapshotStore | None = None
+_frames: OrderedDict[str, tuple] = OrderedDict()  # versão -> (df, origens já no histórico)
+_frames_lock = threading.Lock()
+_loading: dict[str, threading.Lock] = {}
+
+
+def snapshots() -> SnapshotStore:
+    global _snapshots
+    if _snapshots is None:
+        from dashboard.snapshot import SnapshotStore
+        _snapshots = SnapshotStore()
+    return _snapshots
+
+
+@dataclass(frozen=True)
+class LoadResult:
+    df: pd.DataFrame
+    fetch: FetchResult
+
+    @property
+    def version(self) -> str:
+        return self.fetch.digest
+
+
+def resolve_source(path: str, fallback: str | Path = PLANILHA_PATH) -> str:
+    """URL como veio; arquivo local inexistente cai na planilha do repositório."""
+    if is_url(path):
+        return path.strip()
+    p = Path(path)
+    return str(p if p.exists() else Path(fallback))
+
+
+def origin_key(source) -> str:
+    """Nome da origem no histórico: o arquivo/URL, ou as regiões (`Source`) de DASHBOARD_SOURCES."""
+    if isinstance(source, tuple):
+        return ";".join(f"{s.name}={s.location.strip()}" for s in source)
+    return str(source).strip()
+
+
+def parse_version(digest: str, content: bytes, store: SnapshotStore | None = None,
+                  origin: str | None = None) -> pd.DataFrame:
+    """
+    DataFrame normalizado da versão `digest`, um só por processo: o app
+    (`_parse_sheet`), o poller ao vivo, a API e as regiões recebem o mesmo
+    objeto (compacto e somente leitura). Fora da memória, snapshot em disco
+    se houver, senão relê o Excel e grava o snapshot. Com `origin`, registra
+    a versão no histórico dessa origem (ver `origin_key`).
+    """
+    with _frames_lock:
+        entry = _frames.get(digest)
+        if entry is not None:
+            _frames.move_to_end(digest)
+        else:
+            loading = _loading.setdefault(digest, threading.Lock())
+    if entry is None:
+        with loading:  # single-flight: chamadas simultâneas da mesma versão leem uma vez
+            try:
+                entry = _frames.get(digest)
+                if entry is None:
+                    entry = (_read_version(digest, content, store), set())
+                    with _frames_lock:
+                        _frames[digest] = entry
+                        while len(_frames) > FRAME_CACHE:
+                            _frames.popitem(last=False)
+            finally:
+                with _frames_lock:
+                    _loading.pop(digest, None)
+    if origin is not None and origin not in entry[1]:
+        entry[1].add(origin)
+        record_history(digest, entry[0], origin)
+    return entry[0]
+
+
+def _read_version(digest: str, content: bytes, store: SnapshotStore | None) -> pd.DataFrame:
+    from dashboard.sheet import NORMALIZE_VERSION, parse_sheet
+    from dashboard.snapshot import snapshot_key
+
+    store = store or snapshots()
+    key = snapshot_key(digest, NORMALIZE_VERSION)
+    with metrics.span("leitura"):
+        df = store.load(key)
+        metrics.count("snapshot.acerto" if df is not None else "snapshot.falta")
+        if df is None:
+            df = parse_sheet(content)
+            df.attrs["snapshot"] = digest
+            store.save(key, df)
+    return df
+
+
+def record_history(digest: str, df: pd.DataFrame, origin: str):
+    """Cada versão nova da planilha entra no histórico da origem (só as mudanças por local)."""
+    try:
+        from dashboard.history import default_store
+        store = default_store(origin)
+        if store is not None:
+            store.record(df, digest=digest)
+    except Exception:
+        pass  # histórico é auxiliar: nunca derruba quem está carregando
+
+
+def load_source(source: str, force: bool = False, history: bool = True) -> LoadResult:
+    """Busca `source` (URL ou arquivo) e devolve o DataFrame normalizado."""
+    source = resolve_source(source)
+    res = fetcher_for(source).get(force=force)
+    return LoadResult(parse_version(res.digest, res.content, origin=origin_key(source) if history else None), res)
+
+
+def maintenance(df: pd.DataFrame, query: str = "", accents: bool = False, fuzzy: bool = False,
+                index=None) -> Aggregates:
+    """
+    Totais e listas de manutenção (câmeras, alarmes e combinada) do recorte
+    da busca `query` – as mesmas regras das abas do painel.
+    """
+    from dashboard.aggregates import compute_aggregates
+
+    if query.strip():
+        if index is None:
+            from dashboard.search import SearchIndex
+            index = SearchIndex(df)
+        df = index.filter(df, query, accents=accents, fuzzy=fuzzy)
+    return compute_aggregates(df)
@@ -0,0 +1,144 @@
+# =========================================================
+# Diferenças entre duas versões consecutivas da planilha
+# Casamento por Local (vetorizado, sem laço por linha) e um conjunto
+# compacto de mudanças: ficou offline, recuperou, piorou/melhorou (Falta).
+# =========================================================
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from dashboard.sheet import site_key
+
+# Eventos por tipo de equipamento
+OFFLINE = "offline"         # passou a OfflineBool
+RECUPERADO = "recuperado"   # deixou de estar offline
+PIOROU = "piorou"           # mais equipamentos faltando
+MELHOROU = "melhorou"       # menos equipamentos faltando
+NOVO = "novo"               # local apareceu na planilha
+REMOVIDO = "removido"       # local saiu da planilha
+
+_KEEP = ["Cam_Total", "Cam_Online", "Cam_Falta", "Cam_OfflineBool",
+         "Alm_Total", "Alm_Online", "Alm_Falta", "Alm_OfflineBool"]
+
+
+@dataclass(frozen=True)
+class ChangeSet:
+    prev_version: str
+    curr_version: str
+    changes: pd.DataFrame = field(repr=False)  # uma linha por local que mudou
+
+    @property
+    def empty(self) -> bool:
+        return self.changes.empty
+
+    def counts(self) -> dict[str, int]:
+        out = {}
+        for prefix in ("Cam", "Alm"):
+            ev = self.changes[f"{prefix}_Evento"].value_counts()
+            for k, v in ev.items():
+                if k:
+                    out[f"{prefix}_{k}"] = int(v)
+        return out
+
+
+def _keyed(df: pd.DataFrame) -> pd.DataFrame:
+    # Local + ordem de ocorrência: locais repetidos casam 1º com 1º, 2º com 2º...
+    local = site_key(df)
+    out = df[_KEEP].copy()
+    out["Local"] = local.to_numpy()
+    if local.duplicated().any():
+        out["__n"] = local.groupby(local.to_numpy()).cumcount().to_numpy()
+    else:
+        out["__n"] = 0
+    return out
+
+
+def _align(prev: pd.DataFrame, curr: pd.DataFrame):
+    """Lado a lado (sufixos _a/_b) + máscaras de quem só existe em um dos lados."""
+    pl = site_key(prev).to_numpy()
+    cl = site_key(curr).to_numpy()
+    if len(pl) == len(cl) and (pl == cl).all():
+        # caso comum: mesmos locais na mesma ordem – dispensa o merge
+        m = pd.concat([prev[_KEEP].reset_index(drop=True).add_suffix("_a"),
+                       curr[_KEEP].reset_index(drop=True).add_suffix("_b")], axis=1)
+        m["Local"] = cl
+        none = np.zeros(len(m), dtype=bool)
+        return m, none, none
+    m = _keyed(prev).merge(_keyed(curr), on=["Local", "__n"], how="outer",
+                           suffixes=("_a", "_b"), indicator=True, sort=False)
+    return m, (m["_merge"] == "left_only").to_numpy(), (m["_merge"] == "right_only").to_numpy()
+
+
+def _events(prefix: str, m: pd.DataFrame, only_prev, only_curr) -> tuple[np.ndarray, np.ndarray]:
+    off_a = m[f"{prefix}_OfflineBool_a"].to_numpy(dtype=bool, na_value=False)
+    off_b = m[f"{prefix}_OfflineBool_b"].to_numpy(dtype=bool, na_value=False)
+    falta_a = m[f"{prefix}_Falta_a"].to_numpy(dtype=np.int64, na_value=0)
+    falta_b = m[f"{prefix}_Falta_b"].to_numpy(dtype=np.int64, na_value=0)
+    delta = falta_b - falta_a
+    both = ~only_prev & ~only_curr
+    ev = np.select(
+        [only_curr, only_prev, both & ~off_a & off_b, both & off_a & ~off_b, both & (delta > 0), both & (delta < 0)],
+        [NOVO, REMOVIDO, OFFLINE, RECUPERADO, PIOROU, MELHOROU],
+        "",
+    )
+    return ev, delta
+
+
+def diff_frames(prev: pd.DataFrame, curr: pd.DataFrame,
+                prev_version: str = "", curr_version: str = "") -> ChangeSet:
+    """Compara dois DataFrames normalizados por `load_data`."""
+    m, only_prev, only_curr = _align(prev, curr)
+
+    cam_ev, cam_delta = _events("Cam", m, only_prev, only_curr)
+    alm_ev, alm_delta = _events("Alm", m, only_prev, only_curr)
+    changed = (cam_ev != "") | (alm_ev != "")
+
+    m = m[changed]
+    changes = pd.DataFrame({
+        "Local": m["Local"].to_numpy(),
+        "Cam_Evento": pd.Categorical(cam_ev[changed]),
+        "Cam_Falta_Antes": m["Cam_Falta_a"].to_numpy(dtype=np.int64, na_value=0),
+        "Cam_Falta": m["Cam_Falta_b"].to_numpy(dtype=np.int64, na_value=0),
+        "Cam_Delta": cam_delta[changed],
+        "Alm_Evento": pd.Categorical(alm_ev[changed]),
+        "Alm_Falta_Antes": m["Alm_Falta_a"].to_numpy(dtype=np.int64, na_value=0),
+        "Alm_Falta": m["Alm_Falta_b"].to_numpy(dtype=np.int64, na_value=0),
+        "Alm_Delta": alm_delta[changed],
+    })
+    # mais graves primeiro: quedas, depois pioras, depois o resto
+    order = {OFFLINE: 0, PIOROU: 1, REMOVIDO: 2, NOVO: 3, MELHOROU: 4, RECUPERADO: 5, "": 6}
+    rank = np.minimum(pd.Series(cam_ev[changed]).map(order).to_numpy(),
+                      pd.Series(alm_ev[changed]).map(order).to_numpy())
+    changes = changes.iloc[np.argsort(rank, kind="stable")].reset_index(drop=True)
+    return ChangeSet(prev_version, curr_version, changes)
+
+
+class SnapshotTracker:
+    """
+    Guarda a versão atual e a anterior vistas pelo processo e calcula o
+    diff uma única vez por troca de versão.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version: str | None = None
+        self._df: pd.DataFrame | None = None
+        self._last: ChangeSet | None = None
+
+    @property
+    def last(self) -> ChangeSet | None:
+        return self._last
+
+    def update(self, version: str, df: pd.DataFrame) -> ChangeSet | None:
+        """Informa a versão em uso; devolve o diff contra a versão anterior (se houver)."""
+        with self._lock:
+            if version == self._version:
+                return self._last
+            if self._df is not None:
+                self._last = diff_frames(self._df, df, self._version, version)
+            self._version, self._df = version, df
+            return self._last
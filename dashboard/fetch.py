@@ -0,0 +1,183 @@
+# =========================================================
+# Busca da planilha (Google Drive / arquivo local)
+# - intervalo de atualização configurável (TTL)
+# - requisição condicional: ETag / Last-Modified / hash do conteúdo
+# - single-flight: sessões concorrentes compartilham um único download
+# - serve a última versão boa quando o Drive está lento, fora do ar ou
+#   responde algo que não é .xlsx (página HTML de cota, login...)
+# =========================================================
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import time
+from dataclasses import dataclass, replace
+from pathlib import Path
+
+from dashboard import metrics
+
+# Intervalo (s) entre verificações na origem; 0 = verifica a cada chamada
+DEFAULT_TTL = float(os.environ.get("DASHBOARD_REFRESH_SECONDS", "300"))
+DEFAULT_TIMEOUT = float(os.environ.get("DASHBOARD_FETCH_TIMEOUT", "20"))
+# Após falha na origem, tenta de novo em no máximo este intervalo (s)
+ERROR_RETRY = float(os.environ.get("DASHBOARD_FETCH_RETRY_SECONDS", "30"))
+
+
+XLSX_MAGIC = b"PK\x03\x04"  # .xlsx é um zip
+
+
+def check_workbook(content: bytes) -> bytes:
+    """Recusa corpos que não são .xlsx (ex.: página HTML de cota/login do Drive com status 200)."""
+    if not content.startswith(XLSX_MAGIC):
+        raise ValueError(f"resposta não é uma planilha .xlsx ({len(content)} bytes, início {content[:16]!r})")
+    return content
+
+
+def is_url(path) -> bool:
+    return isinstance(path, str) and path.strip().lower().startswith(("http://", "https://"))
+
+
+@dataclass(frozen=True)
+class FetchResult:
+    content: bytes
+    digest: str             # sha256 do conteúdo – identifica a versão da planilha
+    fetched_at: float       # epoch da última validação bem-sucedida na origem
+    changed: bool = False   # True apenas na chamada que trouxe conteúdo novo
+    stale: bool = False     # True se a origem falhou e servimos a última versão boa
+    error: str | None = None
+
+
+class SheetFetcher:
+    """
+    Busca uma planilha (URL ou caminho local) respeitando o TTL.
+
+    - Dentro do TTL devolve o conteúdo em memória, sem I/O.
+    - Fora do TTL faz GET condicional (If-None-Match / If-Modified-Since);
+      304 ou conteúdo com o mesmo hash mantêm o mesmo `digest`, então
+      quem faz cache por `digest` não reprocessa nada.
+    - Só uma thread busca por vez; enquanto isso as demais recebem a
+      versão anterior (se houver) em vez de esperar o Drive.
+    - Se a origem falhar e já existir uma versão boa, ela é servida
+      com `stale=True`.
+    """
+
+    def __init__(self, source: str, ttl: float = DEFAULT_TTL, timeout: float = DEFAULT_TIMEOUT,
+                 session=None, clock=time.monotonic):
+        self.source = source
+        self.ttl = ttl
+        self.timeout = timeout
+        self._session = session
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._result: FetchResult | None = None
+        self._next_check = 0.0
+        self._etag: str | None = None
+        self._last_modified: str | None = None
+        self._file_sig: tuple | None = None
+
+    @property
+    def result(self) -> FetchResult | None:
+        return self._result
+
+    @property
+    def fresh(self) -> bool:
+        """True se `get()` devolve da memória, sem I/O (dentro do TTL)."""
+        return self._result is not None and self._clock() < self._next_check
+
+    def invalidate(self):
+        """Força verificação na origem na próxima chamada."""
+        self._next_check = 0.0
+
+    def get(self, force: bool = False) -> FetchResult:
+        res = self._result
+        if res is not None and not force and self._clock() < self._next_check:
+            return res
+
+        # single-flight: se já há versão em memória, não espera o download alheio
+        if not self._lock.acquire(blocking=res is None):
+            return self._result
+        try:
+            res = self._result
+            if res is not None and not force and self._clock() < self._next_check:
+                return res
+            return self._refresh()
+        finally:
+            self._lock.release()
+
+    # ------------------ internos ------------------
+    def _refresh(self) -> FetchResult:
+        now = self._clock()
+        try:
+            with metrics.span("busca"):
+                if is_url(self.source):
+                    content = self._fetch_url()
+                else:
+                    content = self._fetch_file()
+        except Exception as e:
+            metrics.count("busca.falha")
+            if self._result is None:
+                raise
+            self._next_check = now + min(self.ttl, ERROR_RETRY)
+            self._result = replace(self._result, changed=False, stale=True, error=str(e))
+            return self._result
+
+        self._next_check = now + self.ttl
+        prev = self._result
+        if content is None:  # 304 / arquivo inalterado
+            self._result = replace(prev, changed=False, stale=False, error=None, fetched_at=time.time())
+            return self._result
+
+        digest = hashlib.sha256(content).hexdigest()
+        if prev is not None and prev.digest == digest:
+            self._result = replace(prev, changed=False, stale=False, error=None, fetched_at=time.time())
+            return self._result
+
+        self._result = FetchResult(content=content, digest=digest, fetched_at=time.time())
+        metrics.count("busca.versao_nova")
+        return replace(self._result, changed=True)
+
+    def _fetch_url(self) -> bytes | None:
+        if self._session is None:
+            import requests
+            self._session = requests.Session()
+        headers = {}
+        if self._result is not None:
+            if self._etag:
+                headers["If-None-Match"] = self._etag
+            if self._last_modified:
+                headers["If-Modified-Since"] = self._last_modified
+        r = self._session.get(self.source, headers=headers, timeout=self.timeout)
+        if r.status_code == 304 and self._result is not None:
+            return None
+        r.raise_for_status()
+        check_workbook(r.content)  # antes de guardar ETag: corpo ruim cai na versão boa anterior
+        self._etag = r.headers.get("ETag")
+        self._last_modified = r.headers.get("Last-Modified")
+        return r.content
+
+    def _fetch_file(self) -> bytes | None:
+        p = Path(self.source)
+        st_ = p.stat()
+        sig = (st_.st_mtime_ns, st_.st_size)
+        if self._result is not None and sig == self._file_sig:
+            return None
+        content = check_workbook(p.read_bytes())
+        self._file_sig = sig
+        return content
+
+
+# ------------------ registro por processo ------------------
+_FETCHERS: dict[str, SheetFetcher] = {}
+_FETCHERS_LOCK = threading.Lock()
+
+
+def fetcher_for(source: str, ttl: float | None = None) -> SheetFetcher:
+    """Um SheetFetcher por origem, compartilhado por todas as sessões do processo."""
+    with _FETCHERS_LOCK:
+        f = _FETCHERS.get(source)
+        if f is None:
+            f = _FETCHERS[source] = SheetFetcher(source, ttl=DEFAULT_TTL if ttl is None else ttl)
+        elif ttl is not None:
+            f.ttl = ttl
+        return f
@@ -0,0 +1,296 @@
+# =========================================================
+# Histórico de disponibilidade (SQLite)
+# - cada versão distinta da planilha vira uma linha em `snapshots`
+# - em `changes` só entra o local cujo estado mudou (ou que sumiu/voltou)
+# - linha do tempo separada por origem (arquivo/URL ou conjunto de
+#   regiões): ler outra planilha não marca os locais desta como removidos
+# - índices por (local, instante) e por instante: "desde quando o local X
+#   está offline" e disponibilidade em 30/90 dias não varrem o ano inteiro
+# =========================================================
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from dashboard.sheet import site_key
+
+DEFAULT_PATH = os.environ.get(
+    "DASHBOARD_HISTORY_DB",
+    str(Path(os.environ.get("DASHBOARD_CACHE_DIR", Path(__file__).resolve().parent.parent / ".cache"))
+        / "history.sqlite"))
+
+SCHEMA_VERSION = 1  # PRAGMA user_version; 0 = histórico antigo, sem origem
+STATE_COLUMNS = ["cam_total", "cam_online", "alm_total", "alm_online"]
+_FRAME_COLUMNS = ["Cam_Total", "Cam_Online", "Alm_Total", "Alm_Online"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    id     INTEGER PRIMARY KEY,
+    origin TEXT NOT NULL,
+    ts     REAL NOT NULL,
+    digest TEXT NOT NULL,
+    sites  INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS snapshots_origin_ts ON snapshots(origin, ts);
+CREATE TABLE IF NOT EXISTS sites (
+    id     INTEGER PRIMARY KEY,
+    origin TEXT NOT NULL,
+    local  TEXT NOT NULL,
+    UNIQUE (origin, local)
+);
+CREATE TABLE IF NOT EXISTS changes (
+    site_id    INTEGER NOT NULL REFERENCES sites(id),
+    ts         REAL NOT NULL,
+    present    INTEGER NOT NULL,
+    cam_total  INTEGER NOT NULL,
+    cam_online INTEGER NOT NULL,
+    alm_total  INTEGER NOT NULL,
+    alm_online INTEGER NOT NULL,
+    PRIMARY KEY (site_id, ts)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS changes_ts ON changes(ts);
+"""
+
+# condição "offline" por tipo de equipamento (mesma regra de Cam/Alm_OfflineBool)
+_OFFLINE_SQL = {
+    "cam": "present = 1 AND cam_total > 0 AND cam_online = 0",
+    "alm": "present = 1 AND alm_total > 0 AND alm_online = 0",
+}
+
+
+def site_states(df: pd.DataFrame) -> pd.DataFrame:
+    """Estado por local (linhas repetidas do mesmo Local são somadas)."""
+    state = df[_FRAME_COLUMNS].astype("int64").copy()
+    state.columns = STATE_COLUMNS
+    state["local"] = site_key(df).to_numpy()
+    return state.groupby("local", sort=False).sum()
+
+
+class HistoryStore:
+    """
+    Armazena mudanças de estado por local e responde consultas no tempo,
+    sempre dentro da `origin` (várias origens podem dividir o arquivo).
+    `legacy_origin` recebe o histórico gravado antes da separação por origem.
+    """
+
+    def __init__(self, path: str | Path = DEFAULT_PATH, origin: str = "", legacy_origin: str | None = None):
+        self.path = str(path)
+        self.origin = origin
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            self._migrate(origin if legacy_origin is None else legacy_origin)
+            self._conn.executescript(_SCHEMA)
+            self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self._lock = threading.Lock()
+        self._site_ids: dict[str, int] = dict(
+            (local, sid) for sid, local in self._conn.execute("SELECT id, local FROM sites WHERE origin = ?",
+                                                              (origin,)))
+
+    def _migrate(self, legacy_origin: str):
+        """Histórico sem coluna de origem (user_version 0): tudo passa a `legacy_origin`."""
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+            return
+        cols = [r[1] for r in self._conn.execute("PRAGMA table_info(sites)")]
+        if not cols or "origin" in cols:
+            return
+        self._conn.execute("ALTER TABLE snapshots ADD COLUMN origin TEXT NOT NULL DEFAULT ''")
+        self._conn.execute("UPDATE snapshots SET origin = ?", (legacy_origin,))
+        self._conn.execute("DROP INDEX IF EXISTS snapshots_ts")
+        self._conn.execute("ALTER TABLE sites RENAME TO sites_sem_origem")
+        self._conn.execute("CREATE TABLE sites (id INTEGER PRIMARY KEY, origin TEXT NOT NULL, "
+                           "local TEXT NOT NULL, UNIQUE (origin, local))")
+        self._conn.execute("INSERT INTO sites (id, origin, local) SELECT id, ?, local FROM sites_sem_origem",
+                           (legacy_origin,))
+        self._conn.execute("DROP TABLE sites_sem_origem")
+
+    def close(self):
+        self._conn.close()
+
+    # ------------------ escrita ------------------
+    def record(self, df: pd.DataFrame, digest: str, ts: float | None = None) -> int:
+        """
+        Registra a versão `digest` da planilha. Ignora se for a mesma da
+        última gravada. Devolve quantos locais mudaram de estado.
+        """
+        ts = time.time() if ts is None else float(ts)
+        cur = site_states(df)
+        with self._lock, self._conn:
+            last = self._conn.execute("SELECT digest FROM snapshots WHERE origin = ? ORDER BY ts DESC, id DESC LIMIT 1",
+                                      (self.origin,)).fetchone()
+            if last is not None and last[0] == digest:
+                return 0
+            prev = self._latest_states()
+
+            cur_ids = self._ensure_sites(cur.index)
+            new = pd.DataFrame(cur.to_numpy(dtype=np.int64), index=cur_ids, columns=STATE_COLUMNS)
+            new.insert(0, "present", 1)
+
+            # locais que sumiram da planilha: estado "ausente"
+            gone = prev.index.difference(new.index)
+            gone = gone[prev.loc[gone, "present"].to_numpy() == 1]
+            removed = pd.DataFrame(0, index=gone, columns=new.columns)
+
+            old = prev.reindex(new.index)
+            changed = old.isna().any(axis=1).to_numpy() | (old.fillna(-1).to_numpy() != new.to_numpy()).any(axis=1)
+            rows = pd.concat([new[changed], removed])
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO changes (site_id, ts, present, cam_total, cam_online, alm_total, alm_online) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                ((int(sid), ts, *map(int, vals)) for sid, vals in zip(rows.index, rows.to_numpy())))
+            self._conn.execute("INSERT INTO snapshots (origin, ts, digest, sites) VALUES (?, ?, ?, ?)",
+                               (self.origin, ts, digest, len(cur)))
+        return len(rows)
+
+    def _ensure_sites(self, locals_) -> list[int]:
+        missing = [l for l in locals_ if l not in self._site_ids]
+        if missing:
+            self._conn.executemany("INSERT OR IGNORE INTO sites (origin, local) VALUES (?, ?)",
+                                   ((self.origin, l) for l in missing))
+            q = ",".join("?" * len(missing))
+            for sid, local in self._conn.execute(f"SELECT id, local FROM sites WHERE origin = ? AND local IN ({q})",
+                                                 [self.origin, *missing]):
+                self._site_ids[local] = sid
+        return [self._site_ids[l] for l in locals_]
+
+    def _latest_states(self, at: float | None = None) -> pd.DataFrame:
+        """Último estado gravado de cada local (até `at`), indexado por site_id."""
+        where = "" if at is None else "AND ts <= :at"
+        # uma busca no índice (site_id, ts) por local, em vez de varrer `changes`
+        rows = self._conn.execute(
+            f"WITH last AS MATERIALIZED (SELECT s.id AS site_id, "
+            f"  (SELECT MAX(ts) FROM changes WHERE site_id = s.id {where}) AS ts FROM sites s "
+            f"  WHERE s.origin = :origin) "
+            f"SELECT c.site_id, c.present, c.cam_total, c.cam_online, c.alm_total, c.alm_online "
+            f"FROM last JOIN changes c ON c.site_id = last.site_id AND c.ts = last.ts",
+            {"at": at, "origin": self.origin}).fetchall()
+        out = pd.DataFrame(rows, columns=["site_id", "present", *STATE_COLUMNS]).set_index("site_id")
+        return out.astype("int64")
+
+    # ------------------ consultas ------------------
+    def _locals(self, ids) -> list[str]:
+        names = {sid: local for local, sid in self._site_ids.items()}
+        return [names[i] for i in ids]
+
+    def snapshots(self, since: float | None = None, until: float | None = None) -> pd.DataFrame:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT ts, digest, sites FROM snapshots WHERE origin = ? AND ts >= ? AND ts <= ? ORDER BY ts",
+                (self.origin, -np.inf if since is None else since, np.inf if until is None else until)).fetchall()
+        return pd.DataFrame(rows, columns=["ts", "digest", "sites"])
+
+    def state_at(self, ts: float | None = None) -> pd.DataFrame:
+        """Estado de todos os locais presentes no instante `ts` (padrão: agora)."""
+        with self._lock:
+            st_ = self._latest_states(ts)
+        st_ = st_[st_["present"] == 1].drop(columns="present")
+        st_.index = pd.Index(self._locals(st_.index), name="local")
+        return st_
+
+    def site_history(self, local: str, since: float | None = None, until: float | None = None) -> pd.DataFrame:
+        """Mudanças de estado de um local, em ordem cronológica."""
+        sid = self._site_ids.get(str(local))
+        if sid is None:
+            return pd.DataFrame(columns=["ts", "present", *STATE_COLUMNS])
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT ts, present, cam_total, cam_online, alm_total, alm_online FROM changes "
+                "WHERE site_id = ? AND ts >= ? AND ts <= ? ORDER BY ts",
+                (sid, -np.inf if since is None else since, np.inf if until is None else until)).fetchall()
+        return pd.DataFrame(rows, columns=["ts", "present", *STATE_COLUMNS])
+
+    def offline_since(self, kind: str = "cam") -> pd.Series:
+        """
+        Para cada local offline agora: instante em que ficou offline
+        (início da sequência atual de estados offline).
+        """
+        cond = _OFFLINE_SQL[kind]
+        with self._lock:
+            rows = self._conn.execute(f"""
+                WITH cur AS (
+                    SELECT s.id AS site_id FROM sites s JOIN changes c ON c.site_id = s.id
+                     AND c.ts = (SELECT MAX(ts) FROM changes WHERE site_id = s.id)
+                     WHERE s.origin = ? AND {cond}
+                )
+                SELECT cur.site_id,
+                       (SELECT MIN(ts) FROM changes c2 WHERE c2.site_id = cur.site_id AND c2.ts >
+                            COALESCE((SELECT MAX(ts) FROM changes c3
+                                       WHERE c3.site_id = cur.site_id AND NOT ({cond})), -1))
+                  FROM cur""", (self.origin,)).fetchall()
+        ids = [r[0] for r in rows]
+        return pd.Series([r[1] for r in rows], index=pd.Index(self._locals(ids), name="local"),
+                         name="offline_desde", dtype="float64")
+
+    def availability(self, days: float = 30, until: float | None = None, kind: str = "cam") -> pd.DataFrame:
+        """
+        Disponibilidade por local na janela [until - days, until]:
+        - `disponibilidade`: média ponderada no tempo de online/total (%)
+        - `uptime`: % do tempo em que o local NÃO esteve offline
+        Só conta o tempo em que o local existia na planilha e tinha equipamentos.
+        """
+        end = time.time() if until is None else float(until)
+        start = end - days * 86400
+        tot_c, on_c = f"{kind}_total", f"{kind}_online"
+        with self._lock:
+            base = self._latest_states(start).reset_index()
+            base["ts"] = start
+            rows = self._conn.execute(
+                "SELECT c.site_id, c.ts, c.present, c.cam_total, c.cam_online, c.alm_total, c.alm_online "
+                "FROM changes c JOIN sites s ON s.id = c.site_id "
+                "WHERE s.origin = ? AND c.ts > ? AND c.ts <= ?", (self.origin, start, end)).fetchall()
+        inside = pd.DataFrame(rows, columns=["site_id", "ts", "present", *STATE_COLUMNS])
+        ev = pd.concat([base, inside], ignore_index=True).sort_values(["site_id", "ts"], kind="stable")
+
+        nxt = ev.groupby("site_id")["ts"].shift(-1).fillna(end).to_numpy()
+        dur = nxt - ev["ts"].to_numpy()
+        tot = ev[tot_c].to_numpy(dtype=float)
+        on = ev[on_c].to_numpy(dtype=float)
+        counted = (ev["present"].to_numpy() == 1) & (tot > 0)
+        ratio = np.divide(np.minimum(on, tot), tot, out=np.zeros_like(tot), where=tot > 0)
+        calc = pd.DataFrame({
+            "site_id": ev["site_id"].to_numpy(),
+            "tempo": np.where(counted, dur, 0.0),
+            "online": np.where(counted, dur * ratio, 0.0),
+            "up": np.where(counted & (on > 0), dur, 0.0),
+        }).groupby("site_id").sum()
+        calc = calc[calc["tempo"] > 0]
+        out = pd.DataFrame({
+            "disponibilidade": 100 * calc["online"] / calc["tempo"],
+            "uptime": 100 * calc["up"] / calc["tempo"],
+            "horas_monitoradas": calc["tempo"] / 3600,
+        })
+        out.index = pd.Index(self._locals(out.index), name="local")
+        return out
+
+
+# ------------------ instância padrão do processo ------------------
+_STORES: dict[str, HistoryStore] = {}
+_DEFAULT_LOCK = threading.Lock()
+
+
+def default_store(origin: str) -> HistoryStore | None:
+    """
+    Store da `origin` em DASHBOARD_HISTORY_DB; None se desativado com 'off'.
+    O histórico antigo (sem origem) fica com a origem configurada do painel.
+    """
+    if DEFAULT_PATH.lower() == "off":
+        return None
+    with _DEFAULT_LOCK:
+        store = _STORES.get(origin)
+        if store is None:
+            from dashboard.config import DRIVE_URL
+            from dashboard.data import origin_key
+            from dashboard.sources import configured_origin
+
+            store = _STORES[origin] = HistoryStore(DEFAULT_PATH, origin,
+                                                   legacy_origin=origin_key(configured_origin(DRIVE_URL)))
+        return store
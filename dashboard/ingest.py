@@ -0,0 +1,163 @@
+# =========================================================
+# Leitura em fluxo de planilhas grandes (openpyxl read-only)
+# - percorre a planilha linha a linha, guardando só as colunas A–H
+# - linhas em branco e de resumo (TOTAL/RELATÓRIO) são descartadas na hora
+# - contagens vão direto para arrays int64 (mesma regra de `_to_int`);
+#   Local e Apelido em arrays de objetos
+# Memória proporcional aos locais úteis, não ao tamanho da planilha.
+# O resultado passa pelo mesmo `normalize` e é idêntico ao do read_excel.
+# =========================================================
+from __future__ import annotations
+
+import math
+import os
+import re
+from array import array
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+from dashboard.metrics import span
+from dashboard.sheet import SUMMARY_ROWS, _to_int
+
+# "auto": fluxo a partir de STREAM_MIN_BYTES; "stream" ou "pandas" forçam o modo
+MODE = os.environ.get("DASHBOARD_INGEST", "auto").lower()
+STREAM_MIN_BYTES = int(os.environ.get("DASHBOARD_INGEST_MIN_BYTES", str(2**20)))
+
+# Textos que o read_excel trata como vazio (na_values padrão) + códigos de erro do Excel
+_NA = {"", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+       "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+       "#NULL!", "#DIV/0!", "#VALUE!", "#REF!", "#NAME?", "#NUM!"}
+_SUMMARY = re.compile(SUMMARY_ROWS, re.IGNORECASE)
+_COUNT_COLS = (1, 2, 4, 5)   # B, C, E, F
+
+
+def use_stream(content: bytes) -> bool:
+    if MODE == "stream":
+        return True
+    if MODE == "pandas":
+        return False
+    return len(content) >= STREAM_MIN_BYTES
+
+
+def _cell(v):
+    """Valor da célula como o read_excel devolveria (None = vazio)."""
+    t = type(v)
+    if t is float:
+        if v.is_integer():
+            return int(v)
+        return None if math.isnan(v) else v
+    if t is str and v in _NA:
+        return None
+    return v
+
+
+def _count(v) -> int:
+    t = type(v)
+    if t is int:
+        return v
+    if t is float:
+        return int(v) if math.isfinite(v) else 0
+    if v is None:
+        return 0
+    return _to_int(v)
+
+
+def _numeric(v) -> bool:
+    """Célula que não impede a coluna de virar número no read_excel (inferência do TextParser)."""
+    if type(v) is str:
+        try:
+            float(v)
+        except ValueError:
+            return False
+        return True
+    return isinstance(v, (int, float))
+
+
+class _Kind:
+    """
+    Tipo que o read_excel daria à coluna inteira – inclusive pelas linhas
+    descartadas depois: numérica, texto ("str") ou mista (object).
+    """
+
+    __slots__ = ("seen", "numeric", "text")
+
+    def __init__(self):
+        self.seen, self.numeric, self.text = False, True, True
+
+    def add(self, v):
+        self.seen = True
+        if self.numeric:
+            self.numeric = _numeric(v)
+        if self.text:
+            self.text = type(v) is str
+
+    def column(self, values: list):
+        if not self.seen:
+            return np.full(len(values), np.nan)  # coluna vazia: float NaN
+        arr = np.array(values, dtype=object)
+        arr[pd.isna(arr)] = np.nan
+        if self.numeric:
+            return pd.to_numeric(pd.Series(arr)).to_numpy()
+        if self.text:
+            return pd.array(arr, dtype="str")
+        return arr
+
+
+@span("leitura.fluxo")
+def stream_sheet(content: bytes) -> pd.DataFrame:
+    """
+    Mesmo DataFrame "cru" que `read_sheet` + filtros do `normalize`
+    (colunas 0–7, só linhas com Local e sem resumo), lido em fluxo.
+    """
+    from openpyxl import load_workbook
+
+    wb = load_workbook(BytesIO(content), read_only=True, data_only=True, keep_links=False)
+    try:
+        ws = wb.worksheets[0]
+        ws.reset_dimensions()
+        local, apelido = [], []
+        counts = [array("q") for _ in _COUNT_COLS]
+        kind_a, kind_h = _Kind(), _Kind()
+        # contagem numérica com True/False: o read_excel converte para 1/0 (raro)
+        numeric = [True] * len(_COUNT_COLS)
+        bools: list[list] = [[] for _ in _COUNT_COLS]   # (posição, 0/1)
+        has_h = False                     # alguma linha com dado em H ou além
+        for row in ws.iter_rows(values_only=True):
+            a = _cell(row[0]) if row else None
+            h = _cell(row[7]) if len(row) > 7 else None
+            if not has_h and len(row) > 7:
+                has_h = any(v is not None and v != "" for v in row[7:])
+            if a is not None:
+                kind_a.add(a)
+            if h is not None:
+                kind_h.add(h)
+            cells = [_cell(row[c]) if len(row) > c else None for c in _COUNT_COLS]
+            if any(numeric):
+                for i, v in enumerate(cells):
+                    if numeric[i] and v is not None:
+                        numeric[i] = _numeric(v)
+            if a is None or _SUMMARY.search(str(a)):
+                continue
+            for i, (out, v) in enumerate(zip(counts, cells)):
+                if type(v) is bool:
+                    bools[i].append((len(out), int(v)))
+                out.append(_count(v))
+            local.append(a)
+            apelido.append(h)
+    finally:
+        wb.close()
+
+    n = len(local)
+    empty = np.full(n, np.nan, dtype=object)  # status D/G: recalculados pelo normalize
+    cols = {0: kind_a.column(local), 3: empty, 6: empty}
+    for i, (c, out) in enumerate(zip(_COUNT_COLS, counts)):
+        arr = np.frombuffer(out, dtype=np.int64) if n else np.zeros(0, dtype=np.int64)
+        if numeric[i] and bools[i]:
+            arr = arr.copy()
+            for pos, val in bools[i]:
+                arr[pos] = val
+        cols[c] = arr
+    cols[7] = kind_h.column(apelido) if has_h else np.full(n, "", dtype=object)
+    return pd.DataFrame({c: cols[c] for c in range(8)})
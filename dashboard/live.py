@@ -0,0 +1,161 @@
+# =========================================================
+# Atualização ao vivo
+# Um único poller por origem e por processo consulta a planilha em
+# segundo plano; sessões (fragmentos do Streamlit, SSE da API) só leem
+# a versão já carregada. N telas abertas = 1 consulta à origem.
+# =========================================================
+from __future__ import annotations
+
+import os
+import threading
+from typing import TYPE_CHECKING, Callable
+
+from dashboard.data import origin_key, parse_version
+from dashboard.fetch import DEFAULT_TTL, fetcher_for
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Intervalo (s) entre redesenhos dos fragmentos ao vivo do painel;
+# 0 (padrão) desliga o modo ao vivo na interface.
+LIVE_SECONDS = float(os.environ.get("DASHBOARD_LIVE_SECONDS", "0"))
+# Intervalo (s) do poller para quem não depende da interface (SSE da API,
+# alertas); padrão: o TTL da busca (DASHBOARD_REFRESH_SECONDS).
+POLL_SECONDS = float(os.environ.get("DASHBOARD_POLL_SECONDS", "") or DEFAULT_TTL or 30)
+
+Listener = Callable[[str, "pd.DataFrame"], None]
+
+
+class LivePoller:
+    """
+    Verifica a origem a cada `interval` segundos (o TTL do fetcher continua
+    valendo: requisição condicional, versão boa em caso de falha) e, quando
+    a versão muda, carrega o DataFrame uma vez e avisa os inscritos.
+    """
+
+    def __init__(self, source, interval: float = POLL_SECONDS):
+        self.source = source
+        self.interval = interval
+        self.generation = 0              # incrementa a cada versão nova
+        self.error: str | None = None    # última falha do poller (None = ok)
+        self._state: tuple | None = None  # (versão, df)
+        self._listeners: list[Listener] = []
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._wake = threading.Event()    # intervalo mudou: recomeça a espera
+        self._thread: threading.Thread | None = None
+
+    @property
+    def version(self) -> str | None:
+        state = self._state
+        return state[0] if state else None
+
+    def current(self) -> tuple:
+        """(versão, df) mais recente; na primeira chamada carrega na hora."""
+        if self._state is None:
+            self.poll()
+        return self._state
+
+    def poll(self) -> bool:
+        """Uma verificação; True se trouxe versão nova."""
+        digest, load = current_version(self.source)
+        if self._state is not None and digest == self._state[0]:
+            return False
+        df = load()
+        with self._cond:
+            if self._state is not None and digest == self._state[0]:
+                return False
+            self._state = (digest, df)
+            self.generation += 1
+            listeners = list(self._listeners)
+            self._cond.notify_all()
+        for fn in listeners:
+            try:
+                fn(digest, df)
+            except Exception:
+                pass  # um inscrito com erro não impede os outros
+        return True
+
+    def subscribe(self, fn: Listener) -> Callable[[], None]:
+        """Chama `fn(versão, df)` a cada versão nova; devolve a função que cancela."""
+        with self._cond:
+            self._listeners.append(fn)
+
+        def cancel():
+            with self._cond:
+                if fn in self._listeners:
+                    self._listeners.remove(fn)
+        return cancel
+
+    def wait(self, generation: int, timeout: float | None = None) -> int:
+        """Bloqueia até existir versão mais nova que `generation` (ou timeout)."""
+        with self._cond:
+            self._cond.wait_for(lambda: self.generation > generation or self._stop.is_set(), timeout)
+            return self.generation
+
+    # ------------------ thread ------------------
+    def start(self) -> "LivePoller":
+        if self._thread is None and self.interval > 0:
+            self._thread = threading.Thread(target=self._run, name="dashboard-live", daemon=True)
+            self._thread.start()
+        return self
+
+    def set_interval(self, interval: float):
+        self.interval = interval
+        self._wake.set()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        with self._cond:
+            self._cond.notify_all()
+
+    def _run(self):
+        # a primeira verificação é imediata: inscritos (alertas) recebem a versão atual
+        while True:
+            try:
+                self.poll()
+                self.error = None
+            except Exception as e:
+                self.error = str(e)  # origem fora: o fetcher já serve a última versão boa
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            if self._stop.is_set():
+                return
+
+
+def current_version(source) -> tuple:
+    """
+    (versão, carregar) da origem: `source` é um arquivo/URL ou a tupla de
+    `Source` de várias planilhas (ver `sources.configured_origin`).
+    `carregar()` devolve o DataFrame; só é chamado quando a versão mudou.
+    É o mesmo objeto do painel e da API (cache por versão de `parse_version`).
+    """
+    if isinstance(source, tuple):
+        from dashboard.sources import load_sources
+
+        multi = load_sources(list(source))
+        return multi.version, lambda: multi.df
+    res = fetcher_for(source).get()
+    return res.digest, lambda: parse_version(res.digest, res.content, origin=origin_key(source))
+
+
+# ------------------ registro por processo ------------------
+_POLLERS: dict = {}
+_POLLERS_LOCK = threading.Lock()
+
+
+def poller_for(source, interval: float | None = None) -> LivePoller:
+    """
+    Um LivePoller (já rodando) por origem, compartilhado pelo processo.
+    `interval` padrão: POLL_SECONDS; com vários interessados (fragmentos,
+    SSE, alertas) vale o menor intervalo pedido.
+    """
+    interval = POLL_SECONDS if interval is None else interval
+    with _POLLERS_LOCK:
+        p = _POLLERS.get(source)
+        if p is None:
+            p = _POLLERS[source] = LivePoller(source, interval)
+        elif interval > 0 and (p.interval <= 0 or interval < p.interval):
+            p.set_interval(interval)
+        return p.start()
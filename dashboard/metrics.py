@@ -0,0 +1,171 @@
+# =========================================================
+# Instrumentação do caminho quente
+# - `span("nome")` (contexto ou decorador): duração de um trecho
+# - `count("nome")`: contadores (acertos/erros de cache, versões novas...)
+# - por processo: últimas RESERVOIR durações de cada span -> p50/p95
+# - por rerun: `rerun()` junta os spans do rerun atual (painel de tempos)
+# - `prometheus()`: texto no formato de exposição do Prometheus (/metrics)
+# Custo por span: 2 perf_counter + um append sob lock; sem dependências.
+# =========================================================
+from __future__ import annotations
+
+import hmac
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+ENABLED = os.environ.get("DASHBOARD_METRICS", "on").lower() not in ("0", "off", "false", "no")
+RESERVOIR = 1024  # durações guardadas por span para os percentis
+# Painel de tempos no app: só com ?admin=<token> igual a este valor (vazio = sem painel)
+ADMIN_TOKEN = os.environ.get("DASHBOARD_ADMIN_TOKEN", "")
+
+_lock = threading.Lock()
+_durations: dict[str, deque] = {}
+_totals: dict[str, list] = {}      # nome -> [quantidade, soma em s]
+_counters: dict[str, int] = {}
+_current: ContextVar[list | None] = ContextVar("dashboard_rerun", default=None)
+
+
+def observe(name: str, seconds: float):
+    """Registra uma duração já medida."""
+    if not ENABLED:
+        return
+    with _lock:
+        d = _durations.get(name)
+        if d is None:
+            d = _durations[name] = deque(maxlen=RESERVOIR)
+            _totals[name] = [0, 0.0]
+        d.append(seconds)
+        t = _totals[name]
+        t[0] += 1
+        t[1] += seconds
+    spans = _current.get()
+    if spans is not None:
+        spans.append((name, seconds))
+
+
+class span:
+    """
+    Mede um trecho: `with span("leitura"): ...` ou `@span("render.cameras")`.
+    Spans aninhados são registrados separadamente (não se descontam).
+    """
+
+    __slots__ = ("name", "_t0")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        observe(self.name, time.perf_counter() - self._t0)
+        return False
+
+    def __call__(self, fn):
+        name = self.name
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                observe(name, time.perf_counter() - t0)
+        return wrapper
+
+
+def count(name: str, n: int = 1):
+    if not ENABLED:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + n
+
+
+# ------------------ por rerun ------------------
+@contextmanager
+def rerun(name: str = "rerun"):
+    """Junta os spans do rerun (mesma thread/contexto) e mede o total em `name`."""
+    spans: list = []
+    token = _current.set(spans)
+    t0 = time.perf_counter()
+    try:
+        yield spans
+    finally:
+        observe(name, time.perf_counter() - t0)  # o total também entra na lista do rerun
+        _current.reset(token)
+
+
+def begin_rerun() -> tuple:
+    """Versão sem `with` (script do Streamlit): devolve o estado para `end_rerun`."""
+    spans: list = []
+    return _current.set(spans), spans, time.perf_counter()
+
+
+def end_rerun(state: tuple, name: str = "rerun") -> list:
+    token, spans, t0 = state
+    observe(name, time.perf_counter() - t0)
+    try:
+        _current.reset(token)
+    except ValueError:
+        _current.set(None)  # outro contexto: só desliga a coleta
+    return spans
+
+
+# ------------------ agregados do processo ------------------
+def _quantile(sorted_values, q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    i = min(len(sorted_values) - 1, max(0, round(q * (len(sorted_values) - 1))))
+    return sorted_values[i]
+
+
+def summary() -> list[dict]:
+    """Por span: quantidade, soma, p50, p95 e máx (das últimas RESERVOIR medições)."""
+    with _lock:
+        items = [(name, sorted(d), *_totals[name]) for name, d in _durations.items()]
+    return [{"span": name, "n": n, "total_s": total,
+             "p50_s": _quantile(vals, 0.5), "p95_s": _quantile(vals, 0.95), "max_s": vals[-1] if vals else 0.0}
+            for name, vals, n, total in sorted(items)]
+
+
+def counters() -> dict[str, int]:
+    with _lock:
+        return dict(sorted(_counters.items()))
+
+
+def reset():
+    with _lock:
+        _durations.clear()
+        _totals.clear()
+        _counters.clear()
+
+
+def is_admin(token: str | None) -> bool:
+    return bool(ADMIN_TOKEN) and hmac.compare_digest(str(token or ""), ADMIN_TOKEN)
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def prometheus(prefix: str = "dashboard") -> str:
+    """Formato texto do Prometheus: um summary para os spans, um counter para os contadores."""
+    lines = [f"# HELP {prefix}_span_seconds Duração dos trechos instrumentados.",
+             f"# TYPE {prefix}_span_seconds summary"]
+    for s in summary():
+        lbl = f'span="{_label(s["span"])}"'
+        lines.append(f'{prefix}_span_seconds{{{lbl},quantile="0.5"}} {s["p50_s"]:.6f}')
+        lines.append(f'{prefix}_span_seconds{{{lbl},quantile="0.95"}} {s["p95_s"]:.6f}')
+        lines.append(f'{prefix}_span_seconds_sum{{{lbl}}} {s["total_s"]:.6f}')
+        lines.append(f'{prefix}_span_seconds_count{{{lbl}}} {s["n"]}')
+    lines += [f"# HELP {prefix}_events_total Contadores (acertos/erros de cache etc.).",
+              f"# TYPE {prefix}_events_total counter"]
+    for name, n in counters().items():
+        lines.append(f'{prefix}_events_total{{name="{_label(name)}"}} {n}')
+    return "\n".join(lines) + "\n"
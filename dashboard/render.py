@@ -0,0 +1,84 @@
+# =========================================================
+# HTML dos cartões de locais (lista de manutenção / offline)
+# Montado de forma vetorizada e enviado em poucos blocos, em vez de
+# um st.markdown por local.
+# =========================================================
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from dashboard.sheet import site_key
+
+CHUNK_SIZE = 250   # cartões por elemento st.markdown
+PAGE_SIZE = 500    # acima disso a lista é paginada (limita o DOM do navegador)
+
+
+def _text(s: pd.Series) -> pd.Series:
+    return pd.Series(s.to_numpy(dtype=object), dtype=object).astype(str)
+
+
+def site_cards(rows: pd.DataFrame, kind: str) -> pd.Series:
+    """
+    Um cartão `local-card` por linha, na ordem de `rows`.
+    kind: "cam" (FALTANDO n) ou "alm" (PARCIAL (on/total)).
+    Mesmo HTML do laço original (inclusive o `chip` de status).
+    """
+    prefix = "Cam" if kind == "cam" else "Alm"
+    off = rows[f"{prefix}_OfflineBool"].to_numpy(dtype=bool)
+    total = _text(rows[f"{prefix}_Total"])
+    online = _text(rows[f"{prefix}_Online"])
+    if kind == "cam":
+        partial = "FALTANDO " + _text(rows["Cam_Falta"])
+    else:
+        partial = "PARCIAL (" + online + "/" + total + ")"
+    status = pd.Series(np.where(off, "OFFLINE", partial.to_numpy()), dtype=object)
+    cls = pd.Series(np.where(off, "offline", ""), dtype=object)
+    chip_cls = pd.Series(np.where(off, "off", "warn"), dtype=object)
+    return ("<div class='local-card " + cls + "'>"
+            "<div class='local-title'>📍 " + _text(site_key(rows)) + " — "
+            "<span class='chip " + chip_cls + "'>" + status + "</span></div>"
+            "<div class='local-info'>Total: " + total + " • Online: " + online + "</div>"
+            "</div>")
+
+
+def chunks(cards: pd.Series, size: int = CHUNK_SIZE) -> list[str]:
+    """Concatena os cartões em blocos de `size` (um elemento Streamlit cada)."""
+    values = cards.tolist()
+    return ["".join(values[i:i + size]) for i in range(0, len(values), size)]
+
+
+# ------------------ painel "mudanças desde a última atualização" ------------------
+def _change_text(ev: np.ndarray, delta: np.ndarray, nome: str) -> tuple[np.ndarray, np.ndarray]:
+    d = pd.Series(delta, dtype="int64").astype(str).to_numpy(dtype=object)
+    text = np.select(
+        [ev == "offline", ev == "recuperado", ev == "piorou", ev == "melhorou", ev == "novo", ev == "removido"],
+        [f"{nome} OFFLINE", f"{nome} recuperadas", "+" + d + f" {nome} faltando", d + f" {nome} faltando",
+         "novo local", "removido da planilha"],
+        "",
+    )
+    cls = np.select([np.isin(ev, ["offline", "piorou", "removido"]), np.isin(ev, ["recuperado", "melhorou"])],
+                    ["off", "ok"], "warn")
+    return text, cls
+
+
+def change_items(changes: pd.DataFrame, limit: int = 200) -> str:
+    """Lista compacta de mudanças (um bloco HTML); mostra até `limit` locais."""
+    shown = changes.iloc[:limit]
+    cam_ev = shown["Cam_Evento"].astype(str).to_numpy()
+    alm_ev = shown["Alm_Evento"].astype(str).to_numpy()
+    cam_txt, cam_cls = _change_text(cam_ev, shown["Cam_Delta"].to_numpy(), "câmeras")
+    alm_txt, alm_cls = _change_text(alm_ev, shown["Alm_Delta"].to_numpy(), "alarmes")
+    # novo/removido vale para o local todo: um chip só
+    alm_txt = np.where(np.isin(cam_ev, ["novo", "removido"]), "", alm_txt)
+
+    def chips(txt, cls):
+        return pd.Series(np.where(txt != "", "<span class='chip " + cls.astype(object) + "'>" + txt.astype(object) + "</span> ", ""),
+                         dtype=object)
+
+    lines = ("<div class='local-info'>📍 " + _text(shown["Local"]) + " — " +
+             chips(cam_txt, cam_cls) + chips(alm_txt, alm_cls) + "</div>")
+    html = "".join(lines.tolist())
+    if len(changes) > limit:
+        html += f"<div class='local-info'>… e mais {len(changes) - limit} locais.</div>"
+    return html
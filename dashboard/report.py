@@ -0,0 +1,184 @@
+# =========================================================
+# Relatório PDF de locais para manutenção
+# - montagem fora da thread do script (pool de workers) com progresso
+# - cache por (versão da planilha, operador, filtro)
+# - tabela em blocos: milhares de linhas com memória/tempo limitados
+# =========================================================
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from io import BytesIO
+
+import pandas as pd
+import pytz
+
+from dashboard import metrics
+from dashboard.config import CLR_BLUE, TIMEZONE
+from dashboard.sheet import REGION_COLUMN, site_key
+
+TABLE_CHUNK = 200      # linhas por Table do ReportLab (~4 páginas)
+CACHE_SIZE = 32        # relatórios prontos guardados por processo
+MAX_WORKERS = 2
+
+HEADER = ["Local", "Câmeras Offline", "Alarmes Offline"]
+CLR_HEADER = CLR_BLUE  # azul da logo
+
+
+def report_table(faltando: pd.DataFrame) -> pd.DataFrame:
+    """Locais com câmeras/alarmes faltando, nas colunas do relatório."""
+    table = faltando.loc[:, ["Local", "Cam_Falta", "Alm_Falta"]].rename(
+        columns={"Cam_Falta": "Câmeras Offline", "Alm_Falta": "Alarmes Offline"}
+    )
+    if REGION_COLUMN in faltando.columns:
+        table["Local"] = site_key(faltando).to_numpy()
+    return table
+
+
+def _rows(table_df: pd.DataFrame) -> list[list]:
+    return [list(r) for r in zip(table_df["Local"].astype(str).tolist(),
+                                 table_df["Câmeras Offline"].astype("int64").tolist(),
+                                 table_df["Alarmes Offline"].astype("int64").tolist())]
+
+
+def _col_widths(rows: list[list]) -> list[float]:
+    """
+    Larguras fixas para que todos os blocos da tabela fiquem alinhados
+    (equivalente ao auto-dimensionamento do ReportLab: maior texto + padding).
+    """
+    from reportlab.pdfbase.pdfmetrics import stringWidth
+
+    longest = sorted((r[0] for r in rows), key=len, reverse=True)[:50]
+    local_w = max([stringWidth(s, "Helvetica", 10) for s in longest] + [stringWidth(HEADER[0], "Helvetica-Bold", 11)])
+    widths = [local_w]
+    for i, h in enumerate(HEADER[1:], start=1):
+        num_w = stringWidth(str(max((r[i] for r in rows), default=0)), "Helvetica", 10)
+        widths.append(max(num_w, stringWidth(h, "Helvetica-Bold", 11)))
+    return [w + 12 for w in widths]
+
+
+@metrics.span("pdf")
+def build_pdf(table_df: pd.DataFrame, operador: str, logo: bytes | str | None = None,
+              generated_at: datetime | None = None, chunk_rows: int = TABLE_CHUNK,
+              progress=None) -> bytes:
+    """
+    Monta o PDF (mesmo layout do relatório original).
+    `logo`: caminho do arquivo ou bytes da imagem. `progress(fração)` é
+    chamado durante a montagem.
+    """
+    from reportlab.lib.pagesizes import A4
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
+    from reportlab.lib import colors
+    from reportlab.lib.styles import getSampleStyleSheet
+
+    report = progress or (lambda _f: None)
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4)
+    styles = getSampleStyleSheet()
+    elements = []
+
+    try:
+        if isinstance(logo, (bytes, bytearray)):
+            im = Image(BytesIO(logo), width=120, height=84)
+        elif logo:
+            im = Image(logo, width=120, height=84)  # preserva proporção
+        else:
+            im = None
+        if im:
+            im.hAlign = "CENTER"
+            elements.append(im)
+            elements.append(Spacer(1, 8))
+    except Exception:
+        pass
+
+    elements.append(Paragraph("<b>Relatório de locais para manutenção</b>", styles["Title"]))
+    elements.append(Spacer(1, 10))
+    gerado = generated_at or datetime.now(pytz.timezone(TIMEZONE))
+    elements.append(Paragraph(f"Gerado em: {gerado.strftime('%d/%m/%Y %H:%M')}", styles["Normal"]))
+    elements.append(Paragraph(f"<b>Plantão - {operador}</b>", styles["Normal"]))
+    elements.append(Spacer(1, 12))
+
+    style = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor(CLR_HEADER)),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 11),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+    ])
+    rows = _rows(table_df)
+    if len(rows) <= chunk_rows:
+        elements.append(Table([HEADER] + rows, repeatRows=1, style=style))
+    else:
+        # vários Tables com cabeçalho repetido: o ReportLab dimensiona e quebra
+        # cada bloco isoladamente em vez de uma tabela gigante
+        widths = _col_widths(rows)
+        for start in range(0, len(rows), chunk_rows):
+            elements.append(Table([HEADER] + rows[start:start + chunk_rows], colWidths=widths,
+                                  repeatRows=1, style=style))
+    report(0.2)
+
+    est = {"size": 1}
+    def on_build(kind, value):
+        if kind == "SIZE_EST":
+            est["size"] = max(value, 1)
+        elif kind == "PROGRESS":
+            report(0.2 + 0.8 * min(value / est["size"], 1.0))
+    doc.setProgressCallBack(on_build)
+    doc.build(elements)
+    report(1.0)
+    return buffer.getvalue()
+
+
+class ReportJob:
+    """Relatório em andamento/pronto; `progress` vai de 0 a 1."""
+
+    def __init__(self, generated_at: datetime | None = None):
+        self.progress = 0.0
+        self.generated_at = generated_at  # "Gerado em" impresso no PDF
+        self.future: Future | None = None
+
+    def done(self) -> bool:
+        return self.future.done()
+
+    def result(self, timeout: float | None = None) -> bytes:
+        return self.future.result(timeout)
+
+
+class ReportService:
+    """
+    Pool de workers + cache de relatórios. Pedir de novo a mesma chave
+    (mesma versão da planilha, operador e filtro) devolve o mesmo job,
+    pronto ou em andamento – nada é refeito a cada rerun. O "Gerado em"
+    do PDF é o da primeira montagem (`job.generated_at`).
+    """
+
+    def __init__(self, max_workers: int = MAX_WORKERS, cache_size: int = CACHE_SIZE):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="relatorio")
+        self._jobs: OrderedDict[tuple, ReportJob] = OrderedDict()
+        self._lock = threading.Lock()
+        self.cache_size = cache_size
+
+    def submit(self, key: tuple, table_df: pd.DataFrame, operador: str, logo=None, **kwargs) -> ReportJob:
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None and not (job.done() and job.future.exception() is not None):
+                self._jobs.move_to_end(key)
+                metrics.count("pdf.acerto")
+                return job
+            metrics.count("pdf.falta")
+            kwargs.setdefault("generated_at", datetime.now(pytz.timezone(TIMEZONE)))
+            job = ReportJob(kwargs["generated_at"])
+            def _progress(f):
+                job.progress = f
+            job.future = self._pool.submit(build_pdf, table_df, operador, logo, progress=_progress, **kwargs)
+            self._jobs[key] = job
+            while len(self._jobs) > self.cache_size:
+                self._jobs.popitem(last=False)
+            return job
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,136 @@
+# =========================================================
+# Índice de busca Local + Apelido
+# - chaves pré-normalizadas (minúsculas e sem acento) montadas 1x por carga
+# - índice de trigramas: a consulta só verifica as linhas candidatas
+# - modos opcionais: ignorar acentos e busca aproximada (erros de digitação)
+# =========================================================
+from __future__ import annotations
+
+import unicodedata
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+from dashboard.metrics import span
+
+GRAM = 3
+FUZZY_THRESHOLD = 0.5   # fração mínima de trigramas da consulta presentes no local
+FUZZY_RELATIVE = 0.8    # ... e pelo menos esta fração da pontuação do melhor candidato
+_SEP = "\x00"           # separa Local e Apelido na chave combinada (nunca aparece na consulta)
+
+
+def fold(text: str) -> str:
+    """Minúsculas e sem acentos: 'São João' -> 'sao joao'."""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def _grams(text: str) -> set[str]:
+    return {text[i:i + GRAM] for i in range(len(text) - GRAM + 1)}
+
+
+def _keys(col: pd.Series) -> np.ndarray:
+    # Apelido/Local vazio vira chave "" e nunca casa. A busca original fazia
+    # `astype(str)` antes do `str.contains(..., na=False)`; no pandas < 3 isso
+    # transformava o nulo no texto "nan" e consultas como "na"/"an" traziam
+    # todos os locais sem apelido. Aqui isso não acontece, em qualquer versão.
+    nulls = col.isna().to_numpy()
+    return np.array(["" if n else str(v).lower() for v, n in zip(col.to_numpy(dtype=object), nulls)],
+                    dtype=object)
+
+
+class SearchIndex:
+    """
+    Construído uma vez por versão da planilha; `search` devolve as posições
+    (em ordem) das linhas cujo Local ou Apelido contém a consulta – mesma
+    regra da busca original (`str.lower().str.contains`), tratando a
+    consulta como texto literal.
+    """
+
+    @span("busca_texto.indice")
+    def __init__(self, df: pd.DataFrame):
+        self.size = len(df)
+        self.local = _keys(df["Local"])
+        self.apelido = _keys(df["Apelido"])
+        fold_cache: dict[str, str] = {}
+        def _fold(s):
+            f = fold_cache.get(s)
+            if f is None:
+                f = fold_cache[s] = fold(s)
+            return f
+        self.local_f = np.array([_fold(s) for s in self.local], dtype=object)
+        self.apelido_f = np.array([_fold(s) for s in self.apelido], dtype=object)
+        # mesmas chaves como Series de texto: consultas curtas (muitos candidatos)
+        # são verificadas de forma vetorizada em vez de linha a linha
+        self._series = {False: (pd.Series(self.local, dtype=str), pd.Series(self.apelido, dtype=str)),
+                        True: (pd.Series(self.local_f, dtype=str), pd.Series(self.apelido_f, dtype=str))}
+
+        # trigramas da chave combinada sem acento: serve aos dois modos, pois
+        # se a linha contém o termo, a versão sem acento contém o termo sem acento
+        postings = defaultdict(list)
+        for i, (l, a) in enumerate(zip(self.local_f, self.apelido_f)):
+            for g in _grams(l + _SEP + a):
+                postings[g].append(i)
+        self._postings = {g: np.asarray(rows, dtype=np.int32) for g, rows in postings.items()}
+        self._all = np.arange(self.size)
+
+    def _candidates(self, folded: str) -> np.ndarray:
+        grams = _grams(folded)
+        if not grams:
+            return self._all
+        lists = []
+        for g in grams:
+            rows = self._postings.get(g)
+            if rows is None:
+                return self._all[:0]
+            lists.append(rows)
+        lists.sort(key=len)
+        cand = lists[0]
+        for rows in lists[1:]:
+            cand = np.intersect1d(cand, rows, assume_unique=True)
+            if not len(cand):
+                break
+        return cand
+
+    def search(self, query: str, accents: bool = False, fuzzy: bool = False) -> np.ndarray:
+        termo = query.strip().lower()
+        if not termo:
+            return self._all
+        folded = fold(termo)
+        if accents:
+            local, apelido, needle = self.local_f, self.apelido_f, folded
+        else:
+            local, apelido, needle = self.local, self.apelido, termo
+
+        cand = self._candidates(folded)
+        if len(cand) > self.size // 4:
+            ls, ap = self._series[accents]
+            m = ls.str.contains(needle, regex=False).to_numpy() | ap.str.contains(needle, regex=False).to_numpy()
+            hits = np.flatnonzero(m)
+        else:
+            hits = np.fromiter((i for i in cand if needle in local[i] or needle in apelido[i]),
+                               dtype=np.int64, count=-1) if len(cand) else self._all[:0]
+        if fuzzy:
+            hits = np.union1d(hits, self._fuzzy(folded))
+        return hits
+
+    def _fuzzy(self, folded: str, threshold: float = FUZZY_THRESHOLD) -> np.ndarray:
+        """
+        Linhas que contêm pelo menos `threshold` dos trigramas da consulta e
+        estão próximas do melhor candidato (evita trazer a lista inteira
+        quando os nomes têm muito em comum).
+        """
+        grams = _grams(folded)
+        lists = [self._postings[g] for g in grams if g in self._postings]
+        if len(grams) < 2 or not lists:
+            return self._all[:0]
+        counts = np.bincount(np.concatenate(lists), minlength=self.size)
+        cutoff = max(threshold * len(grams), FUZZY_RELATIVE * counts.max())
+        return np.flatnonzero(counts >= cutoff)
+
+    def filter(self, df: pd.DataFrame, query: str, accents: bool = False, fuzzy: bool = False) -> pd.DataFrame:
+        if not query.strip():
+            return df
+        with span("busca_texto"):
+            return df.iloc[self.search(query, accents=accents, fuzzy=fuzzy)]
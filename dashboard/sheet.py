@@ -0,0 +1,186 @@
+# =========================================================
+# Leitura e normalização da planilha de CFTV & Alarmes
+# =========================================================
+from __future__ import annotations
+
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+from dashboard.metrics import span
+
+# Colunas A–H da planilha (a H – Apelido – pode não ter cabeçalho)
+COLUMNS = ["Local", "Cam_Total", "Cam_Online", "Cam_Status",
+           "Alm_Total", "Alm_Online", "Alm_Status", "Apelido"]
+COUNT_COLUMNS = ["Cam_Total", "Cam_Online", "Alm_Total", "Alm_Online"]
+SUMMARY_ROWS = "TOTAL|RELATÓRIO|RELATORIO"
+SENTINELS = ("OFFLINE", "SEM ALARME", "SEM CAMERAS", "SEM CÂMERAS")
+REGION_COLUMN = "Regiao"  # só existe quando há várias planilhas (dashboard.sources)
+FALTA_COLUMNS = ["Cam_Falta", "Alm_Falta"]
+TEXT_COLUMNS = ["Local", "Apelido"]
+STATUS_COLUMNS = ["Cam_Status", "Alm_Status"]
+CATEGORY_MAX_RATIO = 0.5  # texto vira categoria se tiver até esta fração de valores distintos
+
+# Incrementar sempre que a saída de `normalize` mudar (invalida snapshots em disco)
+NORMALIZE_VERSION = 3
+
+
+def site_key(df: pd.DataFrame) -> pd.Series:
+    """Identificador do local: `Local`, ou `Regiao / Local` com várias planilhas."""
+    local = df["Local"].astype(str)
+    if REGION_COLUMN in df.columns:
+        return df[REGION_COLUMN].astype(str) + " / " + local
+    return local
+
+
+def _to_int(x):
+    if pd.isna(x): return 0
+    s = str(x).strip().replace(",", ".").upper()
+    if s in SENTINELS: return 0
+    try: return int(float(s))
+    except: return 0
+
+
+_type_of = np.frompyfunc(type, 1, 1)
+_NUMBER_TYPES = np.array([int, float, np.int64, np.float64], dtype=object)
+
+
+def to_int(col: pd.Series) -> pd.Series:
+    """
+    `_to_int` aplicado à coluna inteira, sem laço Python por linha.
+
+    Células numéricas são truncadas direto no NumPy; só as células de
+    texto passam por strip/vírgula/upper + `pd.to_numeric`, e sentinelas
+    e nulos viram 0. O que sobrar (raríssimo: "1_000", dígitos não
+    latinos, datas...) passa pelo próprio `_to_int`, garantindo
+    resultado idêntico ao original.
+    """
+    out = np.zeros(len(col), dtype=np.int64)
+    if col.dtype.kind in "iuf":
+        vals = col.to_numpy(dtype=float, na_value=np.nan)
+        ok = np.isfinite(vals)
+        out[ok] = np.trunc(vals[ok])
+        return pd.Series(out, index=col.index)
+
+    arr = col.to_numpy(dtype=object)
+    number = np.isin(_type_of(arr), _NUMBER_TYPES) if len(arr) else np.zeros(0, dtype=bool)
+    vals = arr[number].astype(float)
+    ok = np.isfinite(vals)
+    idx = np.flatnonzero(number)
+    out[idx[ok]] = np.trunc(vals[ok])
+
+    idx = np.flatnonzero(~number & ~pd.isna(arr))
+    if len(idx):
+        txt = pd.Series(arr[idx], dtype=object).astype(str).str.strip() \
+                .str.replace(",", ".", regex=False).str.upper()
+        num = pd.to_numeric(txt, errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+        ok = np.isfinite(num)
+        out[idx[ok]] = np.trunc(num[ok])
+        rest = ~ok & ~txt.isin(SENTINELS).to_numpy()
+        if rest.any():
+            out[idx[rest]] = [_to_int(v) for v in arr[idx[rest]]]
+    return pd.Series(out, index=col.index)
+
+
+def _labels(fixed, partial_key, partial_label, tot, on) -> pd.Categorical:
+    """
+    Status via `np.select` sobre códigos inteiros. Os rótulos variáveis
+    ("FALTANDO 3", "PARCIAL (1/2)") são gerados uma vez por valor distinto,
+    não por linha.
+    """
+    tot = np.asarray(tot); on = np.asarray(on)
+    partial = (tot != 0) & (on != 0) & (on < tot)
+    codes = np.select([tot == 0, on == 0, partial], [0, 1, 3], 2)
+    keys, inverse = np.unique(partial_key[partial], axis=0, return_inverse=True)
+    codes[partial] = 3 + inverse.reshape(-1)
+    categories = list(fixed) + [partial_label(k) for k in keys]
+    return pd.Categorical.from_codes(codes, categories=categories)
+
+
+def cam_status(tot, on, falta) -> pd.Categorical:
+    falta = np.asarray(falta)
+    return _labels(("SEM CÂMERAS", "OFFLINE", "OK"), falta, lambda k: f"FALTANDO {int(k)}", tot, on)
+
+
+def alm_status(tot, on) -> pd.Categorical:
+    pairs = np.column_stack([np.asarray(on), np.asarray(tot)])
+    return _labels(("SEM ALARME", "OFFLINE", "100%"), pairs,
+                   lambda k: f"PARCIAL ({int(k[0])}/{int(k[1])})", tot, on)
+
+
+@span("leitura.read_excel")
+def read_sheet(content: bytes) -> pd.DataFrame:
+    """Lê o .xlsx bruto (sem cabeçalho), como veio do Drive."""
+    return pd.read_excel(BytesIO(content), header=None)
+
+
+@span("leitura.normalizacao")
+def normalize(raw: pd.DataFrame) -> pd.DataFrame:
+    # <<< agora traz até H (8 colunas) e garante Apelido se faltar >>>
+    raw = raw.dropna(how="all").iloc[:, 0:8]
+    if raw.shape[1] < 8:
+        raw[7] = ""  # cria coluna H vazia se a planilha vier só até G
+
+    raw.columns = COLUMNS
+    raw = raw.dropna(subset=["Local"])
+    raw = raw[~raw["Local"].astype(str).str.contains(SUMMARY_ROWS, case=False, na=False)]
+    for c in COUNT_COLUMNS:
+        raw[c] = to_int(raw[c])
+    raw["Cam_Falta"] = (raw["Cam_Total"] - raw["Cam_Online"]).clip(lower=0)
+    raw["Alm_Falta"] = (raw["Alm_Total"] - raw["Alm_Online"]).clip(lower=0)
+    raw["Cam_OfflineBool"] = (raw["Cam_Total"]>0) & (raw["Cam_Online"]==0)
+    raw["Alm_OfflineBool"] = (raw["Alm_Total"]>0) & (raw["Alm_Online"]==0)
+    raw["Cam_Status"] = cam_status(raw["Cam_Total"], raw["Cam_Online"], raw["Cam_Falta"])
+    raw["Alm_Status"] = alm_status(raw["Alm_Total"], raw["Alm_Online"])
+    return compact(raw.reset_index(drop=True))
+
+
+def _readonly(arr):
+    arr = np.asarray(arr)
+    arr.flags.writeable = False
+    return arr
+
+
+def compact(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Representação compacta e somente leitura do DataFrame normalizado,
+    compartilhada entre sessões (cache_resource) sem cópia por sessão:
+    - contagens no menor inteiro que cabe (uint8/uint16..., com sinal só
+      se houver negativo) – quem subtrai converte para int64 antes
+    - Local/Apelido como categoria quando há muita repetição (Apelido vazio,
+      Local repetido); status e Regiao sempre como categoria
+    - OfflineBool seguem bool (1 byte, usados direto como máscara)
+    - arrays NumPy marcados como somente leitura: escrita acidental num
+      DataFrame compartilhado vira erro em vez de vazar para outra sessão
+    """
+    cols = {}
+    for name in df.columns:
+        s = df[name]
+        if name in COUNT_COLUMNS or name in FALTA_COLUMNS:
+            signed = len(s) > 0 and s.min() < 0
+            s = pd.to_numeric(s, downcast="integer" if signed else "unsigned")
+        elif name in STATUS_COLUMNS or name == REGION_COLUMN:
+            if not isinstance(s.dtype, pd.CategoricalDtype):
+                s = s.astype("category")
+        elif name in TEXT_COLUMNS and not isinstance(s.dtype, pd.CategoricalDtype):
+            if len(s) and s.nunique() <= len(s) * CATEGORY_MAX_RATIO:
+                s = s.astype("category")
+        if s.dtype.kind in "biuf":
+            s = _readonly(s.to_numpy())
+        cols[name] = s
+    out = pd.DataFrame(cols, index=df.index, copy=False)
+    out.attrs.update(df.attrs)
+    return out
+
+
+def parse_sheet(content: bytes) -> pd.DataFrame:
+    """
+    Bytes do .xlsx -> DataFrame normalizado usado por todas as abas.
+    Planilhas grandes são lidas em fluxo (dashboard/ingest.py), com o mesmo resultado.
+    """
+    from dashboard.ingest import stream_sheet, use_stream
+
+    if use_stream(content):
+        return normalize(stream_sheet(content))
+    return normalize(read_sheet(content))
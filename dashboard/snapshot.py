@@ -0,0 +1,158 @@
+# =========================================================
+# Snapshot colunar em disco do DataFrame normalizado
+# - uma pasta por versão da planilha (sha256 + versão da normalização)
+# - um .npy por coluna; as numéricas são lidas com mmap, sem cópia:
+#   reinícios e novas réplicas carregam em milissegundos e só relêem o
+#   Excel se a planilha mudar
+# =========================================================
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_DIR = Path(os.environ.get("DASHBOARD_CACHE_DIR",
+                                  Path(__file__).resolve().parent.parent / ".cache")) / "snapshots"
+DEFAULT_KEEP = int(os.environ.get("DASHBOARD_SNAPSHOT_KEEP", "8"))
+
+FORMAT_VERSION = 1
+_META = "meta.json"
+
+
+class SnapshotStore:
+    """
+    Grava/lê DataFrames normalizados como colunas NumPy.
+
+    Colunas numéricas e booleanas viram .npy puros, lidos com mmap e
+    usados direto pelo DataFrame (um bloco por coluna); textos viram
+    arrays unicode de largura fixa (+ máscara de nulos) e categorias
+    guardam códigos + categorias. Qualquer outra coisa cai num .npy de
+    objetos (sem mmap), para nunca perder informação.
+    """
+
+    def __init__(self, root: str | Path = DEFAULT_DIR, keep: int = DEFAULT_KEEP):
+        self.root = Path(root)
+        self.keep = keep
+
+    def path_for(self, key: str) -> Path:
+        return self.root / key
+
+    # ------------------ leitura ------------------
+    def load(self, key: str, mmap: bool = True) -> pd.DataFrame | None:
+        folder = self.path_for(key)
+        try:
+            meta = json.loads((folder / _META).read_text(encoding="utf-8"))
+            if meta.get("format") != FORMAT_VERSION:
+                return None
+            mode = "r" if mmap else None
+            cols = {}
+            for i, spec in enumerate(meta["columns"]):
+                cols[spec["name"]] = _decode(folder, i, spec, mode)
+            # sem consolidar: juntar as colunas num bloco copiaria o mmap para a memória
+            df = pd.DataFrame(cols, index=pd.RangeIndex(meta["rows"]), copy=False)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # snapshot corrompido/incompatível: descarta e deixa reprocessar
+            shutil.rmtree(folder, ignore_errors=True)
+            return None
+        df.attrs.update(meta.get("attrs", {}))
+        try:
+            os.utime(folder)  # marca como usado (poda por LRU)
+        except OSError:
+            pass
+        return df
+
+    # ------------------ escrita ------------------
+    def save(self, key: str, df: pd.DataFrame) -> bool:
+        """Grava de forma atômica; falha de disco não derruba o app."""
+        folder = self.path_for(key)
+        if (folder / _META).exists():
+            return True
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            tmp = Path(tempfile.mkdtemp(prefix=f".{key}.", dir=self.root))
+            try:
+                specs = [_encode(tmp, i, name, df[name]) for i, name in enumerate(df.columns)]
+                meta = {"format": FORMAT_VERSION, "rows": len(df), "columns": specs,
+                        "attrs": {k: v for k, v in df.attrs.items() if isinstance(v, (str, int, float, bool))}}
+                (tmp / _META).write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8")
+                os.replace(tmp, folder)
+            except OSError:
+                if (folder / _META).exists():  # outra réplica gravou antes
+                    return True
+                raise
+            finally:
+                shutil.rmtree(tmp, ignore_errors=True)
+        except Exception:
+            return False
+        self.prune()
+        return True
+
+    def prune(self):
+        """Mantém apenas os `keep` snapshots usados mais recentemente."""
+        try:
+            folders = [p for p in self.root.iterdir() if p.is_dir() and not p.name.startswith(".")]
+        except OSError:
+            return
+        folders.sort(key=lambda p: p.stat().st_mtime, reverse=True)
+        for old in folders[self.keep:]:
+            shutil.rmtree(old, ignore_errors=True)
+
+
+def snapshot_key(digest: str, version: int | str) -> str:
+    return f"{digest}-v{version}"
+
+
+# ------------------ codificação por coluna ------------------
+def _encode(folder: Path, i: int, name: str, s: pd.Series) -> dict:
+    spec = {"name": name, "dtype": str(s.dtype)}
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        spec["kind"] = "category"
+        spec["ordered"] = bool(s.cat.ordered)
+        np.save(folder / f"{i}.codes.npy", s.cat.codes.to_numpy())
+        spec["categories"] = _encode(folder, f"{i}.cats", "", pd.Series(s.cat.categories))
+        return spec
+    if s.dtype.kind in "biuf":
+        spec["kind"] = "numpy"
+        np.save(folder / f"{i}.npy", s.to_numpy())
+        return spec
+
+    values = s.to_numpy(dtype=object)
+    nulls = pd.isna(values)
+    present = values[~nulls]
+    if all(type(v) is str for v in present):
+        spec["kind"] = "text"
+        filled = np.where(nulls, "", values)
+        np.save(folder / f"{i}.npy", filled.astype(str) if len(filled) else np.array([], dtype="U1"))
+        if nulls.any():
+            np.save(folder / f"{i}.nulls.npy", nulls)
+            spec["nulls"] = True
+        return spec
+
+    spec["kind"] = "object"
+    np.save(folder / f"{i}.npy", values, allow_pickle=True)
+    return spec
+
+
+def _decode(folder: Path, i, spec: dict, mode):
+    kind = spec["kind"]
+    if kind == "numpy":
+        # ndarray comum sobre o mapeamento (np.memmap vazaria para os resultados)
+        return np.asarray(np.load(folder / f"{i}.npy", mmap_mode=mode))
+    if kind == "category":
+        codes = np.load(folder / f"{i}.codes.npy")
+        cats = _decode(folder, f"{i}.cats", spec["categories"], None)
+        dtype = pd.CategoricalDtype(pd.Index(cats), ordered=spec["ordered"])
+        return pd.Categorical.from_codes(codes, dtype=dtype)
+    if kind == "text":
+        arr = np.load(folder / f"{i}.npy", mmap_mode=mode).astype(object)
+        if spec.get("nulls"):
+            arr[np.load(folder / f"{i}.nulls.npy")] = np.nan
+        return pd.Series(arr, dtype=spec["dtype"] if spec["dtype"] != "object" else object)
+    return np.load(folder / f"{i}.npy", allow_pickle=True)
@@ -0,0 +1,258 @@
+# =========================================================
+# Várias planilhas regionais (mesmo formato) num único DataFrame
+# - lista de origens em DASHBOARD_SOURCES ou DASHBOARD_SOURCES_FILE
+# - busca + leitura em paralelo (threads), uma origem por tarefa
+# - cada linha ganha a coluna `Regiao`; o DataFrame unido tem uma versão
+#   própria (hash das versões das origens)
+# - origem com falha não trava as outras: entra a última versão boa
+#   (em memória ou o snapshot em disco apontado por .fontes/)
+# =========================================================
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from dashboard.data import origin_key, parse_version, record_history, snapshots
+from dashboard.fetch import fetcher_for, is_url
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+MAX_WORKERS = int(os.environ.get("DASHBOARD_SOURCES_WORKERS", "8"))
+MERGED_CACHE = 4   # DataFrames unidos guardados (por combinação de versões)
+
+
+@dataclass(frozen=True)
+class Source:
+    name: str          # região (vazio = origem única, sem coluna Regiao)
+    location: str      # URL ou caminho do .xlsx
+
+
+@dataclass(frozen=True)
+class SourceResult:
+    source: Source
+    version: str | None
+    rows: int
+    fetch_s: float
+    parse_s: float
+    status: str                  # "ok" | "desatualizada" | "snapshot" | "erro"
+    error: str | None = None
+    df: "pd.DataFrame | None" = field(default=None, repr=False)
+
+
+@dataclass(frozen=True)
+class MultiLoad:
+    df: "pd.DataFrame"
+    version: str
+    results: list[SourceResult]
+
+    @property
+    def failed(self) -> list[SourceResult]:
+        return [r for r in self.results if r.status != "ok"]
+
+
+# ------------------ configuração ------------------
+def parse_sources(text: str) -> list[Source]:
+    """
+    Uma origem por linha (ou separadas por ';'): `Região = url_ou_arquivo`.
+    Sem `=`, o nome da região vem do arquivo. Linhas com # são ignoradas.
+    """
+    out = []
+    for item in text.replace(";", "\n").splitlines():
+        item = item.strip()
+        if not item or item.startswith("#"):
+            continue
+        # URL sem nome pode ter "=" na query string: não é separador
+        name, sep, loc = ("", "", item) if is_url(item) else item.partition("=")
+        if not sep:
+            name, loc = "", item
+        name, loc = name.strip(), loc.strip()
+        if not name:
+            name = "Drive" if is_url(loc) else Path(loc).stem
+        out.append(Source(name, loc))
+    return out
+
+
+def configured_origin(default: str):
+    """`default` (str) sem configuração; senão a tupla de origens (hashável, vira chave de cache)."""
+    sources = configured_sources(default)
+    return sources[0].location if len(sources) == 1 and not sources[0].name else tuple(sources)
+
+
+def configured_sources(default: str) -> list[Source]:
+    """Origens configuradas; sem configuração, só `default` (comportamento de sempre)."""
+    text = os.environ.get("DASHBOARD_SOURCES", "")
+    path = os.environ.get("DASHBOARD_SOURCES_FILE", "")
+    if path:
+        try:
+            text = Path(path).read_text(encoding="utf-8")
+        except OSError:
+            pass
+    sources = parse_sources(text) if text.strip() else []
+    return sources or [Source("", default)]
+
+
+# ------------------ última versão boa por origem ------------------
+def _pointer(location: str) -> Path:
+    h = hashlib.sha1(location.encode()).hexdigest()[:16]
+    return snapshots().root / ".fontes" / f"{h}.json"
+
+
+def _remember(location: str, digest: str):
+    p = _pointer(location)
+    try:
+        p.parent.mkdir(parents=True, exist_ok=True)
+        tmp = p.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({"fonte": location, "versao": digest, "ts": time.time()}), encoding="utf-8")
+        os.replace(tmp, p)
+    except OSError:
+        pass
+
+
+def _last_good(location: str):
+    """(versão, df) do último snapshot bom da origem, se ainda estiver em disco."""
+    from dashboard.sheet import NORMALIZE_VERSION
+    from dashboard.snapshot import snapshot_key
+
+    try:
+        digest = json.loads(_pointer(location).read_text(encoding="utf-8"))["versao"]
+    except (OSError, ValueError, KeyError):
+        return None, None
+    return digest, snapshots().load(snapshot_key(digest, NORMALIZE_VERSION))
+
+
+# ------------------ carga ------------------
+_parsed: dict[str, tuple] = {}   # origem -> (versão, df) da última leitura boa
+_parsed_lock = threading.Lock()
+
+
+def _fallback(source: Source, location: str, fetch_s: float, parse_s: float, error: str) -> SourceResult:
+    """Origem com falha (busca ou leitura): a última versão boa, em memória ou no disco."""
+    digest, df = _parsed.get(location) or _last_good(location)
+    if df is None:
+        return SourceResult(source, None, 0, fetch_s, parse_s, "erro", error)
+    return SourceResult(source, digest, len(df), fetch_s, parse_s, "snapshot", error, df)
+
+
+def load_one(source: Source, force: bool = False) -> SourceResult:
+    """Busca + leitura de uma origem; em falha, a última versão boa (memória ou disco)."""
+    location = source.location.strip()
+    t0 = time.perf_counter()
+    try:
+        res = fetcher_for(location).get(force=force)
+    except Exception as e:
+        return _fallback(source, location, time.perf_counter() - t0, 0.0, str(e))
+    t1 = time.perf_counter()
+    cached = _parsed.get(location)
+    if cached is not None and cached[0] == res.digest:
+        df = cached[1]
+    else:
+        try:
+            df = parse_version(res.digest, res.content)
+        except Exception as e:
+            # corpo que não é planilha (ex.: página HTML de cota do Drive)
+            return _fallback(source, location, t1 - t0, time.perf_counter() - t1, str(e))
+        with _parsed_lock:
+            _parsed[location] = (res.digest, df)
+        _remember(location, res.digest)
+    t2 = time.perf_counter()
+    return SourceResult(source, res.digest, len(df), t1 - t0, t2 - t1,
+                        "desatualizada" if res.stale else "ok", res.error, df)
+
+
+def _combine(versions: list[tuple], total: int) -> str:
+    if total == 1 and versions:
+        return versions[0][1]
+    h = hashlib.sha256()
+    for name, version in versions:
+        h.update(f"{name}={version};".encode())
+    return h.hexdigest()
+
+
+def combined_version(results) -> str:
+    """Versão do DataFrame unido; com uma origem só, a própria versão dela."""
+    return _combine([(r.source.name, r.version) for r in results if r.df is not None], len(results))
+
+
+def ready_version(sources) -> str | None:
+    """
+    Versão que `load_sources` devolveria agora, sem rede nem leitura: só
+    quando todas as origens estão no TTL do fetcher e já lidas em memória
+    (senão None e quem chama faz a carga completa fora do caminho quente).
+    """
+    versions = []
+    for s in sources:
+        location = s.location.strip()
+        f = fetcher_for(location)
+        cached = _parsed.get(location)
+        if not f.fresh or cached is None or cached[0] != f.result.digest:
+            return None
+        versions.append((s.name, cached[0]))
+    return _combine(versions, len(versions))
+
+
+def merge(results) -> "pd.DataFrame":
+    import numpy as np
+    import pandas as pd
+
+    from dashboard.sheet import REGION_COLUMN, compact
+
+    frames = [r for r in results if r.df is not None]
+    if len(results) == 1:
+        return frames[0].df if frames else pd.DataFrame()
+    if not frames:
+        return pd.DataFrame()
+    names = [r.source.name for r in frames]
+    df = pd.concat([r.df for r in frames], ignore_index=True)
+    region = np.repeat(np.array(names, dtype=object), [len(r.df) for r in frames])
+    df[REGION_COLUMN] = pd.Categorical(region, categories=list(dict.fromkeys(names)))
+    return compact(df)  # categorias diferentes por planilha viram texto no concat
+
+
+_merged: OrderedDict[str, "pd.DataFrame"] = OrderedDict()
+_merged_lock = threading.Lock()
+_pool: ThreadPoolExecutor | None = None
+
+
+def _executor() -> ThreadPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="fonte")
+    return _pool
+
+
+def load_sources(sources: list[Source], force: bool = False, history: bool = True) -> MultiLoad:
+    """Busca/lê todas as origens em paralelo e devolve o DataFrame unido."""
+    store = snapshots()
+    store.keep = max(store.keep, 2 * len(sources))  # a última versão boa de cada região fica em disco
+
+    if len(sources) == 1:
+        results = [load_one(sources[0], force)]
+    else:
+        results = list(_executor().map(lambda s: load_one(s, force), sources))
+    if all(r.df is None for r in results):
+        raise RuntimeError("; ".join(f"{r.source.name or r.source.location}: {r.error}" for r in results))
+
+    version = combined_version(results)
+    with _merged_lock:
+        df = _merged.get(version)
+        if df is not None:
+            _merged.move_to_end(version)
+    if df is None:
+        df = merge(results)
+        df.attrs["snapshot"] = version
+        with _merged_lock:
+            _merged[version] = df
+            while len(_merged) > MERGED_CACHE:
+                _merged.popitem(last=False)
+        if history:
+            record_history(version, df, origin_key(tuple(sources)))
+    return MultiLoad(df, version, results)
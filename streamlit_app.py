@@ -2,52 +2,33 @@
 # Dashboard Operacional – Grupo Perímetro 
 # CFTV & Alarmes
 # =========================================================
-import os, requests
 from datetime import datetime
-from io import BytesIO
-from pathlib import Path
 import pytz  # <-- horário de Brasília
 
 import streamlit as st
 import pandas as pd
-import numpy as np
-import plotly.express as px
+
+from dashboard import metrics
+from dashboard.aggregates import Aggregates, aggregate_cache, query_key
+from dashboard.alerts import watch as watch_alerts
+from dashboard.api import API_PORT, start_in_thread
+from dashboard.charts import BACKEND as CHART_BACKEND, bar_html, chart_cache
+from dashboard.assets import assets
+from dashboard.config import (DRIVE_URL, PLANILHA_PATH, TIMEZONE, CLR_BG, CLR_PANEL, CLR_TEXT, CLR_SUB,
+                              CLR_BORDER, CLR_BLUE, CLR_ORANGE, CLR_GREEN, CLR_RED)
+from dashboard.data import origin_key, parse_version, resolve_source
+from dashboard.diff import SnapshotTracker
+from dashboard.fetch import fetcher_for
+from dashboard.live import LIVE_SECONDS, poller_for
+from dashboard.sources import configured_origin, load_sources
+from dashboard.render import PAGE_SIZE, change_items, chunks, site_cards
+from dashboard.report import ReportService, report_table
+from dashboard.search import SearchIndex
 
 # ------------------ CONFIG ------------------
 st.set_page_config(page_title="Dashboard Operacional – CFTV & Alarmes",
                    page_icon="📹", layout="wide")
-
-# === NOVO: leitura direta do Excel no Google Drive ===
-DRIVE_FILE_ID = "1LofqwV9_fXfKAGbqjk2LEfgSQmJvUiuA"
-DRIVE_URL = f"https://drive.google.com/uc?export=download&id={DRIVE_FILE_ID}"
-
-PLANILHA = "dados.xlsx"           
-ROOT_PATH = Path(__file__).parent
-PLANILHA_PATH = ROOT_PATH / PLANILHA 
-
-# Logo somente do repositório / arquivo (Base64 teste)
-LOGO_FILE_CANDIDATES = [
-    "logo.png", "./logo.png", "/app/logo.png", "/mount/src/dashboard-cameras/logo.png",
-    "logo_perimetro.png", "./logo_perimetro.png"
-]
-LOGO_URL_RAW = "https://raw.githubusercontent.com/perimetro97/dashboard-cameras/main/logo.png"
-
-# Ícones na raiz do repositório
-ICON_CAMERA     = "camera.png"
-ICON_ALARME     = "alarme.png"
-ICON_ENGRENAGEM = "engrenagem.png"
-ICON_RELATORIO  = "relatorio.png"
-
-# Paleta (AZUL AJUSTADO PARA O TOM DA LOGO)
-CLR_BG     = "#F5F6FA"
-CLR_PANEL  = "#FFFFFF"
-CLR_TEXT   = "#111827"  # preto suave
-CLR_SUB    = "#6B7280"
-CLR_BORDER = "#E5E7EB"
-CLR_BLUE   = "#1B1F3B"   # Azul exato da logo (antes #0B66C3)
-CLR_ORANGE = "#F37021"   # Laranja institucional
-CLR_GREEN  = "#16A34A"   # OK
-CLR_RED    = "#E11D48"   # Offline
+_rerun = metrics.begin_rerun()  # tempos deste rerun (painel admin e /metrics)
 
 # ------------------ CSS ------------------
 st.markdown(f"""
@@ -131,113 +112,110 @@ st.markdown(f"""
 </style>
 """, unsafe_allow_html=True)
 
-# ------------------ LOGO (repositório/arquivo) ------------------
-def load_logo_bytes() -> bytes | None:
-    for p in LOGO_FILE_CANDIDATES:
-        if os.path.exists(p):
-            try:
-                with open(p, "rb") as f:
-                    return f.read()
-            except Exception:
-                pass
-    try:
-        r = requests.get(LOGO_URL_RAW, timeout=6)
-        if r.ok:
-            return r.content
-    except Exception:
-        pass
-    return None
-
 # ------------------ HELPERS ------------------
-def _to_int(x):
-    if pd.isna(x): return 0
-    s = str(x).strip().replace(",", ".").upper()
-    if s in ("OFFLINE", "SEM ALARME", "SEM CAMERAS", "SEM CÂMERAS"): return 0
-    try: return int(float(s))
-    except: return 0
-
-@st.cache_data(show_spinner=False)
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _parse_sheet(digest: str, _content: bytes, source: str) -> pd.DataFrame:
+    """
+    Converte o .xlsx já baixado no DataFrame normalizado.
+    O cache é pela versão (`digest`): planilha inalterada não é reprocessada.
+    Fora da memória, tenta o snapshot em disco antes de reler o Excel.
+    Um único DataFrame compacto e somente leitura para todas as sessões
+    (cache_data faria uma cópia serializada por sessão) – o mesmo objeto
+    que o poller ao vivo e a API recebem de `parse_version`. A versão
+    entra no histórico da origem `source`.
+    """
+    return parse_version(digest, _content, origin=origin_key(source))
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _search_index(version: str, _df: pd.DataFrame) -> SearchIndex:
+    """Índice de busca montado uma vez por versão da planilha."""
+    return SearchIndex(_df)
+
+@st.cache_resource(show_spinner=False)
+def _report_service() -> ReportService:
+    """Workers de PDF + relatórios prontos, compartilhados entre sessões."""
+    return ReportService()
+
+@st.cache_resource(show_spinner=False)
+def _snapshot_tracker() -> SnapshotTracker:
+    """Versão atual/anterior vistas pelo processo (compartilhado entre sessões)."""
+    return SnapshotTracker()
+
+@st.cache_resource(show_spinner=False)
+def _api_server():
+    """API JSON (dashboard/api.py) no mesmo processo quando DASHBOARD_API_PORT está definido."""
+    return start_in_thread(configured_origin(DRIVE_URL)) if API_PORT else None
+
+@st.cache_resource(show_spinner=False)
+def _alert_engine(origin):
+    """Alertas do processo (DASHBOARD_ALERT_SINKS); None quando não configurados."""
+    return watch_alerts(origin)
+
+@metrics.span("carga")
 def load_data(path: str) -> pd.DataFrame:
     """
     Mantém a estrutura original, mas:
     - Se 'path' for URL (Drive), lê direto do link.
     - Senão, tenta a planilha local (compatibilidade).
     - >>> Ajuste mínimo: inclui a coluna H (Apelido) mesmo sem cabeçalho.
+    - A origem só é consultada a cada DASHBOARD_REFRESH_SECONDS, com
+      requisição condicional; se o Drive falhar, usa a última versão boa.
+    - Com DASHBOARD_SOURCES (várias planilhas regionais), ver `load_regions`.
     """
+    origin = configured_origin(path)
+    if isinstance(origin, tuple):
+        return load_regions(origin)
     try:
-        if isinstance(path, str) and path.strip().lower().startswith(("http://", "https://")):
-            raw = pd.read_excel(path, header=None)
-        else:
-            p = Path(path)
-            if not p.exists():
-                p = PLANILHA_PATH
-            raw = pd.read_excel(p, header=None)
+        source = resolve_source(path, PLANILHA_PATH)
+        res = fetcher_for(source).get()
+        df = _parse_sheet(res.digest, res.content, source).copy(deep=False)  # compartilhado pelo processo
     except Exception as e:
         st.error(f"Erro ao carregar planilha: {e}")
         return pd.DataFrame()
+    df.attrs["fonte"] = source  # só na cópia rasa desta sessão: usada pelo modo ao vivo
+    if res.stale:
+        atualizado = datetime.fromtimestamp(res.fetched_at, pytz.timezone(TIMEZONE))
+        st.warning(f"⚠️ Planilha indisponível no momento; exibindo a versão de {atualizado.strftime('%d/%m/%Y %H:%M')}.")
+    return df
 
-    # <<< agora traz até H (8 colunas) e garante Apelido se faltar >>>
-    raw = raw.dropna(how="all").iloc[:, 0:8]
-    if raw.shape[1] < 8:
-        raw[7] = ""  # cria coluna H vazia se a planilha vier só até G
-
-    raw.columns = ["Local","Cam_Total","Cam_Online","Cam_Status","Alm_Total","Alm_Online","Alm_Status","Apelido"]
-    raw = raw.dropna(subset=["Local"])
-    raw = raw[~raw["Local"].astype(str).str.contains("TOTAL|RELATÓRIO|RELATORIO", case=False, na=False)]
-    for c in ["Cam_Total","Cam_Online","Alm_Total","Alm_Online"]:
-        raw[c] = raw[c].apply(_to_int)
-    raw["Cam_Falta"] = (raw["Cam_Total"] - raw["Cam_Online"]).clip(lower=0)
-    raw["Alm_Falta"] = (raw["Alm_Total"] - raw["Alm_Online"]).clip(lower=0)
-    raw["Cam_OfflineBool"] = (raw["Cam_Total"]>0) & (raw["Cam_Online"]==0)
-    raw["Alm_OfflineBool"] = (raw["Alm_Total"]>0) & (raw["Alm_Online"]==0)
-    def cam_status(r):
-        if r["Cam_Total"]==0: return "SEM CÂMERAS"
-        if r["Cam_Online"]==0: return "OFFLINE"
-        if r["Cam_Online"]<r["Cam_Total"]: return f"FALTANDO {int(r['Cam_Falta'])}"
-        return "OK"
-    raw["Cam_Status"] = raw.apply(cam_status, axis=1)
-    def alm_status(r):
-        if r["Alm_Total"]==0: return "SEM ALARME"
-        if r["Alm_Online"]==0: return "OFFLINE"
-        if r["Alm_Online"]<r["Alm_Total"]: return f"PARCIAL ({int(r['Alm_Online'])}/{int(r['Alm_Total'])})"
-        return "100%"
-    raw["Alm_Status"] = raw.apply(alm_status, axis=1)
-    return raw.reset_index(drop=True)
+def load_regions(sources: tuple) -> pd.DataFrame:
+    """
+    Várias planilhas em paralelo, unidas com a coluna Regiao. Uma região
+    fora do ar entra com a última versão boa e não trava as outras.
+    """
+    try:
+        multi = load_sources(list(sources))
+    except Exception as e:
+        st.error(f"Erro ao carregar planilhas: {e}")
+        return pd.DataFrame()
+    df = multi.df.copy(deep=False)  # o DataFrame unido é compartilhado pelo processo
+    df.attrs["fonte"] = sources
+    if multi.failed:
+        nomes = ", ".join(f"{r.source.name} ({r.status})" for r in multi.failed)
+        st.warning(f"⚠️ Planilhas com problema: {nomes}. As demais regiões estão atualizadas.")
+    with st.expander(f"⏱️ Fontes ({len(multi.results)})"):
+        st.dataframe(pd.DataFrame({
+            "Fonte": [r.source.name for r in multi.results],
+            "Versão": [(r.version or "")[:12] for r in multi.results],
+            "Busca (ms)": [round(r.fetch_s * 1e3, 1) for r in multi.results],
+            "Leitura (ms)": [round(r.parse_s * 1e3, 1) for r in multi.results],
+            "Linhas": [r.rows for r in multi.results],
+            "Situação": [r.status if not r.error else f"{r.status}: {r.error}" for r in multi.results],
+        }), hide_index=True, use_container_width=True)
+    return df
 
 def chip(texto, tipo):
     cls = "ok" if tipo=="ok" else ("warn" if tipo=="warn" else "off")
     return f"<span class='chip {cls}'>{texto}</span>"
 
 # ------------------ GRAFICO ------------------
+@metrics.span("grafico")
 def bar_values(values: dict, title: str):
-    dfc = pd.DataFrame({
-        "Categoria": list(values.keys()),
-        "Quantidade": list(values.values())
-    })
-    fig = px.bar(
-        dfc,
-        x="Categoria",
-        y="Quantidade",
-        text="Quantidade",
-        color="Categoria",
-        color_discrete_map={
-            "Online": CLR_GREEN,
-            "Offline": CLR_RED,
-            "Locais p/ manutenção": CLR_ORANGE
-        }
-    )
-    fig.update_traces(textposition="outside", cliponaxis=False)
-    fig.update_layout(
-        title=title,
-        height=360,
-        margin=dict(l=10, r=10, t=50, b=20),
-        paper_bgcolor=CLR_PANEL,
-        plot_bgcolor=CLR_PANEL,
-        font=dict(size=13),
-        showlegend=False,
-        xaxis_title=None,
-        yaxis_title="Quantidade"
-    )
+    items = tuple(values.items())
+    if CHART_BACKEND == "html":  # sem plotly: barras em HTML (DASHBOARD_CHART_BACKEND=html)
+        st.markdown(bar_html(title, items), unsafe_allow_html=True)
+        return
+    fig = chart_cache.figure(title, items)  # pronta por (título, valores), LRU do processo
     st.plotly_chart(
         fig,
         use_container_width=True,
@@ -250,15 +228,16 @@ def bar_values(values: dict, title: str):
     )
 
 # ------------------ HEADER ------------------
-_logo_bytes = load_logo_bytes()
+_api_server()
+_logo = assets().logo  # lida/decodificada uma vez por processo, sem rede aqui
 
 st.markdown("<div class='top-wrap'>", unsafe_allow_html=True)
 c_logo, c_title, c_search = st.columns([0.12, 0.58, 0.30])
 with c_logo:
     st.markdown("<div class='logo-card'>", unsafe_allow_html=True)
-    if _logo_bytes:
+    if _logo:
         try:
-            st.image(_logo_bytes, use_container_width=True)
+            st.image(_logo.header, use_container_width=True)
         except Exception:
             st.warning("⚠️ Erro ao carregar logo. O sistema continua funcionando.")
     else:
@@ -267,7 +246,7 @@ with c_logo:
 
 with c_title:
     # <-- horário de Brasília
-    hora_brasilia = datetime.now(pytz.timezone("America/Sao_Paulo"))
+    hora_brasilia = datetime.now(pytz.timezone(TIMEZONE))
     st.markdown(
         f"<div class='title'>Dashboard Operacional – CFTV &amp; Alarmes</div>"
         f"<div class='subtitle'>Atualizado em {hora_brasilia.strftime('%d/%m/%Y %H:%M')}</div>",
@@ -276,6 +255,9 @@ with c_title:
 with c_search:
     st.markdown("<div class='search-box'>", unsafe_allow_html=True)
     query = st.text_input("Pesquisar local 🔎", "", placeholder="Digite o nome ou apelido…")
+    o1, o2 = st.columns(2)
+    busca_sem_acento = o1.checkbox("Ignorar acentos", key="busca_sem_acento")
+    busca_aproximada = o2.checkbox("Busca aproximada", key="busca_aproximada")
     st.markdown("</div>", unsafe_allow_html=True)
 st.markdown("</div>", unsafe_allow_html=True)
 
@@ -313,27 +295,53 @@ if df.empty:
     st.stop()
 # >>>>>>>> REMOVIDO o st.info(...) a pedido <<<<<<<<
 
+# Alertas: cada versão nova é avaliada uma vez, em segundo plano
+_alertas = _alert_engine(df.attrs.get("fonte", ""))
+if _alertas is not None:
+    _alertas.observe(df.attrs.get("snapshot", ""), df)
+
 # <<< busca híbrida Local + Apelido (case-insensitive) >>>
-has_query = bool(query.strip())
-if has_query:
-    termo = query.strip().lower()
-    dfv = df[
-        df["Local"].astype(str).str.lower().str.contains(termo, na=False) |
-        df["Apelido"].astype(str).str.lower().str.contains(termo, na=False)
-    ]
-else:
-    dfv = df
+# Agregados memorizados por (versão da planilha, busca): troca de aba e
+# buscas repetidas não varrem o DataFrame de novo.
+def aggregates_for(dfv: pd.DataFrame, query: str, accents: bool, fuzzy: bool) -> Aggregates:
+    version = dfv.attrs.get("snapshot", "")
+    def _filtrar():
+        if not query.strip():
+            return dfv
+        return _search_index(version, dfv).filter(dfv, query, accents=accents, fuzzy=fuzzy)
+    return aggregate_cache.get(version, query_key(query, accents, fuzzy), _filtrar)
+
+agg_version = df.attrs.get("snapshot", "")
+agg_query = query_key(query, busca_sem_acento, busca_aproximada)
+agg = aggregates_for(df, query, busca_sem_acento, busca_aproximada)
+
+# ------------------ LISTA DE LOCAIS ------------------
+@st.cache_resource(show_spinner=False, max_entries=64)
+def _cards_html(key: tuple, kind: str, page: int, _rows: pd.DataFrame) -> list[str]:
+    """Blocos HTML por (versão, busca, tipo, página), compartilhados entre sessões."""
+    return chunks(site_cards(_rows, kind))
+
+@metrics.span("render.lista")
+def render_site_list(rows: pd.DataFrame, kind: str, key: tuple | None = None):
+    """Cartões em poucos blocos HTML; listas muito longas são paginadas."""
+    total = len(rows)
+    page = 1
+    if total > PAGE_SIZE:
+        pages = -(-total // PAGE_SIZE)
+        page = st.selectbox(f"Página ({total} locais)", range(1, pages + 1), key=f"pagina_{kind}")
+        rows = rows.iloc[(page - 1) * PAGE_SIZE: page * PAGE_SIZE]
+    blocks = _cards_html(key, kind, page, rows) if key is not None else chunks(site_cards(rows, kind))
+    for html in blocks:
+        st.markdown(html, unsafe_allow_html=True)
 
 # ------------------ RENDER: CÂMERAS ------------------
-def render_cameras(dfx: pd.DataFrame):
-    base = dfx[dfx["Cam_Total"] > 0]
+@metrics.span("render.cameras")
+def render_cameras(agg: Aggregates, key: tuple | None = None):
     # >>> padroniza título com os mesmos ícones dos botões
     st.markdown(f"#### 📷 Câmeras", unsafe_allow_html=True)
 
-    total = int(base["Cam_Total"].sum())
-    online = int(base["Cam_Online"].sum())
-    offline = max(total - online, 0)
-    locais_manut = int(((base["Cam_OfflineBool"]) | (base["Cam_Falta"] > 0)).sum())
+    cam = agg.cam
+    total, online, offline, locais_manut = cam.total, cam.online, cam.offline, cam.locais_manut
 
     c1, c2, c3, c4 = st.columns(4)
     c1.markdown(f"<div class='card'><div class='metric-sub'>Total</div><div class='metric'>{total}</div></div>", unsafe_allow_html=True)
@@ -341,37 +349,24 @@ def render_cameras(dfx: pd.DataFrame):
     c3.markdown(f"<div class='card'><div class='metric-sub'>Offline</div><div class='metric' style='color:{CLR_RED};'>{offline}</div></div>", unsafe_allow_html=True)
     c4.markdown(f"<div class='card'><div class='metric-sub'>Locais p/ manutenção</div><div class='metric' style='color:{CLR_ORANGE};'>{locais_manut}</div></div>", unsafe_allow_html=True)
 
-    rows = base.copy()
-    rows["__prio"] = np.where(rows["Cam_OfflineBool"], 2, np.where(rows["Cam_Falta"] > 0, 1, 0))
-    rows = rows[rows["__prio"] > 0].sort_values(["__prio", "Cam_Falta"], ascending=[False, False])
+    rows = cam.manutencao
 
     st.markdown("#### Locais para manutenção / offline")
     if rows.empty:
         st.info("Nenhum local em manutenção. Use a busca para visualizar locais 100% OK.")
-    for _, r in rows.iterrows():
-        status = "OFFLINE" if r["Cam_OfflineBool"] else f"FALTANDO {int(r['Cam_Falta'])}"
-        cls = "offline" if "OFFLINE" in status else ""
-        st.markdown(
-            f"<div class='local-card {cls}'>"
-            f"<div class='local-title'>📍 {r['Local']} — {chip(status, 'off' if 'OFFLINE' in status else 'warn')}</div>"
-            f"<div class='local-info'>Total: {r['Cam_Total']} • Online: {r['Cam_Online']}</div>"
-            f"</div>",
-            unsafe_allow_html=True
-        )
+    render_site_list(rows, "cam", key)
 
     bar_values({"Online": online, "Offline": offline, "Locais p/ manutenção": locais_manut}, "Resumo de Câmeras")
 
 
 # ------------------ RENDER: ALARMES ------------------
-def render_alarms(dfx: pd.DataFrame):
-    base = dfx[dfx["Alm_Total"] > 0]
+@metrics.span("render.alarmes")
+def render_alarms(agg: Aggregates, key: tuple | None = None):
     # >>> Troca mínima: padroniza título com os mesmos ícones dos botões
     st.markdown(f"#### 🚨 Alarmes", unsafe_allow_html=True)
 
-    total = int(base["Alm_Total"].sum())
-    online = int(base["Alm_Online"].sum())
-    offline = max(total - online, 0)
-    locais_manut = int(((base["Alm_OfflineBool"]) | (base["Alm_Falta"] > 0)).sum())
+    alm = agg.alm
+    total, online, offline, locais_manut = alm.total, alm.online, alm.offline, alm.locais_manut
 
     a1, a2, a3, a4 = st.columns(4)
     a1.markdown(f"<div class='card'><div class='metric-sub'>Centrais Totais</div><div class='metric'>{total}</div></div>", unsafe_allow_html=True)
@@ -379,40 +374,28 @@ def render_alarms(dfx: pd.DataFrame):
     a3.markdown(f"<div class='card'><div class='metric-sub'>Offline</div><div class='metric' style='color:{CLR_RED};'>{offline}</div></div>", unsafe_allow_html=True)
     a4.markdown(f"<div class='card'><div class='metric-sub'>Locais p/ manutenção</div><div class='metric' style='color:{CLR_ORANGE};'>{locais_manut}</div></div>", unsafe_allow_html=True)
 
-    rows = base.copy()
-    rows["__prio"] = np.where(rows["Alm_OfflineBool"], 2, np.where(rows["Alm_Falta"] > 0, 1, 0))
-    rows = rows[rows["__prio"] > 0].sort_values(["__prio", "Alm_Falta"], ascending=[False, False])
+    rows = alm.manutencao
 
     st.markdown("#### Locais para manutenção / offline")
     if rows.empty:
         st.info("Nenhum local em manutenção. Use a busca para visualizar locais 100%.")
-    for _, r in rows.iterrows():
-        status = "OFFLINE" if r["Alm_OfflineBool"] else f"PARCIAL ({int(r['Alm_Online'])}/{int(r['Alm_Total'])})"
-        cls = "offline" if "OFFLINE" in status else ""
-        st.markdown(
-            f"<div class='local-card {cls}'>"
-            f"<div class='local-title'>📍 {r['Local']} — {chip(status, 'off' if 'OFFLINE' in status else 'warn')}</div>"
-            f"<div class='local-info'>Total: {r['Alm_Total']} • Online: {r['Alm_Online']}</div>"
-            f"</div>",
-            unsafe_allow_html=True
-        )
+    render_site_list(rows, "alm", key)
 
     bar_values({"Online": online, "Offline": offline, "Locais p/ manutenção": locais_manut}, "Resumo de Alarmes")
 
 # ------------------ RENDER: GERAL ------------------
-def render_geral(dfx: pd.DataFrame):
+@metrics.span("render.geral")
+def render_geral(agg: Aggregates):
     # >>> padroniza título com os mesmos ícones dos botões
     st.markdown(f"#### 📊 Geral (Câmeras + Alarmes)",
                 unsafe_allow_html=True)
 
-    cam = dfx[dfx["Cam_Total"]>0]; alm = dfx[dfx["Alm_Total"]>0]
-    cam_tot, cam_on = int(cam["Cam_Total"].sum()), int(cam["Cam_Online"].sum())
-    alm_tot, alm_on = int(alm["Alm_Total"].sum()), int(alm["Alm_Online"].sum())
-    cam_off, alm_off = cam_tot-cam_on, alm_tot-alm_on
+    cam_tot, cam_on = agg.cam.total, agg.cam.online
+    alm_tot, alm_on = agg.alm.total, agg.alm.online
+    cam_off, alm_off = agg.cam_off, agg.alm_off
 
     # Locais p/ manutenção (inalterado)
-    locais_manut = int(((dfx["Cam_OfflineBool"]) | (dfx["Cam_Falta"]>0) |
-                        (dfx["Alm_OfflineBool"]) | (dfx["Alm_Falta"]>0)).sum())
+    locais_manut = agg.locais_manut
 
     g1,g2,g3,g4,g5,g6 = st.columns(6)
     g1.markdown(f"<div class='card'><div class='metric-sub'>Câmeras Online</div><div class='metric' style='color:{CLR_GREEN};'>{cam_on}</div></div>", unsafe_allow_html=True)
@@ -427,7 +410,17 @@ def render_geral(dfx: pd.DataFrame):
         "Resumo Geral"
     )
 
-    # --------- Relatório PDF (apenas locais para manutenção) ---------
+# --------- Relatório PDF (apenas locais para manutenção) ---------
+# Fora do trecho ao vivo: o formulário não é redesenhado a cada intervalo.
+@st.fragment(run_every=0.5)
+def _report_progress(job):
+    """Só este trecho é redesenhado enquanto o PDF é montado; pronto, a página reroda com o download."""
+    if job.done():
+        st.rerun()
+    st.progress(job.progress, text="Gerando relatório…")
+
+@metrics.span("render.relatorio")
+def render_relatorio(agg: Aggregates):
     st.markdown("### 📄 Relatório de locais para manutenção")
 
     # Controle de estado
@@ -444,95 +437,98 @@ def render_geral(dfx: pd.DataFrame):
         nome_operador = st.text_input("Digite o nome do operador responsável pelo plantão:")
 
         if nome_operador:
-            faltando = dfx[(dfx["Cam_Falta"] > 0) | (dfx["Alm_Falta"] > 0)].copy()
+            faltando = agg.faltando
 
             if faltando.empty:
                 st.info("Nenhum local com falhas no momento.")
                 st.session_state.gerando_pdf = False
             else:
-                table_df = faltando.loc[:, ["Local", "Cam_Falta", "Alm_Falta"]].rename(
-                    columns={"Cam_Falta": "Câmeras Offline", "Alm_Falta": "Alarmes Offline"}
+                # >>> geração do PDF em segundo plano (cache por versão/operador/filtro)
+                job = _report_service().submit(
+                    (agg_version, nome_operador, agg_query),
+                    report_table(faltando), nome_operador, _logo.pdf if _logo else None,
                 )
-
-                # >>> geração do PDF 
-                from reportlab.lib.pagesizes import A4
-                from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
-                from reportlab.lib import colors
-                from reportlab.lib.styles import getSampleStyleSheet
-                import io
-
-                buffer = io.BytesIO()
-                doc = SimpleDocTemplate(buffer, pagesize=A4)
-                styles = getSampleStyleSheet()
-                elements = []
-
-                # Logo: tenta arquivo; se não, usa bytes carregados do app
-                try:
-                    logo_path = next((p for p in LOGO_FILE_CANDIDATES if os.path.exists(p)), None)
-                except StopIteration:
-                    logo_path = None
-
-                try:
-                    if logo_path:
-                        im = Image(logo_path, width=120, height=84)  # preserva proporção
-                    elif _logo_bytes:
-                        im = Image(BytesIO(_logo_bytes), width=120, height=84)
-                    else:
-                        im = None
-                    if im:
-                        im.hAlign = "CENTER"
-                        elements.append(im)
-                        elements.append(Spacer(1, 8))
-                except Exception:
-                    pass
-
-                title = Paragraph("<b>Relatório de locais para manutenção</b>", styles["Title"])
-                elements.append(title)
-                elements.append(Spacer(1, 10))
-
-                data_brasilia = datetime.now(pytz.timezone("America/Sao_Paulo")).strftime("%d/%m/%Y %H:%M")
-                subtitle = Paragraph(f"Gerado em: {data_brasilia}", styles["Normal"])
-                elements.append(subtitle)
-                # >>> NOVO: linha de plantão (sem alterar o visual)
-                elements.append(Paragraph(f"<b>Plantão - {nome_operador}</b>", styles["Normal"]))
-                elements.append(Spacer(1, 12))
-
-                data = [list(table_df.columns)]
-                for _, row in table_df.iterrows():
-                    data.append([str(row["Local"]), int(row["Câmeras Offline"]), int(row["Alarmes Offline"])])
-
-                table = Table(data, repeatRows=1)
-                table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#1B1F3B")),  # azul da logo
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, 0), 11),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-                    ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                ]))
-                elements.append(table)
-                doc.build(elements)
-                buffer.seek(0)
+                if not job.done():
+                    _report_progress(job)  # acompanha sem segurar o script; pronto, reroda a página
+                    return
+                buffer = job.result()
+                gerado = job.generated_at
 
                 # Etapa 3 – Download do PDF
+                st.caption(f"Relatório gerado em {gerado.strftime('%d/%m/%Y %H:%M')} – reaproveitado "
+                           "enquanto a planilha, o operador e a busca não mudarem.")
                 st.download_button(
                     label="⬇️ Baixar Relatório PDF",
                     data=buffer,
-                    file_name=f"Relatorio_Plantao_{nome_operador}.pdf",
+                    file_name=f"Relatorio_Plantao_{nome_operador}_{gerado.strftime('%Y%m%d_%H%M')}.pdf",
                     mime="application/pdf"
                 )
 
                 # Reseta o estado após disponibilizar o download
                 st.session_state.gerando_pdf = False
 
+# ------------------ AO VIVO ------------------
+def _live(fn):
+    """
+    Com DASHBOARD_LIVE_SECONDS > 0, `fn` vira um fragmento redesenhado a cada
+    intervalo – só ele, não a página. Os dados vêm do poller do processo
+    (uma consulta à origem para todas as telas) e o redesenho sem versão
+    nova só reaproveita agregados, HTML e figuras em cache.
+    """
+    return st.fragment(run_every=LIVE_SECONDS)(fn) if LIVE_SECONDS > 0 else fn
+
+@_live
+@metrics.span("render.ao_vivo")
+def render_live(tab: str, fonte: str, query: str, accents: bool, fuzzy: bool):
+    dfv = df
+    if LIVE_SECONDS > 0 and fonte:
+        try:
+            dfv = poller_for(fonte, LIVE_SECONDS).current()[1]
+        except Exception:
+            pass  # poller sem dados: fica com a versão da carga da página
+    version = dfv.attrs.get("snapshot", "")
+
+    # <<< mudanças desde a última atualização (diff contra a versão anterior) >>>
+    mudancas = _snapshot_tracker().update(version, dfv)
+    if mudancas is not None and not mudancas.empty:
+        with st.expander(f"🔄 Mudanças desde a última atualização ({len(mudancas.changes)})"):
+            st.markdown(change_items(mudancas.changes), unsafe_allow_html=True)
+
+    agg_live = aggregates_for(dfv, query, accents, fuzzy)
+    key = (version, query_key(query, accents, fuzzy))
+    if tab == "Câmeras":
+        render_cameras(agg_live, key)
+    elif tab == "Alarmes":
+        render_alarms(agg_live, key)
+    else:
+        render_geral(agg_live)
+
 # ------------------ DISPATCH ------------------
 tab = st.session_state.tab
-if tab == "Câmeras":
-    render_cameras(dfv)
-elif tab == "Alarmes":
-    render_alarms(dfv)
-else:
-    render_geral(dfv)
+render_live(tab, df.attrs.get("fonte", ""), query, busca_sem_acento, busca_aproximada)
+if tab == "Geral":
+    render_relatorio(agg)
 
 st.caption("© Grupo Perímetro & Monitoramento • Dashboard Operacional")
+
+# ------------------ TEMPOS (ADMIN) ------------------
+_spans = metrics.end_rerun(_rerun)
+if metrics.is_admin(st.query_params.get("admin")):
+    with st.expander("⏱️ Tempos (admin)"):
+        st.caption(f"Este rerun: {sum(t for n, t in _spans if n == 'rerun') * 1e3:.1f} ms")
+        st.dataframe(pd.DataFrame(_spans, columns=["Trecho", "s"]).assign(
+            ms=lambda d: (d["s"] * 1e3).round(2)).drop(columns="s"), hide_index=True, use_container_width=True)
+        resumo = pd.DataFrame(metrics.summary())
+        if not resumo.empty:
+            for c in ("p50_s", "p95_s", "max_s"):
+                resumo[c.replace("_s", " (ms)")] = (resumo.pop(c) * 1e3).round(2)
+            st.markdown("**Processo (últimas medições por trecho)**")
+            st.dataframe(resumo.drop(columns="total_s"), hide_index=True, use_container_width=True)
+        st.markdown("**Contadores**")
+        st.json(metrics.counters())
+        if _alertas is not None:
+            ativos = _alertas.active()
+            st.markdown(f"**Alertas ativos ({len(ativos)})**")
+            if ativos:
+                st.dataframe(pd.DataFrame([a.to_dict() for a in ativos]).drop(columns=["event", "at"]),
+                             hide_index=True, use_container_width=True)
@@ -0,0 +1,11 @@
+# Testes sem rede e sem tocar em .cache/ do repositório:
+# histórico desligado e snapshots numa pasta temporária por sessão de testes.
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+os.environ.setdefault("DASHBOARD_HISTORY_DB", "off")
+os.environ.setdefault("DASHBOARD_CACHE_DIR", tempfile.mkdtemp(prefix="dashboard-testes-"))
@@ -0,0 +1,384 @@
+# Motor de alertas com relógio de mentira: parsing das regras, debounce
+# (por/limpa), escalonamento, intervalo das regras aumentou/diminuiu,
+# regras gerais e os destinos (função, arquivo, webhook e SMTP locais).
+import email
+import email.policy
+import json
+import socketserver
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+import pytest
+
+from dashboard import metrics
+from dashboard.alerts import (DISPAROU, ESCALOU, RESOLVIDO, AlertEngine, CallbackSink, FileSink, Rule,
+                              SmtpSink, WebhookSink, parse_duration, parse_rule, parse_rules, parse_sinks)
+from dashboard.sheet import compact
+
+
+def frame(rows) -> pd.DataFrame:
+    """DataFrame normalizado a partir de [Local, cam total, cam online, alm total, alm online]."""
+    df = pd.DataFrame(rows, columns=["Local", "Cam_Total", "Cam_Online", "Alm_Total", "Alm_Online"])
+    df["Apelido"] = ""
+    for p in ("Cam", "Alm"):
+        df[f"{p}_Falta"] = (df[f"{p}_Total"] - df[f"{p}_Online"]).clip(lower=0)
+        df[f"{p}_OfflineBool"] = (df[f"{p}_Total"] > 0) & (df[f"{p}_Online"] == 0)
+    return compact(df)
+
+
+class Clock:
+    def __init__(self, t: float = 1000.0):
+        self.t = t
+
+    def __call__(self) -> float:
+        return self.t
+
+    def advance(self, s: float):
+        self.t += s
+
+
+def engine(rules: str, *sinks):
+    clock = Clock()
+    eng = AlertEngine(parse_rules(rules), list(sinks), clock=clock, interval=0)
+    return eng, clock
+
+
+def events(alerts) -> list[tuple]:
+    return [(a.rule, a.site, a.event, a.level) for a in alerts]
+
+
+# ------------------ regras ------------------
+def test_parse_duration():
+    assert parse_duration("90") == 90
+    assert parse_duration("90s") == 90
+    assert parse_duration("10m") == parse_duration("10min") == 600
+    assert parse_duration("1,5h") == 5400
+    assert parse_duration("1d") == 86400
+    with pytest.raises(ValueError, match="tempo inválido"):
+        parse_duration("10 semanas")
+
+
+def test_parse_rule_full():
+    assert parse_rule("cam = Cam_OfflineBool por 10m limpa 5m escala 30m 2h") == Rule(
+        "cam", "Cam_OfflineBool", for_s=600, clear_s=300, escalate=(1800, 7200))
+    assert parse_rule("f = Cam_Falta >= 2,5") == Rule("f", "Cam_Falta", ">=", 2.5)
+    assert parse_rule("a = Alm_Falta aumentou limpa 1h") == Rule("a", "Alm_Falta", "aumentou", clear_s=3600)
+    assert parse_rule("g = Manutencao locais > 50").min_sites == 50
+    assert parse_rule("e = Cam_OfflineBool escala 2h,30m").escalate == (1800, 7200)
+
+
+def test_parse_rules_skips_comments_and_splits_on_semicolon():
+    rules = parse_rules("# comentário\n a = Cam_OfflineBool ; b = Alm_OfflineBool por 1m\n\n")
+    assert [r.name for r in rules] == ["a", "b"]
+
+
+@pytest.mark.parametrize("line, message", [
+    ("sem igual", "regra inválida"),
+    ("x = ", "regra inválida"),
+    ("x = Coluna_Que_Nao_Existe", "coluna desconhecida"),
+    ("x = Cam_Falta >", "falta o valor"),
+    ("x = Cam_Falta por", "trecho inválido"),
+    ("x = Cam_Falta depois 10m", "trecho inválido"),
+    ("x = Cam_Falta locais >= 3", "trecho inválido"),
+    ("x = Cam_Falta aumentou locais > 3", "regra geral"),
+    ("x = Cam_Falta por 10x", "tempo inválido"),
+])
+def test_parse_rule_errors(line, message):
+    with pytest.raises(ValueError, match=message):
+        parse_rule(line)
+
+
+# ------------------ debounce e escalonamento ------------------
+def test_fires_only_after_condition_holds_for_duration():
+    eng, clock = engine("cam = Cam_OfflineBool por 10m")
+    assert eng.update("v1", frame([["A", 4, 0, 0, 0], ["B", 4, 4, 0, 0]])) == []
+    clock.advance(599)
+    assert eng.tick() == []
+    clock.advance(1)
+    alerts = eng.tick()
+    assert events(alerts) == [("cam", "A", DISPAROU, 1)]
+    assert alerts[0].since == 1000 and alerts[0].at == 1600 and alerts[0].version == "v1"
+    assert events(eng.active()) == [("cam", "A", DISPAROU, 1)]
+
+
+def test_pending_condition_that_drops_restarts_the_count():
+    eng, clock = engine("cam = Cam_OfflineBool por 10m")
+    eng.update("v1", frame([["A", 4, 0, 0, 0]]))
+    clock.advance(500)
+    eng.update("v2", frame([["A", 4, 4, 0, 0]]))   # voltou antes dos 10m
+    clock.advance(10)
+    eng.update("v3", frame([["A", 4, 0, 0, 0]]))
+    clock.advance(599)
+    assert eng.tick() == []
+    clock.advance(1)
+    assert events(eng.tick()) == [("cam", "A", DISPAROU, 1)]
+
+
+def test_clear_window_absorbs_flapping():
+    eng, clock = engine("cam = Cam_OfflineBool limpa 5m")
+    assert events(eng.update("v1", frame([["A", 4, 0, 0, 0]]))) == [("cam", "A", DISPAROU, 1)]
+    clock.advance(60)
+    assert eng.update("v2", frame([["A", 4, 4, 0, 0]])) == []     # ainda dentro do `limpa`
+    clock.advance(60)
+    assert eng.update("v3", frame([["A", 4, 0, 0, 0]])) == []     # voltou: sem novo disparo
+    clock.advance(60)
+    eng.update("v4", frame([["A", 4, 4, 0, 0]]))
+    clock.advance(299)
+    assert eng.tick() == []
+    clock.advance(1)
+    assert events(eng.tick()) == [("cam", "A", RESOLVIDO, 1)]
+    assert eng.active() == []
+
+
+def test_escalation_levels_and_resolution_keeps_last_level():
+    eng, clock = engine("cam = Cam_OfflineBool por 10m escala 30m 2h")
+    eng.update("v1", frame([["A", 4, 0, 0, 0]]))
+    seen = []
+    for _ in range(8):
+        clock.advance(15 * 60)
+        seen += events(eng.tick())
+    assert seen == [("cam", "A", DISPAROU, 1), ("cam", "A", ESCALOU, 2), ("cam", "A", ESCALOU, 3)]
+    resolved = eng.update("v2", frame([["A", 4, 4, 0, 0]]))
+    assert events(resolved) == [("cam", "A", RESOLVIDO, 3)]
+    assert resolved[0].since == 1000
+
+
+def test_escalation_can_skip_levels_between_ticks():
+    eng, clock = engine("cam = Cam_OfflineBool por 1m escala 5m")
+    eng.update("v1", frame([["A", 4, 0, 0, 0]]))
+    clock.advance(3600)
+    assert events(eng.tick()) == [("cam", "A", DISPAROU, 2)]
+
+
+def test_same_version_is_ignored():
+    eng, _ = engine("cam = Cam_OfflineBool")
+    assert len(eng.update("v1", frame([["A", 4, 0, 0, 0]]))) == 1
+    assert eng.update("v1", frame([["A", 4, 0, 0, 0]])) == []
+
+
+# ------------------ locais ------------------
+def test_removed_site_with_active_alert_is_resolved():
+    eng, clock = engine("cam = Cam_OfflineBool")
+    eng.update("v1", frame([["A", 4, 0, 0, 0], ["B", 4, 0, 0, 0]]))
+    clock.advance(60)
+    alerts = eng.update("v2", frame([["B", 4, 0, 0, 0]]))
+    assert events(alerts) == [("cam", "A", RESOLVIDO, 1)]
+    assert alerts[0].to_dict()["value"] is None
+    assert events(eng.active()) == [("cam", "B", DISPAROU, 1)]
+
+
+def test_state_follows_site_when_rows_move():
+    eng, clock = engine("cam = Cam_OfflineBool por 10m")
+    eng.update("v1", frame([["A", 4, 0, 0, 0], ["B", 4, 4, 0, 0]]))
+    clock.advance(300)
+    eng.update("v2", frame([["C", 1, 1, 0, 0], ["B", 4, 4, 0, 0], ["A", 4, 0, 0, 0]]))
+    clock.advance(300)
+    assert events(eng.tick()) == [("cam", "A", DISPAROU, 1)]
+
+
+def test_duplicate_sites_get_distinct_keys():
+    eng, _ = engine("cam = Cam_OfflineBool")
+    alerts = eng.update("v1", frame([["A", 1, 0, 0, 0], ["A", 1, 0, 0, 0]]))
+    assert sorted(a.site for a in alerts) == ["A", "A #2"]
+
+
+# ------------------ aumentou/diminuiu ------------------
+def test_edge_rule_compares_with_previous_version_and_cools_down():
+    eng, clock = engine("alm = Alm_Falta aumentou limpa 1h")
+    assert eng.update("v1", frame([["A", 0, 0, 4, 4]])) == []     # sem versão anterior
+    clock.advance(60)
+    alerts = eng.update("v2", frame([["A", 0, 0, 4, 3]]))
+    assert events(alerts) == [("alm", "A", DISPAROU, 1)] and alerts[0].value == 1
+    clock.advance(60)
+    assert eng.update("v3", frame([["A", 0, 0, 4, 2]])) == []     # dentro do intervalo
+    clock.advance(3600)
+    assert events(eng.update("v4", frame([["A", 0, 0, 4, 1]]))) == [("alm", "A", DISPAROU, 1)]
+    clock.advance(3600)
+    assert eng.update("v5", frame([["A", 0, 0, 4, 4]])) == []     # diminuiu
+    assert eng.active() == []                                       # aviso pontual, sem estado
+
+
+def test_edge_rule_ignores_new_sites():
+    eng, clock = engine("d = Cam_Online diminuiu")
+    eng.update("v1", frame([["A", 4, 4, 0, 0]]))
+    clock.advance(60)
+    assert events(eng.update("v2", frame([["A", 4, 3, 0, 0], ["B", 4, 0, 0, 0]]))) == [("d", "A", DISPAROU, 1)]
+
+
+# ------------------ regras gerais ------------------
+def test_overall_rule_counts_sites():
+    eng, clock = engine("geral = Manutencao locais > 1 por 5m")
+    eng.update("v1", frame([["A", 4, 3, 0, 0], ["B", 4, 4, 1, 1], ["C", 2, 2, 1, 1]]))
+    clock.advance(60)
+    eng.update("v2", frame([["A", 4, 3, 0, 0], ["B", 4, 4, 1, 0], ["C", 2, 2, 1, 1]]))
+    clock.advance(300)
+    alerts = eng.tick()
+    assert events(alerts) == [("geral", "", DISPAROU, 1)] and alerts[0].value == 2
+    clock.advance(60)
+    assert events(eng.update("v3", frame([["A", 4, 4, 0, 0]]))) == [("geral", "", RESOLVIDO, 1)]
+
+
+# ------------------ destinos ------------------
+def test_callback_and_file_sinks_with_min_level(tmp_path):
+    got, urgent = [], []
+    path = tmp_path / "sub" / "alertas.jsonl"
+    eng, clock = engine("cam = Cam_OfflineBool escala 30m", CallbackSink(got.extend),
+                        CallbackSink(urgent.extend, min_level=2), FileSink(path))
+    eng.update("v1", frame([["A", 4, 0, 0, 0]]))
+    clock.advance(1800)
+    eng.tick()
+    eng.flush()
+    assert events(got) == [("cam", "A", DISPAROU, 1), ("cam", "A", ESCALOU, 2)]
+    assert events(urgent) == [("cam", "A", ESCALOU, 2)]
+    lines = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert [(d["event"], d["level"], d["value"]) for d in lines] == [(DISPAROU, 1, 1), (ESCALOU, 2, 1)]
+
+
+def test_failing_sink_does_not_block_others():
+    def boom(_alerts):
+        raise RuntimeError("destino fora")
+
+    got = []
+    before = metrics.counters().get("alertas.falha_envio", 0)
+    eng, _ = engine("cam = Cam_OfflineBool", CallbackSink(boom), CallbackSink(got.extend))
+    eng.update("v1", frame([["A", 4, 0, 0, 0]]))
+    eng.flush()
+    assert len(got) == 1
+    assert metrics.counters()["alertas.falha_envio"] == before + 1
+
+
+@pytest.fixture
+def webhook():
+    posts = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            posts.append(json.loads(self.rfile.read(int(self.headers["Content-Length"]))))
+            self.send_response(204)
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/alertas", posts
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def smtp():
+    """Servidor SMTP mínimo: guarda os bytes de cada DATA."""
+    mails = []
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            def reply(line):
+                self.wfile.write(line.encode() + b"\r\n")
+
+            reply("220 teste")
+            data = None
+            for raw in self.rfile:
+                line = raw.rstrip(b"\r\n")
+                if data is not None:
+                    if line == b".":
+                        mails.append(b"\n".join(data))
+                        data = None
+                        reply("250 ok")
+                    else:
+                        data.append(line)
+                    continue
+                cmd = line.split(b" ")[0].upper().decode()
+                if cmd == "DATA":
+                    data = []
+                    reply("354 envie")
+                elif cmd == "QUIT":
+                    reply("221 tchau")
+                    return
+                else:
+                    reply("250 ok")
+
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server.server_address[1], mails
+    server.shutdown()
+    server.server_close()
+
+
+def test_webhook_sink_posts_batch(webhook):
+    url, posts = webhook
+    eng, _ = engine("cam = Cam_OfflineBool", WebhookSink(url))
+    eng.update("v1", frame([["A", 4, 0, 0, 0], ["B", 2, 0, 0, 0]]))
+    eng.flush()
+    assert len(posts) == 1
+    assert [(d["site"], d["event"]) for d in posts[0]["alertas"]] == [("A", DISPAROU), ("B", DISPAROU)]
+
+
+def test_smtp_sink_sends_one_mail_per_evaluation(smtp):
+    port, mails = smtp
+    eng, clock = engine("cam = Cam_OfflineBool escala 1m",
+                        SmtpSink("127.0.0.1", port, ["a@x.com", "b@x.com"], min_level=2))
+    eng.update("v1", frame([["A", 4, 0, 0, 0]]))
+    clock.advance(60)
+    eng.tick()
+    eng.flush()
+    assert len(mails) == 1
+    msg = email.message_from_bytes(mails[0], policy=email.policy.default)
+    assert msg["To"] == "a@x.com, b@x.com"
+    assert msg["Subject"] == "[Dashboard] 1 alerta(s), nível 2"
+    assert msg.get_content().split() == ["ESCALOU", "nível", "2", "cam", "A", "valor", "1"]
+
+
+def test_parse_sinks():
+    sinks = parse_sinks("webhook=http://h/x; arquivo:2=/tmp/a.jsonl\n# comentário\nsmtp:3=mail:2525/a@x.com, b@x.com")
+    assert [type(s) for s in sinks] == [WebhookSink, FileSink, SmtpSink]
+    assert [s.min_level for s in sinks] == [1, 2, 3]
+    assert (sinks[2].host, sinks[2].port, sinks[2].to) == ("mail", 2525, ["a@x.com", "b@x.com"])
+    assert parse_sinks("smtp=mail/a@x.com")[0].port == 25
+    with pytest.raises(ValueError, match="destino inválido"):
+        parse_sinks("webhook=")
+    with pytest.raises(ValueError, match="destino desconhecido"):
+        parse_sinks("pombo=correio")
+
+
+# ------------------ sem painel aberto ------------------
+def test_watch_evaluates_new_versions_with_default_config(tmp_path, monkeypatch):
+    import time
+
+    from benchmarks.synthetic import make_workbook
+    from dashboard import alerts, live
+    from dashboard.fetch import fetcher_for
+
+    assert live.LIVE_SECONDS == 0                       # modo ao vivo do painel desligado (padrão)
+    out = tmp_path / "alertas.jsonl"
+    monkeypatch.setenv("DASHBOARD_ALERT_SINKS", f"arquivo={out}")
+    monkeypatch.setenv("DASHBOARD_ALERT_RULES", "cam = Cam_OfflineBool")
+    monkeypatch.setattr(alerts, "_DEFAULT", None)
+    monkeypatch.setattr(alerts, "_WATCHED", set())
+    monkeypatch.setattr(alerts, "POLL_SECONDS", 0.05)  # só encurta a espera do teste
+    path = str(tmp_path / "planilha.xlsx")
+    make_workbook(200, seed=1, path=path)
+    fetcher_for(path, ttl=0)
+
+    def wait_for(cond):
+        deadline = time.monotonic() + 20
+        while not cond() and time.monotonic() < deadline:
+            time.sleep(0.02)
+        return cond()
+
+    eng = alerts.watch(path)
+    try:
+        assert eng is not None and alerts.watch(path) is eng
+        first = fetcher_for(path).get().digest
+        assert wait_for(lambda: eng._version == first)     # ninguém chamou observe/update
+        eng.flush()
+        fired = len(eng.active())
+        assert fired > 0 and out.read_text(encoding="utf-8").count("\n") == fired
+
+        make_workbook(200, seed=2, path=path)
+        assert wait_for(lambda: eng._version not in (None, first))
+    finally:
+        eng.stop()
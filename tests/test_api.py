@@ -0,0 +1,123 @@
+# Caminho não bloqueante da API (o que roda direto no loop de eventos):
+# só responde com dados já carregados na versão atual da origem. Também
+# ETag/304, negociação do gzip e o bind padrão só em localhost.
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from benchmarks.synthetic import make_workbook
+from dashboard import api
+from dashboard.api import GZIP_MIN, Api, LocalClient
+from dashboard.sources import Source
+
+
+@pytest.fixture(params=["arquivo", "regioes"])
+def app(request, tmp_path):
+    paths = []
+    for i in range(2):
+        p = tmp_path / f"regiao{i}.xlsx"
+        make_workbook(300, seed=i, path=p)
+        paths.append(str(p))
+    if request.param == "arquivo":
+        return Api(paths[0])
+    return Api(tuple(Source(f"R{i}", p) for i, p in enumerate(paths)))
+
+
+def test_non_blocking_needs_loaded_current_version(app):
+    assert app.handle("/api/geral", "", {}, block=False) is None   # nada carregado
+    client = LocalClient(app)
+    try:
+        assert client.get("/api/geral").status == 200
+        assert app.handle("/api/geral", "", {}, block=False)[0] == 200
+        assert app.handle("/api/status", "", {}, block=False)[0] == 200
+
+        for f in app._fetchers():
+            f.invalidate()   # TTL vencido: conferir a origem é I/O, vai para a thread
+        assert app.handle("/api/geral", "", {}, block=False) is None
+        assert client.get("/api/geral").status == 200
+        assert app.handle("/api/geral", "", {}, block=False)[0] == 200
+    finally:
+        client.close()
+
+
+def test_non_blocking_never_builds_bodies(app):
+    client = LocalClient(app)
+    try:
+        client.get("/api/geral")
+        # versão pronta, mas a busca ainda não foi montada
+        assert app.handle("/api/locais", "q=posto", {}, block=False) is None
+        assert client.get("/api/locais?q=posto").status == 200
+        assert app.handle("/api/locais", "q=posto", {}, block=False)[0] == 200
+    finally:
+        client.close()
+
+
+# ------------------ ETag / 304 ------------------
+def test_if_none_match_returns_304_until_the_version_changes(tmp_path):
+    path = tmp_path / "planilha.xlsx"
+    make_workbook(300, seed=1, path=path)
+    app = Api(str(path))
+    client = LocalClient(app)
+    try:
+        first = client.get("/api/locais?q=posto")
+        etag = first.headers["etag"]
+        assert first.status == 200 and first.json()["total"] > 0
+
+        again = client.get("/api/locais?q=posto", headers={"If-None-Match": etag})
+        assert again.status == 304 and again.body == b"" and again.headers["etag"] == etag
+        # lista de ETags no cabeçalho também vale
+        assert client.get("/api/locais?q=posto", headers={"If-None-Match": f'"x", {etag}'}).status == 304
+        # outra busca, outro ETag
+        assert client.get("/api/locais?q=joão", headers={"If-None-Match": etag}).status == 200
+
+        make_workbook(200, seed=2, path=path)   # nova versão da planilha
+        for f in app._fetchers():
+            f.invalidate()
+        fresh = client.get("/api/locais?q=posto", headers={"If-None-Match": etag})
+        assert fresh.status == 200 and fresh.headers["etag"] != etag
+    finally:
+        client.close()
+
+
+# ------------------ gzip ------------------
+def test_gzip_only_when_accepted_and_large_enough(app):
+    client = LocalClient(app)
+    try:
+        plain = client.get("/api/locais")
+        assert len(plain.body) >= GZIP_MIN and "content-encoding" not in plain.headers
+        assert plain.headers["vary"] == "accept-encoding"
+
+        gz = client.get("/api/locais", headers={"Accept-Encoding": "gzip, deflate"})
+        assert gz.headers["content-encoding"] == "gzip" and len(gz.body) < len(plain.body)
+        assert gz.json() == plain.json() and gz.headers["etag"] == plain.headers["etag"]
+
+        small = client.get("/api/locais?q=inexistente", headers={"Accept-Encoding": "gzip"})
+        assert len(small.body) < GZIP_MIN and "content-encoding" not in small.headers
+        assert small.json()["total"] == 0
+    finally:
+        client.close()
+
+
+# ------------------ bind padrão ------------------
+def test_default_bind_is_localhost(tmp_path, monkeypatch):
+    monkeypatch.delenv("DASHBOARD_API_HOST", raising=False)
+    out = subprocess.run([sys.executable, "-c", "import dashboard.api as a; print(a.API_HOST)"],
+                         capture_output=True, text=True, check=True, cwd=Path(api.__file__).parent.parent)
+    assert out.stdout.strip() == "127.0.0.1"
+
+    import uvicorn
+
+    from dashboard import alerts
+
+    calls = []
+    monkeypatch.setattr(api, "API_HOST", "127.0.0.1")
+    monkeypatch.setattr(uvicorn, "run", lambda app, **kw: calls.append(kw))
+    monkeypatch.setattr(alerts, "watch", lambda source: None)
+    path = tmp_path / "planilha.xlsx"
+    make_workbook(10, seed=1, path=path)
+    api.main([str(path)])
+    assert calls[0]["host"] == "127.0.0.1"
+    api.main([str(path), "--host", "0.0.0.0"])
+    assert calls[1]["host"] == "0.0.0.0"
@@ -0,0 +1,18 @@
+# Lote da linha de comando: planilhas avulsas não entram no histórico.
+from benchmarks.synthetic import make_workbook
+from dashboard import history
+from dashboard.cli import plan_jobs
+
+
+def test_batch_does_not_touch_history(tmp_path, monkeypatch):
+    opened = []
+    monkeypatch.setattr(history, "default_store", lambda origin: opened.append(origin))
+    paths = []
+    for i in range(2):
+        p = tmp_path / f"regiao{i}.xlsx"
+        make_workbook(30, seed=10 + i, path=p)
+        paths.append(str(p))
+
+    jobs = plan_jobs(paths, ["", "posto"], "Plantão", accents=False, fuzzy=False)
+    assert len(jobs) == 4
+    assert opened == []
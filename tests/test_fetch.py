@@ -0,0 +1,147 @@
+# SheetFetcher contra um servidor HTTP local (http.server): requisição
+# condicional, versão boa em falha/corpo inválido e single-flight.
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from dashboard.fetch import XLSX_MAGIC, SheetFetcher
+
+BOOK_1 = XLSX_MAGIC + b"planilha versao 1"
+BOOK_2 = XLSX_MAGIC + b"planilha versao 2"
+
+
+class Origin:
+    """Estado do "Drive" de mentira: corpo, status e atraso da próxima resposta."""
+
+    def __init__(self):
+        self.body = BOOK_1
+        self.etag = '"v1"'
+        self.status = 200
+        self.delay = 0.0
+        self.requests = []   # cabeçalhos If-None-Match recebidos
+
+
+@pytest.fixture
+def origin():
+    state = Origin()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            state.requests.append(self.headers.get("If-None-Match"))
+            time.sleep(state.delay)
+            if state.status != 200:
+                self.send_response(state.status)
+                self.end_headers()
+                return
+            if self.headers.get("If-None-Match") == state.etag:
+                self.send_response(304)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("ETag", state.etag)
+            self.send_header("Content-Length", str(len(state.body)))
+            self.end_headers()
+            self.wfile.write(state.body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    state.url = f"http://127.0.0.1:{server.server_address[1]}/planilha.xlsx"
+    yield state
+    server.shutdown()
+    server.server_close()
+
+
+def test_etag_304_keeps_version(origin):
+    f = SheetFetcher(origin.url, ttl=0)
+    first = f.get()
+    assert first.changed and first.content == BOOK_1
+    again = f.get()
+    assert origin.requests == [None, '"v1"']       # 2ª requisição é condicional
+    assert again.digest == first.digest and not again.changed and not again.stale
+
+    origin.body, origin.etag = BOOK_2, '"v2"'
+    new = f.get()
+    assert new.changed and new.content == BOOK_2
+
+
+def test_ttl_serves_from_memory(origin):
+    now = [0.0]
+    f = SheetFetcher(origin.url, ttl=60, clock=lambda: now[0])
+    f.get()
+    f.get()
+    assert len(origin.requests) == 1
+    now[0] = 61
+    f.get()
+    assert len(origin.requests) == 2
+
+
+def test_503_serves_last_good(origin):
+    f = SheetFetcher(origin.url, ttl=0)
+    good = f.get()
+    origin.status = 503
+    res = f.get()
+    assert res.stale and res.error
+    assert res.digest == good.digest and res.content == BOOK_1
+
+
+def test_first_fetch_failure_raises(origin):
+    origin.status = 503
+    with pytest.raises(Exception):
+        SheetFetcher(origin.url, ttl=0).get()
+
+
+def test_non_workbook_body_serves_last_good(origin):
+    f = SheetFetcher(origin.url, ttl=0)
+    good = f.get()
+    origin.body, origin.etag = b"<html>Cota de download excedida</html>", '"cota"'
+    res = f.get()
+    assert res.stale and "xlsx" in res.error
+    assert res.digest == good.digest and res.content == BOOK_1
+    # o ETag da página ruim não foi guardado: a próxima consulta ainda pede "v1"
+    origin.body, origin.etag = BOOK_1, '"v1"'
+    res = f.get()
+    assert origin.requests[-1] == '"v1"' and not res.stale
+
+
+def test_non_workbook_file_serves_last_good(tmp_path):
+    path = tmp_path / "dados.xlsx"
+    path.write_bytes(BOOK_1)
+    f = SheetFetcher(str(path), ttl=0)
+    good = f.get()
+    path.write_bytes(b"nao e planilha, arquivo maior")
+    res = f.get()
+    assert res.stale and res.digest == good.digest
+
+
+def test_single_flight_first_load(origin):
+    origin.delay = 0.3
+    f = SheetFetcher(origin.url, ttl=60)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(f.get())) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(origin.requests) == 1
+    assert len({r.digest for r in results}) == 1
+
+
+def test_single_flight_serves_previous_while_refreshing(origin):
+    f = SheetFetcher(origin.url, ttl=0)
+    good = f.get()
+    origin.body, origin.etag, origin.delay = BOOK_2, '"v2"', 0.5
+    slow = threading.Thread(target=f.get)
+    slow.start()
+    time.sleep(0.1)
+    t0 = time.perf_counter()
+    res = f.get()        # outro download em curso: devolve a versão atual sem esperar
+    assert time.perf_counter() - t0 < 0.3
+    assert res.digest == good.digest
+    slow.join()
+    assert f.result.content == BOOK_2
+    assert len(origin.requests) == 2
@@ -0,0 +1,86 @@
+# Histórico por origem: ler outra planilha (CLI, API apontada para outro
+# arquivo, load_source avulso) não mexe na linha do tempo da produção.
+import sqlite3
+
+import pandas as pd
+
+from benchmarks.synthetic import make_workbook
+from dashboard.data import load_source, origin_key
+from dashboard.history import HistoryStore
+from dashboard.sheet import parse_sheet
+
+
+def test_origins_sharing_a_file_keep_separate_timelines(tmp_path):
+    path = tmp_path / "history.sqlite"
+    a = parse_sheet(make_workbook(50, seed=1))
+    b = parse_sheet(make_workbook(5, seed=2))   # mesmos nomes "Posto São João 0..4"
+    prod = HistoryStore(path, "producao")
+    other = HistoryStore(path, "avulsa.xlsx")
+
+    prod.record(a, digest="a", ts=100)
+    assert other.record(b, digest="b", ts=200) == len(other.state_at())
+    assert prod.record(a, digest="a", ts=300) == 0          # mesma versão da produção
+
+    assert len(prod.state_at()) == len(a) and len(other.state_at()) == len(b)
+    hist = prod.site_history("Posto São João 0")
+    assert hist["present"].tolist() == [1]
+    assert prod.snapshots()["digest"].tolist() == ["a"]
+    # presentes desde ts=100: a leitura da outra origem em ts=200 não encurta o tempo
+    assert (prod.availability(1, until=400)["horas_monitoradas"] * 3600).round().eq(300).all()
+
+    reopened = HistoryStore(path, "producao")
+    assert reopened.state_at().equals(prod.state_at())
+
+
+def test_removed_sites_only_within_the_same_origin(tmp_path):
+    store = HistoryStore(tmp_path / "history.sqlite", "producao")
+    a = parse_sheet(make_workbook(50, seed=1))
+    store.record(a, digest="a", ts=100)
+    assert store.record(a.iloc[:45], digest="a2", ts=200) == 5
+    assert len(store.state_at()) == 45
+    assert len(store.state_at(150)) == 50
+
+
+def test_legacy_history_moves_to_the_configured_origin(tmp_path):
+    path = tmp_path / "history.sqlite"
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE snapshots (id INTEGER PRIMARY KEY, ts REAL NOT NULL, digest TEXT NOT NULL, sites INTEGER NOT NULL);
+        CREATE INDEX snapshots_ts ON snapshots(ts);
+        CREATE TABLE sites (id INTEGER PRIMARY KEY, local TEXT NOT NULL UNIQUE);
+        CREATE TABLE changes (site_id INTEGER NOT NULL REFERENCES sites(id), ts REAL NOT NULL,
+            present INTEGER NOT NULL, cam_total INTEGER NOT NULL, cam_online INTEGER NOT NULL,
+            alm_total INTEGER NOT NULL, alm_online INTEGER NOT NULL, PRIMARY KEY (site_id, ts)) WITHOUT ROWID;
+        INSERT INTO sites VALUES (1, 'A'), (2, 'B');
+        INSERT INTO changes VALUES (1, 10, 1, 4, 4, 1, 1), (2, 10, 1, 2, 0, 0, 0);
+        INSERT INTO snapshots (ts, digest, sites) VALUES (10, 'antiga', 2);
+    """)
+    conn.close()
+
+    other = HistoryStore(path, "avulsa.xlsx", legacy_origin="producao")
+    assert other.state_at().empty
+    prod = HistoryStore(path, "producao")
+    assert prod.state_at().index.tolist() == ["A", "B"]
+    assert prod.snapshots()["digest"].tolist() == ["antiga"]
+    assert prod.offline_since("cam").index.tolist() == ["B"]
+
+
+def test_load_source_records_under_its_own_origin(tmp_path, monkeypatch):
+    from dashboard import history
+
+    recorded = []
+
+    class Store:
+        def record(self, df, digest):
+            recorded.append((len(df), digest))
+
+    origins = []
+    monkeypatch.setattr(history, "default_store", lambda origin: origins.append(origin) or Store())
+    path = tmp_path / "avulsa.xlsx"
+    make_workbook(20, seed=6, path=path)
+
+    load_source(str(path), history=False)
+    assert origins == []
+    res = load_source(str(path))
+    assert origins == [origin_key(str(path))] and recorded == [(len(res.df), res.version)]
+    assert isinstance(res.df, pd.DataFrame)
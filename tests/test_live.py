@@ -0,0 +1,69 @@
+# Um DataFrame por versão no processo: poller ao vivo, API e
+# `parse_version` (o que o `_parse_sheet` do app chama) dividem o mesmo objeto.
+import threading
+
+from benchmarks.synthetic import make_workbook
+from dashboard.api import Api
+from dashboard.data import parse_version
+from dashboard.fetch import fetcher_for
+from dashboard.live import LivePoller
+
+
+def test_poller_api_and_app_share_one_frame(tmp_path):
+    path = str(tmp_path / "planilha.xlsx")
+    make_workbook(500, seed=3, path=path)
+
+    _, polled = LivePoller(path, interval=0).current()
+    _, served, _ = Api(path)._current()
+    res = fetcher_for(path).get()
+    assert polled is served is parse_version(res.digest, res.content)
+
+
+def test_parse_version_reads_each_version_once(tmp_path):
+    path = str(tmp_path / "planilha.xlsx")
+    make_workbook(500, seed=4, path=path)
+    res = fetcher_for(path).get()
+
+    out = []
+    threads = [threading.Thread(target=lambda: out.append(parse_version(res.digest, res.content)))
+               for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(out) == 8 and all(df is out[0] for df in out)
+
+
+def test_sse_sees_new_versions_without_ui_live_mode(tmp_path, monkeypatch):
+    import asyncio
+    import json
+
+    from dashboard import live
+
+    assert live.LIVE_SECONDS == 0                 # padrão: modo ao vivo do painel desligado
+    monkeypatch.setattr(live, "POLL_SECONDS", 0.05)  # só encurta a espera do teste
+    path = str(tmp_path / "planilha.xlsx")
+    make_workbook(50, seed=1, path=path)
+    fetcher_for(path, ttl=0)
+    app = Api(path)
+
+    versions = []
+    done = asyncio.Event()
+
+    async def receive():
+        await done.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(msg):
+        body = msg.get("body", b"").decode()
+        if body.startswith("event: versao"):
+            versions.append(json.loads(body.split("data: ", 1)[1])["versao"])
+            if len(versions) == 1:
+                make_workbook(60, seed=2, path=path)   # nova versão na origem
+            else:
+                done.set()
+
+    scope = {"type": "http", "method": "GET", "path": "/api/eventos", "query_string": b"", "headers": []}
+    asyncio.run(asyncio.wait_for(app(scope, receive, send), timeout=20))
+    assert len(versions) == 2 and versions[0] != versions[1]
+    assert versions[1] == fetcher_for(path).result.digest
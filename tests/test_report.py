@@ -0,0 +1,26 @@
+# ReportService: relatório montado em segundo plano e reaproveitado por chave,
+# com o "Gerado em" da primeira montagem exposto no job.
+from datetime import datetime
+
+from benchmarks.synthetic import make_workbook
+from dashboard.data import maintenance
+from dashboard.report import ReportService, report_table
+from dashboard.sheet import parse_sheet
+
+
+def test_submit_returns_immediately_and_reuses_job():
+    table = report_table(maintenance(parse_sheet(make_workbook(300, seed=1))).faltando)
+    service = ReportService(max_workers=1)
+    try:
+        job = service.submit(("v1", "Fulano", ""), table, "Fulano")
+        assert isinstance(job.generated_at, datetime)
+        assert job.result(60).startswith(b"%PDF")
+        again = service.submit(("v1", "Fulano", ""), table, "Fulano")
+        assert again is job and again.generated_at == job.generated_at
+
+        fixed = datetime(2024, 1, 2, 3, 4)
+        other = service.submit(("v1", "Beltrano", ""), table, "Beltrano", generated_at=fixed)
+        assert other is not job and other.generated_at == fixed
+        assert other.result(60).startswith(b"%PDF")
+    finally:
+        service.shutdown()
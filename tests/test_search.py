@@ -0,0 +1,32 @@
+# Busca Local/Apelido: nulos nunca casam (nem com "nan"), a consulta é texto
+# literal e o modo sem acento encontra "são" digitando "sao".
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboard.search import SearchIndex
+
+
+@pytest.fixture
+def index():
+    df = pd.DataFrame({"Local": ["Posto Santana", "Posto São João", "Banco Central", 101, "Loja (1)"],
+                       "Apelido": [None, np.nan, "NA Centro", "nan", None]})
+    return SearchIndex(df)
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("na", [0, 2, 3]),     # Santana, "NA Centro", apelido literal "nan"
+    ("an", [0, 2, 3]),
+    ("nan", [3]),          # só o texto "nan" de verdade, não os apelidos vazios
+    ("none", []),
+    ("101", [3]),
+    ("(1)", [4]),
+    ("joão", [1]),
+])
+def test_search_ignores_null_apelido(index, query, expected):
+    assert index.search(query).tolist() == expected
+
+
+def test_accents_mode(index):
+    assert index.search("sao joao").tolist() == []
+    assert index.search("sao joao", accents=True).tolist() == [1]
@@ -0,0 +1,100 @@
+# Paridade da normalização: `sheet.normalize` (vetorizada + compact) contra a
+# versão linha a linha original, e leitura em fluxo (ingest.stream_sheet)
+# contra read_excel.
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.bench_normalize import normalize_rowwise
+from benchmarks.synthetic import make_rows, make_workbook
+from dashboard.ingest import stream_sheet
+from dashboard.sheet import STATUS_COLUMNS, normalize, read_sheet
+
+# Casos de borda de `_to_int` além dos gerados por `make_rows`
+EDGE_VALUES = [None, np.nan, "", "  ", " 3 ", "2,5", "-1", "1e2", "inf", "nan", "1_000",
+               "١٢", True, 7.9, -0.5, "offline", "Sem Câmeras", "sem alarme", pd.Timestamp("2024-01-01")]
+
+
+def edge_rows() -> pd.DataFrame:
+    n = len(EDGE_VALUES)
+    vals = pd.Series(EDGE_VALUES, dtype=object)
+    return pd.DataFrame({0: [f"Local {i}" for i in range(n)], 1: vals, 2: vals[::-1].to_numpy(),
+                         3: None, 4: vals.sample(frac=1, random_state=1).to_numpy(), 5: vals, 6: None,
+                         7: [None, "x"] * (n // 2) + [None] * (n % 2)})
+
+
+def _values(df: pd.DataFrame) -> pd.DataFrame:
+    """Mesmos valores em tipos comparáveis: a saída compacta (`sheet.compact`) usa
+    inteiros menores e categorias; a referência, int64 e texto."""
+    out = {}
+    for c in df.columns:
+        s = df[c]
+        if s.dtype.kind in "iu":
+            s = s.astype("int64")
+        elif s.dtype.kind not in "bf":
+            s = s.astype(object)   # categorias e texto ("str"/object)
+        out[c] = s
+    return pd.DataFrame(out, index=df.index)
+
+
+def check_parity(raw: pd.DataFrame):
+    expected = normalize_rowwise(raw.copy())
+    got = normalize(raw.copy())
+    for c in STATUS_COLUMNS:
+        assert isinstance(got[c].dtype, pd.CategoricalDtype), c
+    pd.testing.assert_frame_equal(_values(got), _values(expected))
+
+
+# ------------------ normalize x linha a linha ------------------
+@pytest.mark.parametrize("raw", [
+    pytest.param(edge_rows(), id="bordas"),
+    pytest.param(edge_rows().iloc[:, :7], id="ate-G"),
+    pytest.param(make_rows(5_000, seed=7).astype(str).replace("None", None), id="tudo-texto"),
+    pytest.param(make_rows(1_000), id="sintetica"),
+    pytest.param(make_rows(20_000, seed=3), id="sintetica-20k"),
+])
+def test_normalize_matches_rowwise(raw):
+    check_parity(raw)
+
+
+# ------------------ stream_sheet x read_excel ------------------
+def _workbook(rows) -> bytes:
+    from openpyxl import Workbook
+
+    wb = Workbook()
+    ws = wb.active
+    for r in rows:
+        ws.append(r)
+    buf = io.BytesIO()
+    wb.save(buf)
+    return buf.getvalue()
+
+
+STREAM_CASES = {
+    "sintetica-300": lambda: make_workbook(300, seed=1),
+    "sintetica-5000": lambda: make_workbook(5_000, seed=2),
+    "sem-H": lambda: _workbook([["A", 1, 1, None, 1, 0, "ok"], ["B", "2", "1", None, "SEM ALARME", 0, "x"],
+                                ["TOTAL", 3]]),
+    "H-so-em-linha-descartada": lambda: _workbook([["A", 1, 1, None, 1, 0, None],
+                                                   [None, None, None, None, None, None, None, "x"],
+                                                   ["B", 2, 2, None, 0, 0]]),
+    "J-preenchido": lambda: _workbook([["A", 1, 1, None, 1, 0, None, None, None, "z"], ["B", 2, 2, None, 0, 0]]),
+    "local-numerico": lambda: _workbook([[101, 1, 1, None, 1, 0, None, 5], ["102", 2, 2, None, 0, 0, None, None],
+                                         [103.0, "N/A", 2.5, None, "#N/A", True, None, "7"]]),
+    "apelido-misto": lambda: _workbook([["A", 1, 1, None, 1, 0, None, "x"], ["B", 2, 2, None, 0, 0, None, 3],
+                                        ["C", 1, 1, None, 1, 0, None, "NA"], ["relatório", 1], ["", 5, 5]]),
+    "datas": lambda: _workbook([["A", pd.Timestamp("2024-01-01").to_pydatetime(), 1, None, 1, 0, None, "x"],
+                                ["B", "1,5", "  3 ", None, "abc", 0, None, None]]),
+}
+
+
+@pytest.mark.parametrize("case", list(STREAM_CASES))
+def test_stream_sheet_matches_read_excel(case):
+    content = STREAM_CASES[case]()
+    expected = normalize(read_sheet(content))
+    got = normalize(stream_sheet(content))
+    pd.testing.assert_frame_equal(got, expected, check_categorical=True)
+    for c in expected.columns:   # None x NaN, int x str no Local/Apelido
+        assert (got[c].map(type) == expected[c].map(type)).all(), c
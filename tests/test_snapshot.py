@@ -0,0 +1,40 @@
+# Snapshot colunar: ida e volta sem perda e colunas numéricas sobre o mmap.
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import make_workbook
+from dashboard.sheet import parse_sheet
+from dashboard.snapshot import SnapshotStore
+
+
+def _mapped(arr) -> bool:
+    while not isinstance(arr, np.memmap) and getattr(arr, "base", None) is not None:
+        arr = arr.base
+    return isinstance(arr, np.memmap)
+
+
+def test_round_trip_keeps_numeric_columns_mapped(tmp_path):
+    store = SnapshotStore(tmp_path)
+    df = parse_sheet(make_workbook(500, seed=1))
+    assert store.save("v1", df)
+
+    got = store.load("v1")
+    pd.testing.assert_frame_equal(got, df)
+    assert got.attrs == df.attrs
+    for c in got.columns:
+        if got[c].dtype.kind in "biuf":
+            values = got[c].to_numpy()
+            assert type(values) is np.ndarray and _mapped(values), c
+            assert not values.flags.writeable, c
+
+    plain = store.load("v1", mmap=False)
+    pd.testing.assert_frame_equal(plain, df)
+    assert not any(_mapped(plain[c].to_numpy()) for c in plain.columns if plain[c].dtype.kind in "biuf")
+
+
+def test_corrupt_snapshot_is_discarded(tmp_path):
+    store = SnapshotStore(tmp_path)
+    store.save("v1", parse_sheet(make_workbook(50, seed=2)))
+    (tmp_path / "v1" / "0.npy").write_bytes(b"lixo")
+    assert store.load("v1") is None
+    assert not (tmp_path / "v1").exists()